@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Throughput and latency benchmark for the MCP clients, with regression checks
+Drives MCPAuthenticatedClient and MCPProxyClient against the local fake proxy:
+serial calls, threaded fan-out, large graph reads, large file reads and writes,
+and the CLI cold-start path (in-process and through the daemon).
+
+Usage: python3 benchmarks/bench_clients.py [--calls N] [--threads N] [--entities N] [--file-kb N]
+                                           [--output results.json] [--baseline baseline.json]
+                                           [--save-baseline] [--threshold 0.25]
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mcp_authenticated_client import MCPAuthenticatedClient
+from mcp_fake_proxy import FakeProxy, filler_text
+from mcp_proxy_client import MCPProxyClient
+from mcp_transport import PoolConfig
+
+TOKEN = "bench-token"
+CLI = os.path.join(os.path.dirname(__file__), '..', 'src', 'mcp_authenticated_client.py')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline_clients.json")
+
+# Metrics compared against the baseline: name -> True if higher is better
+CHECKED_METRICS = {"ops_per_sec": True, "p95_ms": False}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], wall: float) -> Dict[str, float]:
+    """ops/s over the wall time, and latency percentiles in milliseconds"""
+    ordered = sorted(latencies)
+    return {
+        "ops": len(ordered),
+        "ops_per_sec": round(len(ordered) / wall, 1) if wall else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+    }
+
+
+def timed(call: Callable[[], Any]) -> float:
+    """Run one call and return its duration, failing loudly on error dicts"""
+    start = time.perf_counter()
+    result = call()
+    elapsed = time.perf_counter() - start
+    if isinstance(result, dict) and "error" in result:
+        raise RuntimeError(f"benchmark call failed: {result['error']}")
+    return elapsed
+
+
+def run_serial(call: Callable[[], Any], count: int) -> Dict[str, float]:
+    start = time.perf_counter()
+    latencies = [timed(call) for _ in range(count)]
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def run_fanout(call: Callable[[], Any], count: int, threads: int) -> Dict[str, float]:
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        start = time.perf_counter()
+        latencies = list(pool.map(lambda _: timed(call), range(count)))
+        wall = time.perf_counter() - start
+    return summarize(latencies, wall)
+
+
+def run_cli(argv: List[str], count: int, env: Dict[str, str]) -> Dict[str, float]:
+    """Time complete CLI processes, from exec to exit"""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(count):
+        began = time.perf_counter()
+        subprocess.run([sys.executable, CLI] + argv, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        latencies.append(time.perf_counter() - began)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def client_scenarios(client: Any, proxy: FakeProxy, args) -> Dict[str, Dict[str, float]]:
+    """The in-process scenarios for one client"""
+    big_file = os.path.join(proxy.root, "large.txt")
+    content = filler_text(args.file_kb * 1024, "bench")
+    write_path = os.path.join(proxy.root, f"write-{id(client)}.txt")
+    client.fs_write_file(big_file, content)
+
+    def current_time():
+        return client.time_get_current_time("Europe/London")
+
+    return {
+        "serial_time": run_serial(current_time, args.calls),
+        "fanout_time": run_fanout(current_time, args.calls * 2, args.threads),
+        "graph_read": run_serial(client.memory_read_graph, args.repeat),
+        "file_read": run_serial(lambda: client.fs_read_text_file(big_file), args.repeat),
+        "file_write": run_serial(lambda: client.fs_write_file(write_path, content), args.repeat),
+    }
+
+
+def cli_scenarios(proxy: FakeProxy, args) -> Dict[str, Dict[str, float]]:
+    """CLI cold start, run in-process and forwarded to a warm daemon"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, MCP_BASE_URL=proxy.url, MCP_API_TOKEN=TOKEN,
+                   MCP_DAEMON_SOCKET=os.path.join(tmp, "bench.sock"))
+        results = {"cli_cold": run_cli(["time_now", "UTC"], args.cli_runs, dict(env, MCP_NO_DAEMON="1"))}
+
+        daemon = subprocess.Popen([sys.executable, CLI, "daemon"], env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.time() + 30
+            while not os.path.exists(env["MCP_DAEMON_SOCKET"]):
+                if daemon.poll() is not None or time.time() > deadline:
+                    raise RuntimeError("CLI daemon did not start")
+                time.sleep(0.05)
+            results["cli_daemon"] = run_cli(["time_now", "UTC"], args.cli_runs, env)
+        finally:
+            subprocess.run([sys.executable, CLI, "daemon", "stop"], env=env,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            daemon.wait(timeout=10)
+    return results
+
+
+def run_suite(args) -> Dict[str, Any]:
+    """Run every scenario and return results keyed by "<client>.<scenario>" """
+    results: Dict[str, Dict[str, float]] = {}
+    with FakeProxy(token=TOKEN, latency=args.latency_ms / 1000, seed=1) as proxy:
+        proxy.populate_graph(args.entities)
+        pool = PoolConfig(connections_per_host=max(args.threads, 10), block=True)
+        clients = {
+            "authenticated": MCPAuthenticatedClient(proxy.url, token=TOKEN, pool=pool),
+            "proxy": MCPProxyClient(proxy.url, token=TOKEN, pool=pool),
+        }
+        for name, client in clients.items():
+            for scenario, stats in client_scenarios(client, proxy, args).items():
+                results[f"{name}.{scenario}"] = stats
+        if args.cli_runs:
+            for scenario, stats in cli_scenarios(proxy, args).items():
+                results[f"authenticated.{scenario}"] = stats
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": {k: getattr(args, k) for k in ("calls", "threads", "repeat", "entities", "file_kb",
+                                                 "cli_runs", "latency_ms")},
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Describe every checked metric that is worse than baseline by more than threshold"""
+    regressions = []
+    for key, before in baseline.get("results", {}).items():
+        after = current["results"].get(key)
+        if after is None:
+            continue
+        for metric, higher_is_better in CHECKED_METRICS.items():
+            old, new = before.get(metric), after.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(f"{key} {metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def print_table(report: Dict[str, Any]) -> None:
+    print(f"{'scenario':<30}{'ops':>7}{'ops/s':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for key, r in report["results"].items():
+        print(f"{key:<30}{r['ops']:>7}{r['ops_per_sec']:>11}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP client throughput/latency benchmark")
+    parser.add_argument("--calls", type=int, default=300, help="calls in the serial scenario (fan-out runs twice as many)")
+    parser.add_argument("--threads", type=int, default=16, help="threads in the fan-out scenario")
+    parser.add_argument("--repeat", type=int, default=10, help="calls in the large graph/file scenarios")
+    parser.add_argument("--entities", type=int, default=5000, help="entities in the knowledge graph")
+    parser.add_argument("--file-kb", type=int, default=1024, help="size of the file read and written")
+    parser.add_argument("--cli-runs", type=int, default=5, help="CLI processes per cold-start scenario (0 to skip)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency added by the fake proxy per call")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="stored baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="fail if ops/s drops or p95 rises by more than this fraction")
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    print_table(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline stored in {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️  No baseline at {args.baseline}; run with --save-baseline to store one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("config") != report["config"]:
+        print("\n⚠️  Baseline was recorded with different settings; comparing anyway")
+    regressions = compare(report, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark gzip compression of MCP request and response bodies
+Runs write_file, read_text_file and read_graph against the local fake proxy
+at several simulated link speeds, with compression off and on.
+
+Usage: python3 benchmarks/bench_compression.py [--file-kb N] [--entities N] [--speeds 0,100000,10000,1000]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_json_codec import make_read_graph, make_read_text_file
+from mcp_fake_proxy import FakeProxy
+from mcp_transport import MCPTransport
+
+
+def run_case(proxy: FakeProxy, transport: MCPTransport, endpoint: str, body: dict, repeat: int) -> dict:
+    """Median latency and wire bytes per call for one operation"""
+    before = dict(proxy.stats)
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transport.request("POST", endpoint, body)
+        latencies.append(time.perf_counter() - start)
+    return {
+        "median_ms": round(statistics.median(latencies) * 1000, 2),
+        "bytes_up": (proxy.stats["bytes_in"] - before["bytes_in"]) // repeat,
+        "bytes_down": (proxy.stats["bytes_out"] - before["bytes_out"]) // repeat,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gzip request/response compression benchmark")
+    parser.add_argument("--file-kb", type=int, default=256, help="size of the file written and read")
+    parser.add_argument("--entities", type=int, default=1000, help="entities in the knowledge graph")
+    parser.add_argument("--speeds", default="0,100000,10000,1000",
+                        help="comma-separated link speeds in kbit/s (0 = unthrottled)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    content = make_read_text_file(args.file_kb)["content"]
+    graph = make_read_graph(args.entities)
+    results = []
+
+    for speed in [float(s) for s in args.speeds.split(",")]:
+        with FakeProxy(bandwidth_kbps=speed or None) as proxy:
+            seed = MCPTransport(proxy.url)
+            seed.request("POST", "/memory/create_entities", {"entities": graph["entities"]})
+            path = os.path.join(proxy.root, "bench.txt")
+            cases = [
+                ("write_file", "/filesystem/write_file", {"path": path, "content": content}),
+                ("read_text_file", "/filesystem/read_text_file", {"path": path}),
+                ("read_graph", "/memory/read_graph", {}),
+            ]
+            for mode in ("off", "gzip"):
+                transport = MCPTransport(proxy.url, compress_min_bytes=1024 if mode == "gzip" else None,
+                                         accept_gzip=mode == "gzip")
+                for name, endpoint, body in cases:
+                    result = run_case(proxy, transport, endpoint, body, args.repeat)
+                    results.append(dict(link_kbps=speed or "local", mode=mode, op=name, **result))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'link kbit/s':>12} {'mode':<6}{'operation':<16}{'bytes up':>10}{'bytes down':>12}{'median ms':>11}")
+    for r in results:
+        print(f"{r['link_kbps']:>12} {r['mode']:<6}{r['op']:<16}{r['bytes_up']:>10}{r['bytes_down']:>12}{r['median_ms']:>11}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark the available JSON codecs on representative MCP payloads
+Usage: python3 benchmarks/bench_json_codec.py [--entities N] [--file-kb N] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mcp_codec import available_codecs
+
+
+def make_read_graph(entities: int, seed: int = 1) -> dict:
+    """A memory_read_graph response with realistic names and observations"""
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(2000)]
+    names = [f"{rng.choice(words).title()} {i}" for i in range(entities)]
+    return {
+        "entities": [
+            {
+                "type": "entity",
+                "name": name,
+                "entityType": rng.choice(["Person", "Project", "Technology", "Concept", "Feature"]),
+                "observations": [" ".join(rng.choices(words, k=rng.randint(5, 20))) for _ in range(rng.randint(1, 6))],
+            }
+            for name in names
+        ],
+        "relations": [
+            {"type": "relation", "from": rng.choice(names), "to": rng.choice(names),
+             "relationType": rng.choice(["uses", "depends_on", "part_of", "created_by"])}
+            for _ in range(entities * 2)
+        ],
+    }
+
+
+def make_read_text_file(kilobytes: int, seed: int = 2) -> dict:
+    """A fs_read_text_file response carrying source-like text"""
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    while size < kilobytes * 1024:
+        indent = " " * (4 * rng.randint(0, 3))
+        line = indent + " ".join(rng.choices(["def", "return", "self", "value", "\"quoted\"", "{", "}",
+                                              "é", "→", "\\path", "x = 1", "# comment"], k=rng.randint(2, 12)))
+        lines.append(line)
+        size += len(line) + 1
+    return {"content": "\n".join(lines)}
+
+
+def bench(fn, repeat: int) -> float:
+    """Best-of-repeat wall time in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entities", type=int, default=5000, help="entities in the read_graph payload")
+    parser.add_argument("--file-kb", type=int, default=1024, help="size of the read_text_file payload in KiB")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per measurement (best is kept)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    payloads = {
+        "read_graph": make_read_graph(args.entities),
+        "read_text_file": make_read_text_file(args.file_kb),
+    }
+    results = []
+    for payload_name, payload in payloads.items():
+        for codec in available_codecs().values():
+            encoded = codec.dumps(payload)
+            assert json.loads(encoded) == payload
+            encode = bench(lambda: codec.dumps(payload), args.repeat)
+            decode = bench(lambda: codec.loads(encoded), args.repeat)
+            results.append({
+                "payload": payload_name,
+                "codec": codec.name,
+                "bytes": len(encoded),
+                "encode_ms": round(encode * 1000, 3),
+                "decode_ms": round(decode * 1000, 3),
+                "decode_mb_s": round(len(encoded) / decode / 1e6, 1),
+            })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'payload':<16}{'codec':<8}{'bytes':>12}{'encode ms':>12}{'decode ms':>12}{'decode MB/s':>13}")
+    for r in results:
+        print(f"{r['payload']:<16}{r['codec']:<8}{r['bytes']:>12}{r['encode_ms']:>12}{r['decode_ms']:>12}{r['decode_mb_s']:>13}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk timezone conversion against per-value zoneinfo conversion
+Converts a column of random wall-clock timestamps (2000-2030) between two
+zones with mcp_tzbulk.convert_times, and a sample of it one value at a time
+the way time_convert_time does, checking that both agree.
+
+Usage: python3 benchmarks/bench_tz_convert.py [--count N] [--scalar-count N] [--repeat N]
+                                              [--source ZONE] [--target ZONE] [--json]
+"""
+
+import argparse
+import calendar
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("bench_tz_convert.py requires numpy: pip install numpy")
+from mcp_tzbulk import convert_times, transition_table
+
+START = calendar.timegm((2000, 1, 1, 0, 0, 0))
+END = calendar.timegm((2031, 1, 1, 0, 0, 0))
+
+
+def scalar_convert(seconds, source: ZoneInfo, target: ZoneInfo) -> list:
+    """Local seconds converted one at a time with zoneinfo"""
+    epoch = datetime(1970, 1, 1)
+    converted = []
+    for value in seconds:
+        moment = (epoch + timedelta(seconds=int(value))).replace(tzinfo=source).astimezone(target)
+        converted.append(calendar.timegm(moment.timetuple()))
+    return converted
+
+
+def bench(fn, repeat: int) -> float:
+    """Best-of-repeat wall time in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=5_000_000, help="timestamps per bulk conversion")
+    parser.add_argument("--scalar-count", type=int, default=100_000, help="timestamps converted one by one")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per measurement (best is kept)")
+    parser.add_argument("--source", default="America/New_York", help="source timezone")
+    parser.add_argument("--target", default="Europe/London", help="target timezone")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    seconds = rng.integers(START, END, size=args.count, dtype=np.int64)
+    times = seconds.astype("datetime64[s]")
+
+    start = time.perf_counter()
+    transition_table(args.source)
+    transition_table(args.target)
+    table_seconds = time.perf_counter() - start
+
+    bulk = bench(lambda: convert_times(times, args.source, args.target), args.repeat)
+    sample = seconds[:args.scalar_count]
+    source, target = ZoneInfo(args.source), ZoneInfo(args.target)
+    scalar = bench(lambda: scalar_convert(sample, source, target), max(1, args.repeat // 2))
+    expected = scalar_convert(sample, source, target)
+    agree = bool((convert_times(times[:args.scalar_count], args.source, args.target).astype(np.int64)
+                  == np.array(expected)).all())
+
+    results = {
+        "source": args.source,
+        "target": args.target,
+        "count": args.count,
+        "table_build_seconds": round(table_seconds, 4),
+        "bulk_per_sec": round(args.count / bulk),
+        "scalar_per_sec": round(args.scalar_count / scalar),
+        "speedup": round((args.count / bulk) / (args.scalar_count / scalar), 1),
+        "agree": agree,
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{args.source} -> {args.target}: {args.count:,} timestamps")
+        print(f"  transition tables built in {results['table_build_seconds'] * 1000:.0f} ms")
+        print(f"  bulk:   {results['bulk_per_sec']:>14,} conversions/s")
+        print(f"  scalar: {results['scalar_per_sec']:>14,} conversions/s ({results['speedup']}x slower)")
+        print(f"  results agree: {'yes' if agree else 'NO'}")
+    if not agree:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
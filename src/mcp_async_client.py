@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Asyncio MCP OpenAPI Proxy Client
+Concurrent access to the MCP OpenAPI Proxy over a single pooled aiohttp session
+"""
+
+import asyncio
+import json
+import os
+import sys
+from typing import Dict, List, Any, Optional
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - depends on the environment
+    aiohttp = None
+
+# Path prefixes of the servers exposed by the proxy
+SERVER_PREFIXES = ("/memory", "/time", "/filesystem", "/fetch")
+
+
+class AsyncMCPClient:
+    """Asyncio client for MCP OpenAPI Proxy
+
+    All calls share one aiohttp connection pool.  ``max_concurrency`` bounds
+    the number of requests in flight across every server and
+    ``server_limits`` optionally bounds them per path prefix, e.g.
+    ``{"/memory": 4, "/filesystem": 16}``.
+    """
+
+    def __init__(self, base_url: str = "http://192.168.0.7:8000", token: Optional[str] = None,
+                 max_concurrency: int = 100, server_limits: Optional[Dict[str, int]] = None,
+                 timeout: float = 30.0):
+        if aiohttp is None:
+            raise ImportError("AsyncMCPClient requires aiohttp: pip install aiohttp")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.server_limits = dict(server_limits or {})
+        self.timeout = timeout
+        self.session: Optional["aiohttp.ClientSession"] = None
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        self._server_limits: Dict[str, asyncio.Semaphore] = {}
+
+        token = token or os.getenv("MCP_API_TOKEN")
+        self.headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "MCP-Async-Client/1.0"
+        }
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    async def __aenter__(self) -> "AsyncMCPClient":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        """Create the pooled session and concurrency limits on first use, inside the running loop
+
+        Semaphores bind to the loop that first waits on them, so they are
+        made alongside the session and dropped by ``close()``; a client can
+        then be reused under a later ``asyncio.run()``.
+        """
+        if self.session is None or self.session.closed:
+            self._global_limit = asyncio.Semaphore(self.max_concurrency)
+            self._server_limits = {
+                prefix: asyncio.Semaphore(limit) for prefix, limit in self.server_limits.items()
+            }
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """Close the underlying connection pool"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._global_limit = None
+        self._server_limits = {}
+
+    @staticmethod
+    def _server_prefix(endpoint: str) -> str:
+        """Return the server path prefix of an endpoint, e.g. '/memory'"""
+        return "/" + endpoint.lstrip('/').split('/', 1)[0]
+
+    async def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Any:
+        """Make HTTP request to the proxy, bounded by the concurrency limits"""
+        url = f"{self.base_url}{endpoint}"
+        session = await self._get_session()
+        server_limit = self._server_limits.get(self._server_prefix(endpoint))
+
+        # Wait for the server's own limit before taking a global slot, so calls
+        # queued on a saturated server don't hold slots other servers could use
+        if server_limit is not None:
+            await server_limit.acquire()
+        try:
+            async with self._global_limit:
+                if method.upper() == "GET":
+                    request = session.get(url)
+                elif method.upper() == "POST":
+                    request = session.post(url, json=data)
+                else:
+                    raise ValueError(f"Unsupported method: {method}")
+
+                async with request as response:
+                    body = await response.read()
+                    if response.status >= 400:
+                        error = f"{response.status} Error: {response.reason} for url: {url}"
+                        print(f"Request failed: {error}")
+                        try:
+                            return {"error": error, "detail": json.loads(body)}
+                        except ValueError:
+                            return {"error": error, "response": body.decode(errors="replace")[:200]}
+                    try:
+                        return json.loads(body)
+                    except ValueError as e:
+                        error = f"Invalid JSON in response from {url}: {e}"
+                        print(f"Request failed: {error}")
+                        return {"error": error}
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Request failed: {e!r}")
+            return {"error": str(e) or type(e).__name__}
+        finally:
+            if server_limit is not None:
+                server_limit.release()
+
+    # ===== MEMORY SERVER METHODS =====
+
+    async def memory_create_entities(self, entities: List[Dict]) -> Dict:
+        """Create entities in the knowledge graph"""
+        return await self._make_request("POST", "/memory/create_entities", {"entities": entities})
+
+    async def memory_create_relations(self, relations: List[Dict]) -> Dict:
+        """Create relations between entities"""
+        return await self._make_request("POST", "/memory/create_relations", {"relations": relations})
+
+    async def memory_add_observations(self, observations: List[Dict]) -> Dict:
+        """Add observations to entities"""
+        return await self._make_request("POST", "/memory/add_observations", {"observations": observations})
+
+    async def memory_read_graph(self) -> Dict:
+        """Read the entire knowledge graph"""
+        return await self._make_request("POST", "/memory/read_graph")
+
+    async def memory_search_nodes(self, query: str) -> Dict:
+        """Search for nodes in the knowledge graph"""
+        return await self._make_request("POST", "/memory/search_nodes", {"query": query})
+
+    async def memory_open_nodes(self, names: List[str]) -> Dict:
+        """Open specific nodes by name"""
+        return await self._make_request("POST", "/memory/open_nodes", {"names": names})
+
+    async def memory_delete_entities(self, entity_names: List[str]) -> Dict:
+        """Delete entities from the knowledge graph"""
+        return await self._make_request("POST", "/memory/delete_entities", {"entityNames": entity_names})
+
+    # ===== TIME SERVER METHODS =====
+
+    async def time_get_current_time(self, timezone: str = "Etc/UTC") -> Dict:
+        """Get current time in specified timezone"""
+        return await self._make_request("POST", "/time/get_current_time", {"timezone": timezone})
+
+    async def time_convert_time(self, source_timezone: str, time: str, target_timezone: str) -> Dict:
+        """Convert time between timezones"""
+        return await self._make_request("POST", "/time/convert_time", {
+            "source_timezone": source_timezone,
+            "time": time,
+            "target_timezone": target_timezone
+        })
+
+    # ===== FILESYSTEM SERVER METHODS =====
+
+    async def fs_list_allowed_directories(self) -> Dict:
+        """List allowed directories"""
+        return await self._make_request("POST", "/filesystem/list_allowed_directories")
+
+    async def fs_read_text_file(self, path: str, head: Optional[int] = None, tail: Optional[int] = None) -> Dict:
+        """Read a text file"""
+        data = {"path": path}
+        if head is not None:
+            data["head"] = head
+        if tail is not None:
+            data["tail"] = tail
+        return await self._make_request("POST", "/filesystem/read_text_file", data)
+
+    async def fs_write_file(self, path: str, content: str) -> Dict:
+        """Write content to a file"""
+        return await self._make_request("POST", "/filesystem/write_file", {"path": path, "content": content})
+
+    async def fs_list_directory(self, path: str) -> Dict:
+        """List directory contents"""
+        return await self._make_request("POST", "/filesystem/list_directory", {"path": path})
+
+    async def fs_list_directory_with_sizes(self, path: str, sort_by: str = "name") -> Dict:
+        """List directory contents with sizes"""
+        return await self._make_request("POST", "/filesystem/list_directory_with_sizes", {"path": path, "sortBy": sort_by})
+
+    async def fs_create_directory(self, path: str) -> Dict:
+        """Create a directory"""
+        return await self._make_request("POST", "/filesystem/create_directory", {"path": path})
+
+    async def fs_search_files(self, path: str, pattern: str, exclude_patterns: List[str] = None) -> Dict:
+        """Search for files"""
+        data = {"path": path, "pattern": pattern}
+        if exclude_patterns:
+            data["excludePatterns"] = exclude_patterns
+        return await self._make_request("POST", "/filesystem/search_files", data)
+
+    async def fs_get_file_info(self, path: str) -> Dict:
+        """Get file information"""
+        return await self._make_request("POST", "/filesystem/get_file_info", {"path": path})
+
+    async def fs_directory_tree(self, path: str) -> Dict:
+        """Get directory tree structure"""
+        return await self._make_request("POST", "/filesystem/directory_tree", {"path": path})
+
+    # ===== FETCH SERVER METHODS =====
+
+    async def fetch_fetch(self, url: str, max_length: Optional[int] = None, raw: bool = False) -> Any:
+        """Fetch a URL through the fetch server"""
+        data = {"url": url}
+        if max_length is not None:
+            data["max_length"] = max_length
+        if raw:
+            data["raw"] = True
+        return await self._make_request("POST", "/fetch/fetch", data)
+
+
+async def _demo(timezones: List[str]) -> None:
+    """Fetch the current time in several timezones concurrently"""
+    async with AsyncMCPClient() as client:
+        results = await asyncio.gather(*(client.time_get_current_time(tz) for tz in timezones))
+    for timezone, result in zip(timezones, results):
+        print(f"{timezone}: {json.dumps(result)}")
+
+
+def main():
+    """CLI interface for the asyncio MCP client"""
+    if len(sys.argv) < 2:
+        print("Usage: python3 mcp_async_client.py <timezone> [timezone...]")
+        print("\nFetches the current time in every timezone concurrently.")
+        return
+
+    try:
+        asyncio.run(_demo(sys.argv[1:]))
+    except KeyboardInterrupt:
+        print("\n⏹️  Cancelled by user")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,174 @@
 Authenticated MCP OpenAPI Proxy Client
 """
 
-import requests
 import json
-import sys
 import os
-from typing import Dict, List, Any, Optional
+import sys
+from typing import Optional, Tuple
+
+DEFAULT_BASE_URL = "http://192.168.0.7:8000"
+
+
+def find_token() -> Tuple[Optional[str], Optional[str]]:
+    """The token from the environment or a token file, and where it came from"""
+    
+    # Try environment variable
+    token = os.getenv("MCP_API_TOKEN")
+    if token:
+        return token, "MCP_API_TOKEN environment variable"
+    
+    # Try token file
+    try:
+        with open("mcp_token.txt", "r") as f:
+            token = f.read().strip()
+            if token:
+                return token, "mcp_token.txt file"
+    except FileNotFoundError:
+        pass
+    
+    # Try config file
+    try:
+        with open("auth_config_template.json", "r") as f:
+            config = json.load(f)
+            token = config.get("authentication", {}).get("token")
+            if token and token != "YOUR_TOKEN_HERE":
+                return token, "auth_config_template.json"
+    except FileNotFoundError:
+        pass
+    
+    return None, None
+
+
+if __name__ == "__main__":
+    # Hand the command to a running daemon before paying for the imports below;
+    # the daemon only runs it if it talks to the same proxy with the same token
+    from mcp_daemon import forward_cli, identity
+    forward_cli(sys.argv[1:], identity(os.getenv("MCP_BASE_URL") or DEFAULT_BASE_URL, find_token()[0]))
+
+import requests
+import argparse
+import contextlib
+import hashlib
+import time
+from typing import Dict, List, Any, Iterable, Iterator, TextIO
+try:
+    from mcp_transport import MCPTransport, PoolConfig
+    from mcp_batch import BatchResult, Call, run_batch, stream_batch
+    from mcp_cache import DEFAULT_TTLS, ResponseCache
+    from mcp_resilience import CircuitBreakers, RetryPolicy
+    from mcp_hedging import HedgePolicy
+    from mcp_metrics import ClientMetrics
+    from mcp_cassette import CassetteRecorder
+    from mcp_concurrency import AdaptiveConcurrency
+    from mcp_localtime import LocalTimeEngine
+    from mcp_tzbulk import convert_times
+    from mcp_streaming import iter_graph, iter_tree_nodes
+    from mcp_daemon import MCPDaemon, default_socket_path, identity, request as daemon_request
+except ImportError:
+    from .mcp_transport import MCPTransport, PoolConfig
+    from .mcp_batch import BatchResult, Call, run_batch, stream_batch
+    from .mcp_cache import DEFAULT_TTLS, ResponseCache
+    from .mcp_resilience import CircuitBreakers, RetryPolicy
+    from .mcp_hedging import HedgePolicy
+    from .mcp_metrics import ClientMetrics
+    from .mcp_cassette import CassetteRecorder
+    from .mcp_concurrency import AdaptiveConcurrency
+    from .mcp_localtime import LocalTimeEngine
+    from .mcp_tzbulk import convert_times
+    from .mcp_streaming import iter_graph, iter_tree_nodes
+    from .mcp_daemon import MCPDaemon, default_socket_path, identity, request as daemon_request
+
+
+class MCPAuthenticationError(Exception):
+    """Raised when the proxy rejects the bearer token (HTTP 401)"""
+
+
+class AuthCache:
+    """On-disk record of tokens already verified against a proxy
+
+    Entries are keyed by a hash of the base URL and token, so the token itself
+    is never written to disk, and expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600.0):
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(base_url: str, token: str) -> str:
+        return hashlib.sha256(f"{base_url}\n{token}".encode()).hexdigest()
+
+    def _load(self) -> Dict[str, float]:
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: Dict[str, float]) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def is_verified(self, base_url: str, token: str) -> bool:
+        """Return True if the token was verified within the TTL"""
+        verified_at = self._load().get(self._key(base_url, token))
+        return verified_at is not None and time.time() - verified_at < self.ttl
+
+    def mark_verified(self, base_url: str, token: str) -> None:
+        """Record that the token was accepted just now"""
+        now = time.time()
+        entries = {k: v for k, v in self._load().items() if now - v < self.ttl}
+        entries[self._key(base_url, token)] = now
+        self._save(entries)
+
+    def invalidate(self, base_url: str, token: str) -> None:
+        """Forget a token, e.g. after the proxy rejected it"""
+        entries = self._load()
+        if entries.pop(self._key(base_url, token), None) is not None:
+            self._save(entries)
+
 
 class MCPAuthenticatedClient:
-    """Authenticated client for MCP OpenAPI Proxy"""
+    """Authenticated client for MCP OpenAPI Proxy
+
+    Authentication is deferred: the token is validated by the first real
+    call, and any 401 raises ``MCPAuthenticationError``.  Pass
+    ``eager_auth=True`` to probe at construction; with an ``auth_cache`` path
+    (or ``MCP_AUTH_CACHE``) the probe is skipped while a previous
+    verification is still within ``auth_cache_ttl`` seconds.
+    """
     
-    def __init__(self, base_url: str = "http://192.168.0.7:8000", token: Optional[str] = None):
-        self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
+    def __init__(self, base_url: Optional[str] = None, token: Optional[str] = None,
+                 eager_auth: bool = False, auth_cache: Optional[str] = None,
+                 auth_cache_ttl: float = 3600.0, pool: Optional[PoolConfig] = None,
+                 cache: Optional[ResponseCache] = None, coalesce: bool = False,
+                 retry: Optional[RetryPolicy] = None, breakers: Optional[CircuitBreakers] = None,
+                 hedge: Optional[HedgePolicy] = None, metrics: Optional[ClientMetrics] = None,
+                 codec: Optional[str] = None, compress_min_bytes: Optional[int] = None,
+                 recorder: Optional[CassetteRecorder] = None,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 local_time: Optional[LocalTimeEngine] = None):
+        self.base_url = (base_url or os.getenv("MCP_BASE_URL") or DEFAULT_BASE_URL).rstrip('/')
+        self.transport = MCPTransport(self.base_url, pool=pool, cache=cache, coalesce=coalesce,
+                                      retry=retry, breakers=breakers, hedge=hedge, metrics=metrics,
+                                      codec=codec, compress_min_bytes=compress_min_bytes,
+                                      recorder=recorder, concurrency=concurrency,
+                                      local_time=local_time)
+        self.session = self.transport.session
+        self.authenticated = False
+        
+        auth_cache = auth_cache or os.getenv("MCP_AUTH_CACHE")
+        self.auth_cache = AuthCache(auth_cache, auth_cache_ttl) if auth_cache else None
         
         # Get token from parameter, environment variable, or config file
         if not token:
@@ -36,45 +192,20 @@ class MCPAuthenticatedClient:
             "User-Agent": "MCP-Authenticated-Client/1.0"
         })
         
-        # Test authentication
-        if not self._test_auth():
-            print("❌ Authentication failed!")
-            print("Please check your token and try again.")
-            sys.exit(1)
-        else:
-            print("✅ Authentication successful!")
+        self._token = token
+        # Only a real exchange with the proxy proves the token; local time
+        # answers and cache hits never reach it
+        self.transport.add_observer(self)
+        
+        if eager_auth and not self.verify_auth():
+            raise MCPAuthenticationError(f"Token rejected by {self.base_url}")
 
     def _get_token(self) -> Optional[str]:
         """Get token from various sources"""
-        
-        # Try environment variable
-        token = os.getenv("MCP_API_TOKEN")
+        token, source = find_token()
         if token:
-            print("📝 Using token from MCP_API_TOKEN environment variable")
-            return token
-        
-        # Try token file
-        try:
-            with open("mcp_token.txt", "r") as f:
-                token = f.read().strip()
-                if token:
-                    print("📝 Using token from mcp_token.txt file")
-                    return token
-        except FileNotFoundError:
-            pass
-        
-        # Try config file
-        try:
-            with open("auth_config_template.json", "r") as f:
-                config = json.load(f)
-                token = config.get("authentication", {}).get("token")
-                if token and token != "YOUR_TOKEN_HERE":
-                    print("📝 Using token from auth_config_template.json")
-                    return token
-        except FileNotFoundError:
-            pass
-        
-        return None
+            print(f"📝 Using token from {source}")
+        return token
 
     def _test_auth(self) -> bool:
         """Test if authentication is working"""
@@ -86,22 +217,42 @@ class MCPAuthenticatedClient:
         except:
             return False
 
+    def verify_auth(self, force: bool = False) -> bool:
+        """Check the token, using the auth cache unless ``force`` is set"""
+        if self.authenticated and not force:
+            return True
+        if not force and self.auth_cache and self.auth_cache.is_verified(self.base_url, self._token):
+            self.authenticated = True
+            return True
+        if self._test_auth():
+            self._mark_authenticated()
+            return True
+        if self.auth_cache:
+            self.auth_cache.invalidate(self.base_url, self._token)
+        return False
+
+    def _mark_authenticated(self) -> None:
+        """Remember that the token has been accepted by the proxy"""
+        if not self.authenticated:
+            self.authenticated = True
+            if self.auth_cache:
+                self.auth_cache.mark_verified(self.base_url, self._token)
+
+    def observe(self, endpoint: str, data: Optional[Dict], result: Any) -> None:
+        """Transport hook: a request got a successful response from the proxy"""
+        self._mark_authenticated()
+
     def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
         """Make authenticated HTTP request"""
-        url = f"{self.base_url}{endpoint}"
-        
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url)
-            elif method.upper() == "POST":
-                response = self.session.post(url, json=data)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
-            response.raise_for_status()
-            return response.json()
+            return self.transport.request(method, endpoint, data)
             
         except requests.exceptions.RequestException as e:
+            if getattr(e, 'response', None) is not None and e.response.status_code == 401:
+                self.authenticated = False
+                if self.auth_cache:
+                    self.auth_cache.invalidate(self.base_url, self._token)
+                raise MCPAuthenticationError(f"Token rejected by {self.base_url} (401 on {endpoint})") from e
             print(f"Request failed: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 try:
@@ -111,6 +262,43 @@ class MCPAuthenticatedClient:
                     return {"error": str(e), "response": e.response.text[:200]}
             return {"error": str(e)}
 
+    def _stream(self, method: str, endpoint: str, data: Dict = None) -> Iterator[bytes]:
+        """Stream a raw response body, raising MCPAuthenticationError on 401"""
+        try:
+            yield from self.transport.stream(method, endpoint, data)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 401:
+                self.authenticated = False
+                raise MCPAuthenticationError(f"Token rejected by {self.base_url} (401 on {endpoint})") from e
+            raise
+        self._mark_authenticated()
+
+    def warm(self, n: int) -> int:
+        """Pre-open ``n`` pooled connections to the proxy in parallel"""
+        return self.transport.warm(n)
+
+    def breaker_state(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state per server prefix (empty without breakers)"""
+        return self.transport.breakers.snapshot() if self.transport.breakers is not None else {}
+
+    def batch(self, calls: Iterable[Call], max_workers: int = 8) -> List[BatchResult]:
+        """Run many tool calls in parallel; results come back in input order
+
+        Each call is ``("fs_read_text_file", {"path": ...})`` or
+        ``{"tool": ..., "args": {...}}``.  Failures are reported per item in
+        ``BatchResult.error`` rather than raised.
+        """
+        return run_batch(self, calls, max_workers)
+
+    def batch_stream(self, calls: Iterable[Call], max_workers: int = 8,
+                     ordered: bool = False) -> Iterator[BatchResult]:
+        """Like batch(), but yield each result as soon as it completes
+
+        With ``ordered`` set, results keep input order and each is yielded
+        as soon as all earlier ones have been.
+        """
+        return stream_batch(self, calls, max_workers, ordered)
+
     # ===== MEMORY SERVER METHODS =====
     
     def memory_create_entities(self, entities: List[Dict]) -> Dict:
@@ -129,6 +317,15 @@ class MCPAuthenticatedClient:
         """Read the entire knowledge graph"""
         return self._make_request("POST", "/memory/read_graph")
     
+    def memory_read_graph_stream(self) -> Iterator[Tuple[str, Dict]]:
+        """Stream the knowledge graph as ("entity" | "relation", item) pairs
+
+        The body is parsed incrementally, so memory stays bounded and the
+        first item arrives before the download finishes.  Failures raise
+        ``requests.RequestException`` instead of returning an error dict.
+        """
+        return iter_graph(self._stream("POST", "/memory/read_graph"))
+    
     def memory_search_nodes(self, query: str) -> Dict:
         """Search for nodes in the knowledge graph"""
         return self._make_request("POST", "/memory/search_nodes", {"query": query})
@@ -151,6 +348,15 @@ class MCPAuthenticatedClient:
             "target_timezone": target_timezone
         })
 
+    def time_convert_times(self, times: Any, source_timezone: str, target_timezone: str) -> Any:
+        """Convert an array of wall-clock times between timezones locally
+
+        Vectorised with NumPy (see ``mcp_tzbulk.convert_times``); nothing is
+        sent to the proxy.  Returns a datetime64 array.  Raises ImportError
+        if numpy is not installed.
+        """
+        return convert_times(times, source_timezone, target_timezone)
+
     # ===== FILESYSTEM SERVER METHODS =====
     
     def fs_list_allowed_directories(self) -> Dict:
@@ -166,6 +372,10 @@ class MCPAuthenticatedClient:
             data["tail"] = tail
         return self._make_request("POST", "/filesystem/read_text_file", data)
     
+    def fs_write_file(self, path: str, content: str) -> Dict:
+        """Write content to a file"""
+        return self._make_request("POST", "/filesystem/write_file", {"path": path, "content": content})
+    
     def fs_list_directory(self, path: str) -> Dict:
         """List directory contents"""
         return self._make_request("POST", "/filesystem/list_directory", {"path": path})
@@ -173,6 +383,141 @@ class MCPAuthenticatedClient:
     def fs_directory_tree(self, path: str) -> Dict:
         """Get directory tree structure"""
         return self._make_request("POST", "/filesystem/directory_tree", {"path": path})
+    
+    def fs_directory_tree_stream(self, path: str) -> Iterator[Dict]:
+        """Stream directory tree nodes depth-first (see mcp_streaming.iter_tree_nodes)"""
+        return iter_tree_nodes(self._stream("POST", "/filesystem/directory_tree", {"path": path}))
+
+def run_command(client: MCPAuthenticatedClient, argv: List[str]) -> Tuple[int, str]:
+    """Run one CLI command and return its exit status and output text"""
+    command, args = argv[0], argv[1:]
+    try:
+        if command == "time_now":
+            timezone = args[0] if args else "Etc/UTC"
+            result = client.time_get_current_time(timezone)
+
+        elif command == "time_convert":
+            if len(args) < 3:
+                return 0, "Usage: time_convert <time> <from_tz> <to_tz>"
+            time, from_tz, to_tz = args[0], args[1], args[2]
+            result = client.time_convert_time(from_tz, time, to_tz)
+
+        elif command == "fs_list_dirs":
+            result = client.fs_list_allowed_directories()
+
+        elif command == "fs_list":
+            if not args:
+                return 0, "Usage: fs_list <path>"
+            result = client.fs_list_directory(args[0])
+
+        elif command == "fs_read":
+            if not args:
+                return 0, "Usage: fs_read <path>"
+            result = client.fs_read_text_file(args[0])
+
+        elif command == "memory_graph":
+            result = client.memory_read_graph()
+
+        elif command == "memory_search":
+            if not args:
+                return 0, "Usage: memory_search <query>"
+            result = client.memory_search_nodes(" ".join(args))
+
+        else:
+            return 0, f"Unknown command: {command}"
+
+    except MCPAuthenticationError as e:
+        return 1, f"❌ Authentication failed: {e}\nPlease check your token and try again."
+    except Exception as e:
+        return 0, f"❌ Error: {e}"
+    return 0, json.dumps(result, indent=2)
+
+
+def run_pipe(client: MCPAuthenticatedClient, lines: Iterable[str], out: TextIO,
+             concurrency: int = 8, ordered: bool = True) -> Tuple[int, int]:
+    """Run NDJSON tool calls and write one NDJSON result line per call
+
+    Each input line is ``{"tool": "fs_read_text_file", "args": {...}}``;
+    blank lines are skipped and ``index`` in the output counts the rest.
+    Returns the number of calls and how many of them failed.
+    """
+    calls = (line.strip() for line in lines)
+    total = failed = 0
+    for result in client.batch_stream((line for line in calls if line), concurrency, ordered):
+        out.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+        out.flush()
+        total += 1
+        failed += not result.ok
+    return total, failed
+
+
+def pipe_main(argv: List[str]) -> int:
+    """``pipe``: NDJSON calls on stdin, NDJSON results on stdout"""
+    parser = argparse.ArgumentParser(prog="mcp_authenticated_client.py pipe",
+                                     description="Run NDJSON tool calls from stdin over one shared session")
+    parser.add_argument("-j", "--concurrency", type=int, default=8, help="calls in flight at once")
+    parser.add_argument("--order", choices=("input", "completion"), default="input",
+                        help="emit results in input order or as they complete")
+    args = parser.parse_args(argv)
+
+    # Anything the client prints goes to stderr so stdout stays pure NDJSON
+    out = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        client = MCPAuthenticatedClient(pool=PoolConfig(connections_per_host=max(args.concurrency, 10), block=True),
+                                        retry=RetryPolicy(), coalesce=True)
+        if not client.verify_auth():
+            print(f"❌ Authentication failed: token rejected by {client.base_url}")
+            return 1
+        start = time.perf_counter()
+        total, failed = run_pipe(client, sys.stdin, out, args.concurrency, args.order == "input")
+        print(f"{'✅' if not failed else '⚠️ '} {total} calls, {failed} failed in {time.perf_counter() - start:.2f}s")
+    return 1 if failed else 0
+
+
+def daemon_main(argv: List[str]) -> int:
+    """``daemon [start|status|stop]``: serve CLI commands from a warm client"""
+    action = argv[0] if argv else "start"
+    if action in ("status", "stop"):
+        reply = daemon_request(action)
+        if reply is None:
+            print(f"No daemon listening on {default_socket_path()}")
+            return 1
+        print(json.dumps(reply, indent=2))
+        return 0
+    if action != "start":
+        print("Usage: daemon [start|status|stop]")
+        return 1
+
+    # Only cache answers that cannot go stale, so forwarded commands see the
+    # same files and graph an in-process run would
+    static = ("/filesystem/list_allowed_directories", "/time/convert_time")
+    cache = ResponseCache(ttls={endpoint: DEFAULT_TTLS[endpoint] for endpoint in static})
+    client = MCPAuthenticatedClient(cache=cache, coalesce=True, retry=RetryPolicy(),
+                                    breakers=CircuitBreakers())
+    if not client.verify_auth():
+        print(f"❌ Authentication failed: token rejected by {client.base_url}")
+        return 1
+    client.warm(2)
+
+    def status() -> Dict[str, Any]:
+        cache = client.transport.cache
+        return {"proxy": client.base_url, "cache": {"entries": len(cache), "hits": cache.hits, "misses": cache.misses},
+                "breakers": client.breaker_state()}
+
+    daemon = MCPDaemon(lambda args: run_command(client, args), status=status,
+                       identity=identity(client.base_url, client._token))
+    try:
+        daemon.start()
+    except (RuntimeError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"🚀 MCP client daemon listening on {daemon.path} (proxy: {client.base_url})")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopping")
+    return 0
+
 
 def main():
     """CLI interface for the authenticated MCP client"""
@@ -186,66 +531,30 @@ def main():
         print("  fs_read <path>             - Read a file")
         print("  memory_graph               - Read knowledge graph")
         print("  memory_search <query>      - Search knowledge graph")
+        print("  pipe [-j N] [--order input|completion]  - Run NDJSON {\"tool\", \"args\"} lines from stdin")
+        print("  daemon [start|status|stop] - Keep a warm client on a Unix socket for the commands above")
         print("\nAuthentication:")
         print("  Set MCP_API_TOKEN environment variable or create mcp_token.txt file")
+        print("  Set MCP_AUTH_CACHE to a file path to cache token verification")
+        print("  Set MCP_BASE_URL to use a proxy other than the default")
+        print("\nDaemon:")
+        print("  Commands are forwarded to a running daemon (socket: $MCP_DAEMON_SOCKET);")
+        print("  set MCP_NO_DAEMON=1 to always run in-process")
         return
 
     try:
-        client = MCPAuthenticatedClient()
-        command = sys.argv[1]
+        if sys.argv[1] == "daemon":
+            sys.exit(daemon_main(sys.argv[2:]))
+        if sys.argv[1] == "pipe":
+            sys.exit(pipe_main(sys.argv[2:]))
 
-        if command == "time_now":
-            timezone = sys.argv[2] if len(sys.argv) > 2 else "Etc/UTC"
-            result = client.time_get_current_time(timezone)
-            print(json.dumps(result, indent=2))
-            
-        elif command == "time_convert":
-            if len(sys.argv) < 5:
-                print("Usage: time_convert <time> <from_tz> <to_tz>")
-                return
-            time, from_tz, to_tz = sys.argv[2], sys.argv[3], sys.argv[4]
-            result = client.time_convert_time(from_tz, time, to_tz)
-            print(json.dumps(result, indent=2))
-            
-        elif command == "fs_list_dirs":
-            result = client.fs_list_allowed_directories()
-            print(json.dumps(result, indent=2))
-            
-        elif command == "fs_list":
-            if len(sys.argv) < 3:
-                print("Usage: fs_list <path>")
-                return
-            path = sys.argv[2]
-            result = client.fs_list_directory(path)
-            print(json.dumps(result, indent=2))
-            
-        elif command == "fs_read":
-            if len(sys.argv) < 3:
-                print("Usage: fs_read <path>")
-                return
-            path = sys.argv[2]
-            result = client.fs_read_text_file(path)
-            print(json.dumps(result, indent=2))
-            
-        elif command == "memory_graph":
-            result = client.memory_read_graph()
-            print(json.dumps(result, indent=2))
-            
-        elif command == "memory_search":
-            if len(sys.argv) < 3:
-                print("Usage: memory_search <query>")
-                return
-            query = " ".join(sys.argv[2:])
-            result = client.memory_search_nodes(query)
-            print(json.dumps(result, indent=2))
-            
-        else:
-            print(f"Unknown command: {command}")
-            
+        client = MCPAuthenticatedClient()
+        status, output = run_command(client, sys.argv[1:])
+        print(output)
+        if status:
+            sys.exit(status)
     except KeyboardInterrupt:
         print("\n⏹️  Cancelled by user")
-    except Exception as e:
-        print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Batch execution of MCP tool calls over a bounded thread pool
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Client methods that may be invoked by name in a batch
+TOOL_PREFIXES = ("memory_", "time_", "fs_", "fetch_", "openscad_")
+
+# A call is ("tool_name", {kwargs}), {"tool": "tool_name", "args": {kwargs}},
+# or that dict as a line of JSON text
+Call = Union[Tuple[str, Dict[str, Any]], Dict[str, Any]]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one call in a batch"""
+    index: int
+    tool: str
+    args: Dict[str, Any]
+    result: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form, e.g. for JSON output"""
+        return {
+            "index": self.index,
+            "tool": self.tool,
+            "ok": self.ok,
+            "result": self.result,
+            "error": self.error,
+            "elapsed_ms": round(self.elapsed * 1000, 3)
+        }
+
+
+def parse_call(call: Call) -> Tuple[str, Dict[str, Any]]:
+    """Normalise a call to a (tool, args) pair"""
+    if isinstance(call, (str, bytes)):
+        call = json.loads(call)
+    if isinstance(call, dict):
+        return call["tool"], dict(call.get("args") or {})
+    tool, args = call
+    return tool, dict(args or {})
+
+
+def resolve_tool(client: Any, tool: str):
+    """Return the bound client method for a tool name"""
+    if not tool.startswith(TOOL_PREFIXES) or not callable(getattr(client, tool, None)):
+        raise ValueError(f"Unknown tool: {tool}")
+    return getattr(client, tool)
+
+
+def _invoke(client: Any, index: int, call: Call) -> BatchResult:
+    """Run one call, capturing its result, error and wall-clock time"""
+    try:
+        tool, args = parse_call(call)
+    except (KeyError, TypeError, ValueError) as e:
+        return BatchResult(index, str(call), {}, error=f"Invalid call: {e}")
+
+    outcome = BatchResult(index, tool, args)
+    start = time.perf_counter()
+    try:
+        outcome.result = resolve_tool(client, tool)(**args)
+        if isinstance(outcome.result, dict) and "error" in outcome.result:
+            outcome.error = str(outcome.result["error"])
+    except Exception as e:
+        outcome.error = f"{type(e).__name__}: {e}"
+    outcome.elapsed = time.perf_counter() - start
+    return outcome
+
+
+def stream_batch(client: Any, calls: Iterable[Call], max_workers: int = 8,
+                 ordered: bool = False) -> Iterator[BatchResult]:
+    """Run calls in parallel and yield results as they complete
+
+    ``calls`` is consumed lazily and at most ``2 * max_workers`` calls are
+    queued at once, so generators of any length can be streamed through.
+    With ``ordered`` set, results are yielded in input order instead, each
+    as soon as every earlier one has been yielded; results waiting for a
+    slower predecessor count against the same window.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    pending_calls = enumerate(calls)
+    window = 2 * max_workers
+    waiting: Dict[int, BatchResult] = {}
+    next_index = 0
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-batch") as executor:
+        in_flight = {executor.submit(_invoke, client, i, call) for i, call in islice(pending_calls, window)}
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            ready = [future.result() for future in done]
+            if ordered:
+                waiting.update((result.index, result) for result in ready)
+                ready = []
+                while next_index in waiting:
+                    ready.append(waiting.pop(next_index))
+                    next_index += 1
+            for i, call in islice(pending_calls, window - len(in_flight) - len(waiting)):
+                in_flight.add(executor.submit(_invoke, client, i, call))
+            yield from ready
+
+
+def run_batch(client: Any, calls: Iterable[Call], max_workers: int = 8) -> List[BatchResult]:
+    """Run calls in parallel and return results in input order"""
+    return sorted(stream_batch(client, calls, max_workers), key=lambda r: r.index)
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Bulk loader for the memory server's knowledge graph
+
+Streams entities, relations and observations from NDJSON or CSV, skips what
+the graph already holds, and submits the rest in size-bounded chunks from a
+few threads at once.  Relations and observations wait until the entities
+they refer to exist.  Progress is checkpointed so an interrupted load can
+be resumed.
+
+Usage: python3 src/mcp_bulk_load.py [--url URL] [--token TOKEN] [--workers N] [--max-items N]
+                                    [--max-kb N] [--checkpoint FILE] [--fresh] [--report FILE] INPUT
+"""
+
+import argparse
+import csv
+import gzip
+import heapq
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+import requests
+
+try:
+    from mcp_graph_mirror import GraphMirror
+    from mcp_openapi_client import OpenAPIClient
+    from mcp_transport import PoolConfig
+except ImportError:
+    from .mcp_graph_mirror import GraphMirror
+    from .mcp_openapi_client import OpenAPIClient
+    from .mcp_transport import PoolConfig
+
+ENTITY = "entity"
+RELATION = "relation"
+OBSERVATION = "observation"
+
+# Tool endpoint and request body field for each kind of record
+TOOLS = {
+    ENTITY: ("/memory/create_entities", "entities"),
+    RELATION: ("/memory/create_relations", "relations"),
+    OBSERVATION: ("/memory/add_observations", "observations"),
+}
+
+Record = Tuple[str, Dict[str, Any]]
+
+
+# ===== INPUT =====
+
+def record_kind(record: Dict[str, Any]) -> str:
+    """Kind of an input record, from its ``type`` field or else its fields"""
+    kind = record.get("type")
+    if kind in TOOLS:
+        return kind
+    if record.get("from") and record.get("to"):
+        return RELATION
+    if record.get("entityName"):
+        return OBSERVATION
+    if record.get("name"):
+        return ENTITY
+    raise ValueError(f"Cannot tell what kind of record this is: {record}")
+
+
+def _as_list(value: Any, separator: str) -> List[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    return [part.strip() for part in str(value).split(separator) if part.strip()]
+
+
+def normalize(kind: str, record: Dict[str, Any], separator: str = "|") -> Dict[str, Any]:
+    """The record as a tool argument item; list fields may be ``separator``-joined strings (CSV)"""
+    if kind == ENTITY:
+        return {"name": record["name"], "entityType": record.get("entityType") or "Thing",
+                "observations": _as_list(record.get("observations"), separator)}
+    if kind == RELATION:
+        return {"from": record["from"], "to": record["to"], "relationType": record["relationType"]}
+    return {"entityName": record["entityName"], "contents": _as_list(record.get("contents"), separator)}
+
+
+def read_records(path: str, separator: str = "|") -> Iterator[Record]:
+    """Stream (kind, item) pairs from an NDJSON or CSV file (optionally .gz)
+
+    CSV files need a header row naming the fields (``type`` is optional);
+    list fields hold ``separator``-joined values.  ``-`` reads NDJSON from
+    standard input.
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    if path == "-":
+        f = sys.stdin
+    elif path.endswith(".gz"):
+        f = io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    else:
+        f = open(path, "r", encoding="utf-8", newline="")
+    with f:
+        if name.lower().endswith(".csv"):
+            rows: Iterable[Dict[str, Any]] = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            kind = record_kind(row)
+            yield kind, normalize(kind, row, separator)
+
+
+# ===== CHECKPOINTS =====
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ===== LOADER =====
+
+class _Batch:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.items: List[Dict[str, Any]] = []
+        self.indices: List[int] = []
+        self.size = len(json.dumps({TOOLS[kind][1]: []}))  # request body bytes, counting a comma per item
+
+
+class BulkLoader:
+    """Chunked, concurrent loading of records into the knowledge graph
+
+    The current graph is read once (through a ``GraphMirror``) and records
+    that would change nothing are skipped: existing or repeated entities
+    and relations, and observations an entity already has.  New
+    observations on an existing entity are added with
+    ``memory_add_observations``.
+
+    Chunks hold at most ``max_items`` items and ``max_bytes`` of JSON and are
+    sent by ``max_workers`` threads; reading stops while ``max_pending``
+    chunks are queued or in flight.  A relation is sent only after both of
+    its entities exist, and an observation after its entity exists.  Ones
+    still waiting at the end (their entity never appeared, or its chunk
+    failed) are reported as ``blocked``.
+
+    With ``checkpoint``, the number of leading input records that are fully
+    loaded is saved after every chunk and such records are skipped on the
+    next run; everything after them is deduplicated against the graph
+    again.  ``progress`` is called with each chunk's report.
+    """
+
+    def __init__(self, client: Any, max_items: int = 500, max_bytes: int = 256 * 1024, max_workers: int = 4,
+                 max_pending: Optional[int] = None, checkpoint: Optional[str] = None,
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.client = client
+        self.transport = client.transport
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self.max_pending = max_pending or 2 * max_workers
+        self.checkpoint = checkpoint
+        self.progress = progress
+        self.chunks: List[Dict[str, Any]] = []
+        self.stats = {"records": 0, "resumed": 0, "duplicates": 0, "blocked": 0,
+                      ENTITY: 0, RELATION: 0, OBSERVATION: 0, "failed": 0}
+        self._lock = threading.RLock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._batches = {kind: _Batch(kind) for kind in TOOLS}
+        self._ready: List[Tuple[str, Dict[str, Any], int]] = []
+        self._waiting: Dict[str, List[list]] = {}
+        self._outstanding: List[int] = []
+        self._done = set()
+        self._next_index = 0
+        self._resume_from = 0
+
+    def run(self, records: Iterable[Record]) -> Dict[str, Any]:
+        """Load every record; returns the totals"""
+        start = time.perf_counter()
+        if self.checkpoint:
+            self._resume_from = load_checkpoint(self.checkpoint).get("records_done", 0)
+        self.mirror = GraphMirror(self.client, refresh_interval=None)
+        try:
+            self._load(records)
+        finally:
+            # The mirror is only needed while loading; don't leave it attached to the client
+            self.transport.remove_observer(self.mirror)
+            self.mirror = None
+
+        self.stats["blocked"] = len({id(waiting) for records in self._waiting.values() for waiting in records})
+        self._save_checkpoint()
+        elapsed = time.perf_counter() - start
+        loaded = self.stats[ENTITY] + self.stats[RELATION] + self.stats[OBSERVATION]
+        return dict(self.stats, chunks=len(self.chunks), seconds=round(elapsed, 3),
+                    items_per_sec=round(loaded / elapsed, 1) if elapsed else 0.0)
+
+    def _load(self, records: Iterable[Record]) -> None:
+        self._committed = set(self.mirror.entities)
+        self._queued = set()
+        self._relations = set(self.mirror.relations)
+        self._observations: Dict[str, set] = {}
+        self._futures = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            self._pool = pool
+            for index, (kind, item) in enumerate(records):
+                self._next_index = index + 1
+                if index < self._resume_from:
+                    self.stats["resumed"] += 1
+                    continue
+                self.stats["records"] += 1
+                with self._lock:
+                    heapq.heappush(self._outstanding, index)
+                self._accept(index, kind, item)
+                self._take_ready()
+            # Entities still batched or in flight may release waiting records
+            while True:
+                for kind in TOOLS:
+                    self._flush(kind)
+                futures, self._futures = self._futures, []
+                for future in futures:
+                    future.result()
+                self._take_ready()
+                if not futures and not any(batch.items for batch in self._batches.values()):
+                    break
+
+    # ===== DEDUPLICATION AND ORDERING =====
+
+    def _known_observations(self, name: str) -> set:
+        """Observations the entity has or will have once queued chunks land"""
+        known = self._observations.get(name)
+        if known is None:
+            entity = self.mirror.entity(name)
+            known = self._observations[name] = set(entity["observations"]) if entity else set()
+        return known
+
+    def _accept(self, index: int, kind: str, item: Dict[str, Any]) -> None:
+        if kind == ENTITY:
+            name = item["name"]
+            known = self._known_observations(name)
+            if name in self._committed or name in self._queued:
+                # Already there: only its new observations are worth sending
+                kind, item = OBSERVATION, {"entityName": name, "contents": item["observations"]}
+            else:
+                self._queued.add(name)
+                known.update(item["observations"])
+                self._add(ENTITY, item, index)
+                return
+        if kind == RELATION:
+            key = (item["from"], item["to"], item["relationType"])
+            if key in self._relations:
+                self._skip(index)
+                return
+            self._relations.add(key)
+            self._route(index, RELATION, item, {item["from"], item["to"]})
+            return
+        known = self._known_observations(item["entityName"])
+        contents = [o for o in dict.fromkeys(item["contents"]) if o not in known]
+        if not contents:
+            self._skip(index)
+            return
+        known.update(contents)
+        self._route(index, OBSERVATION, {"entityName": item["entityName"], "contents": contents},
+                    {item["entityName"]})
+
+    def _skip(self, index: int) -> None:
+        self.stats["duplicates"] += 1
+        with self._lock:
+            self._done.add(index)
+
+    def _route(self, index: int, kind: str, item: Dict[str, Any], needs: set) -> None:
+        """Batch the item now, or park it until the entities it needs exist"""
+        with self._lock:
+            missing = needs - self._committed
+            if not missing:
+                self._ready.append((kind, item, index))
+                return
+            waiting = [len(missing), kind, item, index]
+            for name in missing:
+                self._waiting.setdefault(name, []).append(waiting)
+
+    def _take_ready(self) -> None:
+        with self._lock:
+            ready, self._ready = self._ready, []
+        for kind, item, index in ready:
+            self._add(kind, item, index)
+
+    # ===== CHUNKING AND SUBMISSION =====
+
+    def _add(self, kind: str, item: Dict[str, Any], index: int) -> None:
+        size = len(json.dumps(item, ensure_ascii=False).encode()) + 1
+        if self._batches[kind].items and self._batches[kind].size + size > self.max_bytes:
+            self._flush(kind)
+        batch = self._batches[kind]
+        batch.items.append(item)
+        batch.indices.append(index)
+        batch.size += size
+        if len(batch.items) >= self.max_items:
+            self._flush(kind)
+
+    def _flush(self, kind: str) -> None:
+        batch = self._batches[kind]
+        if not batch.items:
+            return
+        self._batches[kind] = _Batch(kind)
+        self._slots.acquire()  # backpressure: wait while max_pending chunks are queued or in flight
+        self._futures.append(self._pool.submit(self._send, batch))
+
+    def _send(self, batch: _Batch) -> None:
+        endpoint, field = TOOLS[batch.kind]
+        start = time.perf_counter()
+        error = None
+        try:
+            self.transport.request("POST", endpoint, {field: batch.items})
+        except requests.exceptions.RequestException as e:
+            error = str(e)
+        finally:
+            self._slots.release()
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            report = {"chunk": len(self.chunks) + 1, "kind": batch.kind, "items": len(batch.items),
+                      "bytes": batch.size, "seconds": round(elapsed, 4),
+                      "items_per_sec": round(len(batch.items) / elapsed, 1) if elapsed else 0.0,
+                      "ok": error is None}
+            if error is not None:
+                report["error"] = error
+                self.stats["failed"] += len(batch.items)
+            else:
+                self.stats[batch.kind] += len(batch.items)
+                self._done.update(batch.indices)
+                if batch.kind == ENTITY:
+                    self._commit([item["name"] for item in batch.items])
+            self.chunks.append(report)
+            self._save_checkpoint()
+        if self.progress is not None:
+            self.progress(report)
+
+    def _commit(self, names: List[str]) -> None:
+        """Entities now exist; release the records that were waiting for them"""
+        self._committed.update(names)
+        for name in names:
+            for waiting in self._waiting.pop(name, ()):
+                waiting[0] -= 1
+                if waiting[0] == 0:
+                    self._ready.append((waiting[1], waiting[2], waiting[3]))
+
+    # ===== CHECKPOINTS =====
+
+    def records_done(self) -> int:
+        """Number of leading input records that are fully loaded or skipped"""
+        with self._lock:
+            while self._outstanding and self._outstanding[0] in self._done:
+                self._done.discard(heapq.heappop(self._outstanding))
+            return self._outstanding[0] if self._outstanding else self._next_index
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint:
+            return
+        with self._lock:
+            save_checkpoint(self.checkpoint, {"records_done": self.records_done(), "chunks": len(self.chunks),
+                                              "stats": dict(self.stats), "saved_at": time.time()})
+
+
+def print_chunk(report: Dict[str, Any]) -> None:
+    """One progress line per chunk"""
+    status = "✅" if report["ok"] else f"❌ {report.get('error', '')}"
+    print(f"  chunk {report['chunk']:>5} {report['kind']:<11} {report['items']:>6} items "
+          f"{report['bytes'] / 1024:>8.1f} KiB {report['seconds']:>7.3f}s "
+          f"{report['items_per_sec']:>9.1f} items/s {status}")
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog="mcp-bulk-load", description="Bulk-load records into the memory graph")
+    parser.add_argument("input", help="NDJSON or CSV file (optionally .gz), or - for NDJSON on stdin")
+    parser.add_argument("--url", default=os.getenv("MCP_BASE_URL", "http://192.168.0.7:8000"), help="proxy base URL")
+    parser.add_argument("--token", help="bearer token (default: $MCP_API_TOKEN)")
+    parser.add_argument("--workers", type=int, default=4, help="chunks sent at the same time")
+    parser.add_argument("--max-items", type=int, default=500, help="items per chunk")
+    parser.add_argument("--max-kb", type=int, default=256, help="JSON KiB per chunk")
+    parser.add_argument("--separator", default="|", help="separator of list values in CSV cells")
+    parser.add_argument("--checkpoint", help="checkpoint file; an existing one resumes the load")
+    parser.add_argument("--fresh", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--report", help="write the totals and per-chunk reports as JSON")
+    args = parser.parse_args()
+
+    if args.checkpoint and args.fresh and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    client = OpenAPIClient(args.url, token=args.token,
+                           pool=PoolConfig(connections_per_host=max(args.workers, 10), block=True))
+    loader = BulkLoader(client, max_items=args.max_items, max_bytes=args.max_kb * 1024,
+                        max_workers=args.workers, checkpoint=args.checkpoint, progress=print_chunk)
+    print(f"📦 Loading {args.input} into {args.url} ({args.workers} workers)")
+    try:
+        totals = loader.run(read_records(args.input, args.separator))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Cannot read {args.input}: {e!r}")
+        sys.exit(2)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Cannot read the current graph: {e}")
+        sys.exit(2)
+
+    print(f"\n📊 {totals['records']} records in {totals['seconds']}s: {totals[ENTITY]} entities, "
+          f"{totals[RELATION]} relations, {totals[OBSERVATION]} observation sets "
+          f"({totals['items_per_sec']} items/s over {totals['chunks']} chunks)")
+    print(f"   {totals['duplicates']} already present, {totals['resumed']} done in an earlier run, "
+          f"{totals['failed']} failed, {totals['blocked']} waiting on missing entities")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"totals": totals, "chunks": loader.chunks}, f, indent=2)
+        print(f"💾 Report written to {args.report}")
+    if totals["failed"] or totals["blocked"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
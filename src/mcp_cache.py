@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+TTL/LRU response cache for idempotent MCP tool calls
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+# Read-only endpoints cached by default, with their TTL in seconds
+DEFAULT_TTLS = {
+    "/filesystem/list_allowed_directories": 300.0,
+    "/filesystem/get_file_info": 10.0,
+    "/filesystem/directory_tree": 10.0,
+    "/memory/read_graph": 10.0,
+    "/memory/open_nodes": 10.0,
+    "/time/convert_time": 3600.0,
+}
+
+# Endpoints that change server state; a call to one of them drops every
+# cached response from the same server
+MUTATING_ENDPOINTS = {
+    "/memory/create_entities",
+    "/memory/create_relations",
+    "/memory/add_observations",
+    "/memory/delete_entities",
+    "/memory/delete_observations",
+    "/memory/delete_relations",
+    "/filesystem/write_file",
+    "/filesystem/edit_file",
+    "/filesystem/create_directory",
+    "/filesystem/move_file",
+}
+
+
+def canonical_key(endpoint: str, data: Optional[Dict]) -> str:
+    """Cache key: endpoint plus the request body as canonical JSON"""
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return f"{endpoint} {body}"
+
+
+def server_prefix(endpoint: str) -> str:
+    """Return the server path prefix of an endpoint, e.g. '/memory'"""
+    return "/" + endpoint.lstrip('/').split('/', 1)[0]
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of decoded responses with per-endpoint TTLs
+
+    Only endpoints listed in ``ttls`` are cached.  Entries are held as JSON
+    text, so every hit returns a fresh object and the ``max_bytes`` bound
+    reflects real memory use.  With ``path`` set, entries are loaded from and
+    saved to that file (on ``save()`` and at interpreter exit).
+
+    Any object with the same ``get``/``put``/``invalidate``/``observe``
+    methods can be passed to the clients instead.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_bytes: int = 64 * 1024 * 1024,
+                 path: Optional[str] = None):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self.path = os.path.expanduser(path) if path else None
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.path:
+            self._load()
+            atexit.register(self.save)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, endpoint: str, data: Optional[Dict]) -> Any:
+        """Return the cached response, or None on a miss"""
+        if endpoint not in self.ttls:
+            return None
+        key = canonical_key(endpoint, data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            text = entry[2]
+        return json.loads(text)
+
+    def put(self, endpoint: str, data: Optional[Dict], value: Any) -> None:
+        """Store a response if its endpoint is cacheable"""
+        ttl = self.ttls.get(endpoint)
+        if not ttl or value is None:
+            return
+        text = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+        size = len(text)
+        if size > self.max_bytes:
+            return
+        key = canonical_key(endpoint, data)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (endpoint, time.time() + ttl, text)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, prefix: str = "/") -> int:
+        """Drop entries whose endpoint starts with prefix; return how many"""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[0].startswith(prefix)]
+            for key in stale:
+                self._drop(key)
+        return len(stale)
+
+    def observe(self, endpoint: str, data: Optional[Dict], value: Any) -> None:
+        """Hook called by the transport after each successful request"""
+        if endpoint in MUTATING_ENDPOINTS:
+            self.invalidate(server_prefix(endpoint))
+        else:
+            self.put(endpoint, data, value)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.size -= len(entry[2])
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, (endpoint, expires, text) in stored.items():
+            if expires > now and endpoint in self.ttls:
+                self._entries[key] = (endpoint, expires, text)
+                self.size += len(text)
+        while self.size > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+
+    def save(self) -> None:
+        """Write unexpired entries to the persistence file"""
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            stored = {key: list(entry) for key, entry in self._entries.items() if entry[1] > now}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Record and replay MCP OpenAPI Proxy traffic
+Cassettes hold every request and response with its original timing, so a
+production traffic pattern can be reproduced offline for profiling
+
+Usage: python3 src/mcp_cassette.py record --upstream URL [--port 8766] cassette.jsonl.gz
+       python3 src/mcp_cassette.py serve [--port 8766] [--speed 1|0] cassette.jsonl.gz
+       python3 src/mcp_cassette.py play --url URL [--speed 1|0] cassette.jsonl.gz
+       python3 src/mcp_cassette.py info cassette.jsonl.gz
+"""
+
+import argparse
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+import requests
+try:
+    from mcp_metrics import ClientMetrics
+    from mcp_transport import MCPTransport, PoolConfig
+except ImportError:
+    from .mcp_metrics import ClientMetrics
+    from .mcp_transport import MCPTransport, PoolConfig
+
+CASSETTE_VERSION = 1
+
+# Request headers passed through by the recording proxy; Authorization is
+# forwarded but never written to the cassette
+_FORWARDED_HEADERS = ("Authorization", "Content-Type", "Content-Encoding", "Accept", "User-Agent")
+
+# Answers one request: handle(handler, method)
+RequestHandler = Callable[[BaseHTTPRequestHandler, str], None]
+
+
+def _open(path: str, mode: str):
+    """Open a cassette as text, gzip-compressed if the name ends in .gz"""
+    path = os.path.expanduser(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def request_key(method: str, endpoint: str, body: Any) -> str:
+    """Match key for a request: method, endpoint and canonical JSON body"""
+    return f"{method.upper()} {endpoint} {json.dumps(body, sort_keys=True, separators=(',', ':'))}"
+
+
+class CassetteRecorder:
+    """Appends request/response records to a cassette file
+
+    One JSON object per line after a header line.  Each record holds the
+    start offset ``t`` and duration ``d`` in seconds, the method ``m``,
+    endpoint ``e``, decoded request body ``q``, response status ``s`` and
+    response text ``b``.  Files ending in ``.gz`` are gzip-compressed.
+    Thread-safe; records are flushed every ``flush_every`` entries and on
+    ``close()``, which also runs at interpreter exit.
+    """
+
+    def __init__(self, path: str, base_url: str = "", flush_every: int = 100):
+        self.path = path
+        self.flush_every = flush_every
+        self.started = time.perf_counter()
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = _open(path, "w")
+        self._file.write(json.dumps({"cassette": CASSETTE_VERSION, "base_url": base_url,
+                                     "created": time.strftime("%Y-%m-%dT%H:%M:%S%z")}) + "\n")
+        atexit.register(self.close)
+
+    def record(self, method: str, endpoint: str, body: Any, status: int, content: bytes,
+               start: float, duration: float) -> None:
+        """Add one exchange; ``start`` is a time.perf_counter() reading"""
+        line = json.dumps({
+            "t": round(start - self.started, 6), "d": round(duration, 6),
+            "m": method.upper(), "e": endpoint, "q": body, "s": status,
+            "b": content.decode("utf-8", "replace"),
+        }, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self.count += 1
+            if self.count % self.flush_every == 0:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "CassetteRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def read_cassette(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Return a cassette's header and its records, ordered by start time"""
+    with _open(path, "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("cassette") != CASSETTE_VERSION:
+            raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+        records = [json.loads(line) for line in f if line.strip()]
+    records.sort(key=lambda r: r["t"])
+    return header, records
+
+
+def _sleep_until(deadline: float) -> None:
+    delay = deadline - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+
+
+# ===== HTTP SERVERS =====
+
+class _CassetteServer:
+    """Background ThreadingHTTPServer lifecycle shared by the servers below
+
+    Every request is answered by ``handle``.
+    """
+
+    def __init__(self, host: str, port: int, handle: RequestHandler):
+        self.host = host
+        self.port = port
+        self._handle = handle
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.server.server_address[1]}"
+
+    def start(self) -> str:
+        """Start serving in a background thread and return the base URL"""
+        handle = self._handle
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                handle(self, "GET")
+
+            def do_POST(self):
+                handle(self, "POST")
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name=type(self).__name__, daemon=True).start()
+        return self.url
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    @staticmethod
+    def send(handler: BaseHTTPRequestHandler, status: int, body: bytes,
+             content_type: str = "application/json") -> None:
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    @staticmethod
+    def read_body(handler: BaseHTTPRequestHandler) -> Any:
+        raw = handler.rfile.read(int(handler.headers.get("Content-Length", 0)))
+        if handler.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        return json.loads(raw) if raw else None
+
+
+class RecordingProxy(_CassetteServer):
+    """Reverse proxy in front of the real proxy that records all traffic
+
+    Point Open WebUI (or any client) at ``url`` instead of the proxy to
+    capture a session.  Requests and responses pass through unchanged;
+    bearer tokens are forwarded but not recorded.
+    """
+
+    def __init__(self, upstream: str, path: str, host: str = "127.0.0.1", port: int = 0,
+                 pool: Optional[PoolConfig] = None):
+        super().__init__(host, port, self.handle)
+        self.upstream = upstream.rstrip("/")
+        self.pool = pool or PoolConfig(connections_per_host=32, block=True)
+        self.transport = MCPTransport(self.upstream, pool=self.pool)
+        self.recorder = CassetteRecorder(path, base_url=self.upstream)
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        raw = handler.rfile.read(int(handler.headers.get("Content-Length", 0))) if method == "POST" else None
+        headers = {name: handler.headers[name] for name in _FORWARDED_HEADERS if handler.headers.get(name)}
+        start = time.perf_counter()
+        try:
+            response = self.transport.session.request(method, f"{self.upstream}{handler.path}", data=raw,
+                                                      headers=headers, timeout=self.pool.timeout)
+        except requests.exceptions.RequestException as e:
+            return self.send(handler, 502, json.dumps({"detail": f"Upstream error: {e}"}).encode())
+        duration = time.perf_counter() - start
+
+        body = raw
+        if raw and headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(raw)
+        try:
+            decoded = json.loads(body) if body else None
+        except ValueError:
+            decoded = body.decode("utf-8", "replace")
+        self.recorder.record(method, handler.path, decoded, response.status_code, response.content, start, duration)
+        self.send(handler, response.status_code, response.content,
+                  response.headers.get("Content-Type", "application/json"))
+
+    def stop(self) -> None:
+        super().stop()
+        self.recorder.close()
+
+
+class ReplayServer(_CassetteServer):
+    """Serves a cassette's recorded responses
+
+    Requests are matched on method, endpoint and JSON body.  Repeated
+    requests get the recorded responses in order, the last one repeating
+    once they run out.  With ``speed`` 1.0 each response takes as long as
+    it originally did (2.0 halves that); with ``speed`` 0 responses are
+    sent as fast as possible.  Unmatched requests get 404.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, host: str = "127.0.0.1", port: int = 0):
+        super().__init__(host, port, self.handle)
+        self.speed = speed
+        self.header, records = read_cassette(path)
+        self.responses: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            self.responses.setdefault(request_key(record["m"], record["e"], record["q"]), []).append(record)
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"served": 0, "unmatched": 0}
+
+    def match(self, method: str, endpoint: str, body: Any) -> Optional[Dict[str, Any]]:
+        key = request_key(method, endpoint, body)
+        with self._lock:
+            candidates = self.responses.get(key)
+            if not candidates:
+                self.stats["unmatched"] += 1
+                return None
+            index = self._next.get(key, 0)
+            self._next[key] = index + 1
+            self.stats["served"] += 1
+            return candidates[min(index, len(candidates) - 1)]
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        arrived = time.perf_counter()
+        try:
+            body = self.read_body(handler) if method == "POST" else None
+        except ValueError:
+            body = None
+        record = self.match(method, handler.path, body)
+        if record is None:
+            return self.send(handler, 404, json.dumps({"detail": "Request not in cassette"}).encode())
+        if self.speed > 0:
+            _sleep_until(arrived + record["d"] / self.speed)
+        self.send(handler, record["s"], record["b"].encode("utf-8"))
+
+
+# ===== TRAFFIC REPLAY =====
+
+def play(records: List[Dict[str, Any]], base_url: str, speed: float = 1.0, token: Optional[str] = None,
+         max_workers: int = 64) -> Dict[str, Any]:
+    """Re-send recorded requests to ``base_url`` with their original spacing
+
+    With ``speed`` 1.0 each request starts at its recorded offset (2.0
+    compresses the gaps by half); with ``speed`` 0 all requests are sent as
+    fast as ``max_workers`` threads allow.  Returns a summary with per
+    endpoint latencies and the number of status codes that differed from
+    the recording.
+    """
+    metrics = ClientMetrics()
+    transport = MCPTransport(base_url, pool=PoolConfig(connections_per_host=max_workers, block=True),
+                             metrics=metrics)
+    if token:
+        transport.session.headers["Authorization"] = f"Bearer {token}"
+    mismatched = []
+    lock = threading.Lock()
+    origin = records[0]["t"] if records else 0.0
+
+    def send(record: Dict[str, Any]) -> None:
+        try:
+            transport.request(record["m"], record["e"], record["q"])
+            status = 200
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code
+        except requests.exceptions.RequestException:
+            status = 0
+        if status != record["s"]:
+            with lock:
+                mismatched.append({"endpoint": record["e"], "recorded": record["s"], "replayed": status})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for record in records:
+            if speed > 0:
+                _sleep_until(start + (record["t"] - origin) / speed)
+            pool.submit(send, record)
+    wall = time.perf_counter() - start
+    transport.close()
+
+    span = records[-1]["t"] + records[-1]["d"] - origin if records else 0.0
+    return {
+        "requests": len(records),
+        "recorded_seconds": round(span, 3),
+        "replayed_seconds": round(wall, 3),
+        "mismatched": mismatched,
+        "endpoints": {endpoint: {"requests": stats["requests"], **stats["latency"]["total"]}
+                      for endpoint, stats in metrics.snapshot()["endpoints"].items()},
+    }
+
+
+def describe(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Request counts, bytes and span of a cassette, per endpoint"""
+    endpoints: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        stats = endpoints.setdefault(record["e"], {"requests": 0, "errors": 0, "response_bytes": 0, "seconds": 0.0})
+        stats["requests"] += 1
+        stats["errors"] += record["s"] >= 400
+        stats["response_bytes"] += len(record["b"])
+        stats["seconds"] = round(stats["seconds"] + record["d"], 6)
+    span = records[-1]["t"] + records[-1]["d"] - records[0]["t"] if records else 0.0
+    return {"requests": len(records), "span_seconds": round(span, 3), "endpoints": endpoints}
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Record and replay MCP OpenAPI Proxy traffic")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="run a recording reverse proxy in front of the real proxy")
+    record.add_argument("--upstream", default=os.getenv("MCP_BASE_URL", "http://192.168.0.7:8000"))
+    serve = commands.add_parser("serve", help="serve recorded responses")
+    playback = commands.add_parser("play", help="re-send recorded requests with their original timing")
+    playback.add_argument("--url", required=True, help="proxy to send the requests to")
+    playback.add_argument("--token", default=os.getenv("MCP_API_TOKEN"))
+    playback.add_argument("-j", "--max-workers", type=int, default=64)
+    info = commands.add_parser("info", help="summarise a cassette")
+    for sub in (record, serve):
+        sub.add_argument("--host", default="127.0.0.1")
+        sub.add_argument("--port", type=int, default=8766)
+    for sub in (serve, playback):
+        sub.add_argument("--speed", type=float, default=1.0, help="1 = original timing, 0 = as fast as possible")
+    for sub in (record, serve, playback, info):
+        sub.add_argument("cassette")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        print(json.dumps(describe(read_cassette(args.cassette)[1]), indent=2))
+        return
+    if args.command == "play":
+        _, records = read_cassette(args.cassette)
+        print(f"▶️  Replaying {len(records)} requests to {args.url} at "
+              f"{'full speed' if args.speed <= 0 else f'{args.speed:g}x'}")
+        print(json.dumps(play(records, args.url, args.speed, args.token, args.max_workers), indent=2))
+        return
+
+    if args.command == "record":
+        server = RecordingProxy(args.upstream, args.cassette, args.host, args.port)
+        print(f"⏺️  Recording {args.upstream} via {server.start()} into {args.cassette}")
+    else:
+        server = ReplayServer(args.cassette, args.speed, args.host, args.port)
+        print(f"▶️  Serving {sum(len(v) for v in server.responses.values())} recorded responses "
+              f"on {server.start()}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopping")
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
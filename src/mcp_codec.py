@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Pluggable JSON codecs for the MCP transport
+
+Uses orjson or ujson when installed and falls back to the stdlib ``json``
+module.  Select one explicitly with ``get_codec("json")`` or the
+``MCP_JSON_CODEC`` environment variable.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JSONCodec:
+    """Encode request bodies to bytes and decode response bodies"""
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    name = "ujson"
+
+    def dumps(self, obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return ujson.loads(data)
+
+
+def available_codecs() -> Dict[str, JSONCodec]:
+    """Installed codecs, fastest first"""
+    codecs: Dict[str, JSONCodec] = {}
+    if orjson is not None:
+        codecs["orjson"] = OrjsonCodec()
+    if ujson is not None:
+        codecs["ujson"] = UjsonCodec()
+    codecs["json"] = JSONCodec()
+    return codecs
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """Return the named codec, or the fastest one installed"""
+    codecs = available_codecs()
+    name = name or os.getenv("MCP_JSON_CODEC")
+    if not name:
+        return next(iter(codecs.values()))
+    if name not in codecs:
+        raise ValueError(f"JSON codec {name!r} is not available (installed: {', '.join(codecs)})")
+    return codecs[name]
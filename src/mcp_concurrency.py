@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Adaptive client-side concurrency limits per backend server
+
+Each server path prefix (/memory, /filesystem, ...) gets a limit on calls
+in flight that adapts to the latency and failures the client observes.
+Callers over the limit wait in a queue in the client rather than piling
+onto a saturated stdio backend behind mcpo.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import requests
+
+try:
+    from mcp_cache import server_prefix
+except ImportError:
+    from .mcp_cache import server_prefix
+
+AIMD = "aimd"
+GRADIENT = "gradient"
+
+
+class ConcurrencyLimitExceeded(requests.exceptions.RequestException):
+    """Raised without sending anything when a server's client-side queue is full or too slow"""
+
+
+class ConcurrencyLimit:
+    """Adaptive limit on in-flight calls to one backend server
+
+    ``aimd``: each successful call while the limit is at least half used
+    adds ``1 / limit`` (about +1 per limit's worth of calls); a failure, or
+    a call slower than ``latency_threshold``, multiplies the limit by
+    ``backoff``.
+
+    ``gradient``: the limit tracks the ratio of a slow-moving baseline
+    latency to a fast-moving recent latency.  While recent latency stays
+    within ``tolerance`` times the baseline the limit moves towards
+    ``limit + sqrt(limit)``; beyond that it moves towards
+    ``limit * tolerance * baseline / recent`` (at most halving), at a rate
+    set by ``smoothing``.  Failures back off as in ``aimd``.
+
+    The limit stays between ``min_limit`` and ``max_limit``.  Callers over
+    the limit wait in FIFO order; one that would make the queue longer
+    than ``max_queue``, or waits more than ``queue_timeout`` seconds,
+    gets ``ConcurrencyLimitExceeded``.
+    """
+
+    def __init__(self, algorithm: str = GRADIENT, initial_limit: int = 4, min_limit: int = 1,
+                 max_limit: int = 64, max_queue: int = 1000, queue_timeout: float = 60.0,
+                 backoff: float = 0.9, latency_threshold: Optional[float] = None,
+                 tolerance: float = 1.5, smoothing: float = 0.2, baseline_window: int = 100):
+        if algorithm not in (AIMD, GRADIENT):
+            raise ValueError(f"Unknown concurrency algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.backoff = backoff
+        self.latency_threshold = latency_threshold
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.baseline_window = baseline_window
+        self.limit = float(max(min_limit, min(max_limit, initial_limit)))
+        self.in_flight = 0
+        self.queued = 0
+        self.peak_in_flight = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.queue_seconds = 0.0
+        self.baseline: Optional[float] = None
+        self.recent: Optional[float] = None
+        self._tickets = 0
+        self._serving = 0
+        self._abandoned = set()
+        self._cond = threading.Condition()
+
+    def acquire(self, name: str = "") -> None:
+        """Take an in-flight slot, waiting in line if the server is at its limit"""
+        with self._cond:
+            if self.in_flight < int(self.limit) and self.queued == 0:
+                self._admit()
+                return
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise ConcurrencyLimitExceeded(f"Client queue for {name or 'server'} is full "
+                                               f"({self.queued} waiting, limit {int(self.limit)})")
+            ticket = self._tickets
+            self._tickets += 1
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+            start = time.monotonic()
+            deadline = start + self.queue_timeout
+            try:
+                while not (ticket == self._serving and self.in_flight < int(self.limit)):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        raise ConcurrencyLimitExceeded(
+                            f"Waited {self.queue_timeout:g}s for a slot on {name or 'server'} "
+                            f"(limit {int(self.limit)})")
+                    self._cond.wait(remaining)
+            except ConcurrencyLimitExceeded:
+                self._skip(ticket)
+                raise
+            finally:
+                self.queued -= 1
+                self.queue_seconds += time.monotonic() - start
+            self._advance()
+            self._admit()
+            self._cond.notify_all()
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _advance(self) -> None:
+        """Move the line on to the next caller still waiting"""
+        self._serving += 1
+        while self._serving in self._abandoned:
+            self._abandoned.discard(self._serving)
+            self._serving += 1
+
+    def _skip(self, ticket: int) -> None:
+        """Take a caller that gave up out of the line"""
+        if ticket == self._serving:
+            self._advance()
+        else:
+            self._abandoned.add(ticket)
+        self._cond.notify_all()
+
+    def release(self, latency: float, dropped: bool = False) -> None:
+        """Return a slot and adapt the limit to how the call went
+
+        ``dropped`` marks a backend failure (timeout, connection error,
+        502/503/504); answered calls, including tool errors, count as
+        latency samples.
+        """
+        with self._cond:
+            self.in_flight -= 1
+            if dropped:
+                self.dropped += 1
+                self._decrease()
+            else:
+                self.completed += 1
+                if self.algorithm == AIMD:
+                    self._aimd(latency)
+                else:
+                    self._gradient(latency)
+            self._cond.notify_all()
+
+    def _decrease(self) -> None:
+        self.limit = max(self.min_limit, self.limit * self.backoff)
+
+    def _aimd(self, latency: float) -> None:
+        if self.latency_threshold is not None and latency > self.latency_threshold:
+            self._decrease()
+        elif (self.in_flight + 1) * 2 >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+
+    def _gradient(self, latency: float) -> None:
+        if self.baseline is None:
+            self.baseline = self.recent = latency
+            return
+        self.recent += (latency - self.recent) * self.smoothing
+        # The baseline drifts slowly towards current latency, but drops at
+        # once when the backend gets faster
+        self.baseline = min(self.recent, self.baseline + (latency - self.baseline) / self.baseline_window)
+        gradient = max(0.5, min(1.0, self.tolerance * self.baseline / self.recent)) if self.recent else 1.0
+        if gradient >= 1.0 and (self.in_flight + 1) * 2 < self.limit:
+            return  # not using the limit, so latency says nothing about raising it
+        target = self.limit + math.sqrt(self.limit) if gradient >= 1.0 else self.limit * gradient
+        self.limit = max(self.min_limit, min(self.max_limit,
+                                             self.limit * (1 - self.smoothing) + target * self.smoothing))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "algorithm": self.algorithm,
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "peak_in_flight": self.peak_in_flight,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "dropped": self.dropped,
+                "rejected": self.rejected,
+                "queue_seconds": round(self.queue_seconds, 6),
+                "baseline_latency": round(self.baseline, 6) if self.baseline is not None else None,
+                "recent_latency": round(self.recent, 6) if self.recent is not None else None,
+            }
+
+
+class AdaptiveConcurrency:
+    """One ConcurrencyLimit per server path prefix, created on first use
+
+    Keyword arguments are passed to each ``ConcurrencyLimit``.  Register
+    with ``ClientMetrics.add_collector`` (the transport does this when it
+    has both) to export limits and queue depths with the other metrics.
+    """
+
+    def __init__(self, algorithm: str = GRADIENT, **settings):
+        self.settings = dict(settings, algorithm=algorithm)
+        ConcurrencyLimit(**self.settings)  # fail early on bad settings
+        self._limits: Dict[str, ConcurrencyLimit] = {}
+        self._lock = threading.Lock()
+
+    def for_endpoint(self, endpoint: str) -> ConcurrencyLimit:
+        prefix = server_prefix(endpoint)
+        with self._lock:
+            limit = self._limits.get(prefix)
+            if limit is None:
+                limit = self._limits[prefix] = ConcurrencyLimit(**self.settings)
+            return limit
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """State of every limit seen so far, keyed by prefix"""
+        with self._lock:
+            limits = dict(self._limits)
+        return {prefix: limit.snapshot() for prefix, limit in sorted(limits.items())}
+
+    def to_prometheus(self, prefix: str = "mcp_client") -> str:
+        """Limits, in-flight calls and queue depths as Prometheus gauges and counters"""
+        metrics = [
+            ("concurrency_limit", "gauge", "limit", "Current adaptive concurrency limit."),
+            ("concurrency_in_flight", "gauge", "in_flight", "Calls in flight."),
+            ("concurrency_queue_depth", "gauge", "queued", "Callers waiting for a slot."),
+            ("concurrency_dropped_total", "counter", "dropped", "Calls that failed in the backend."),
+            ("concurrency_rejected_total", "counter", "rejected", "Calls rejected by a full or slow queue."),
+            ("concurrency_queue_seconds_total", "counter", "queue_seconds", "Time spent waiting for a slot."),
+        ]
+        snapshot = self.snapshot()
+        lines = []
+        for name, kind, key, help_text in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(f'{prefix}_{name}{{server="{server}"}} {stats[key]}' for server, stats in snapshot.items())
+        return "\n".join(lines) + "\n"
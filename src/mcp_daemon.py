@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Unix-socket daemon that keeps an MCP client warm between CLI invocations
+Deliberately imports only the standard library, so forwarding a command is
+cheaper than importing requests and opening a new connection
+"""
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+# Runs one CLI command: run_command(argv) -> (exit status, output text)
+CommandRunner = Callable[[List[str]], Tuple[int, str]]
+
+# CLI subcommands that always run in the calling process (they manage the
+# daemon, or stream stdin/stdout)
+IN_PROCESS_COMMANDS = ("daemon", "pipe")
+
+
+def default_socket_path() -> str:
+    """$MCP_DAEMON_SOCKET, else a per-user socket in the runtime directory"""
+    path = os.getenv("MCP_DAEMON_SOCKET")
+    if path:
+        return os.path.expanduser(path)
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(runtime_dir, f"mcp-client-{os.getuid()}.sock")
+
+
+def identity(base_url: str, token: Optional[str]) -> Dict[str, Any]:
+    """Who a command would run as: the proxy URL and a fingerprint of the token"""
+    fingerprint = hashlib.sha256(token.encode()).hexdigest()[:16] if token else None
+    return {"base_url": base_url.rstrip('/'), "token": fingerprint}
+
+
+def _trusted(path: str) -> bool:
+    """True if ``path`` is a socket owned by this user with no group or other access
+
+    The fallback socket path in /tmp is predictable, so a socket someone
+    else created there must not be sent commands.
+    """
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+
+def _exchange(path: str, message: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Send one JSON line to the daemon and read one JSON line back"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as reply:
+            line = reply.readline()
+    if not line:
+        raise ConnectionError("daemon closed the connection without replying")
+    return json.loads(line)
+
+
+def forward(argv: List[str], path: Optional[str] = None,
+            caller: Optional[Dict[str, Any]] = None) -> Optional[Tuple[int, str]]:
+    """Run a CLI command in the daemon
+
+    ``caller`` is the caller's ``identity``; a daemon serving a different
+    proxy or token refuses the command.  None if no daemon is reachable, the
+    socket is not a private one owned by this user, or the daemon refused.
+    """
+    path = path or default_socket_path()
+    if not _trusted(path):
+        return None
+    message: Dict[str, Any] = {"argv": argv}
+    if caller is not None:
+        message["identity"] = caller
+    try:
+        reply = _exchange(path, message)
+    except (OSError, ValueError):
+        return None
+    if "refused" in reply:
+        return None
+    return reply["status"], reply["output"]
+
+
+def forward_cli(argv: List[str], caller: Optional[Dict[str, Any]] = None) -> None:
+    """Forward a CLI invocation and exit with its status if a daemon ran it
+
+    Returns normally when the command should run in-process instead: no
+    arguments, one of ``IN_PROCESS_COMMANDS``, ``MCP_NO_DAEMON`` set, no
+    daemon, or a daemon running with another proxy or token than ``caller``.
+    """
+    if not argv or argv[0] in IN_PROCESS_COMMANDS or os.getenv("MCP_NO_DAEMON"):
+        return
+    result = forward(argv, caller=caller)
+    if result is None:
+        return
+    status, output = result
+    if output:
+        sys.stdout.write(output + "\n")
+    sys.stdout.flush()
+    sys.exit(status)
+
+
+def request(op: str, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Send a control request ("status" or "stop"); None if not running"""
+    path = path or default_socket_path()
+    if not _trusted(path):
+        return None
+    try:
+        return _exchange(path, {"op": op}, timeout=10.0)
+    except (OSError, ValueError):
+        return None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    daemon: "MCPDaemon" = None
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            reply = self.daemon.dispatch(json.loads(line))
+        except Exception as e:
+            reply = {"status": 1, "output": f"❌ Daemon error: {e}"}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class MCPDaemon:
+    """Serves CLI commands over a Unix socket using one long-lived client
+
+    ``run_command`` does the work (it closes over the warm client); the
+    daemon only handles the socket, concurrency and control requests.  The
+    socket is created mode 0600, so only the owning user can use the
+    daemon's credentials.  With ``identity`` set, commands are only run for
+    callers with the same proxy URL and token fingerprint; others are
+    refused and run in their own process.
+    """
+
+    def __init__(self, run_command: CommandRunner, path: Optional[str] = None,
+                 status: Optional[Callable[[], Dict[str, Any]]] = None,
+                 identity: Optional[Dict[str, Any]] = None):
+        self.run_command = run_command
+        self.path = path or default_socket_path()
+        self.status = status
+        self.identity = identity
+        self.refused = 0
+        self.started = time.time()
+        self.commands = 0
+        self.server: Optional[socketserver.ThreadingUnixStreamServer] = None
+        self._lock = threading.Lock()
+
+    def dispatch(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle one decoded request line"""
+        op = message.get("op", "run")
+        if op == "run":
+            if self.identity is not None and message.get("identity") != self.identity:
+                with self._lock:
+                    self.refused += 1
+                return {"refused": "caller uses a different proxy or token"}
+            with self._lock:
+                self.commands += 1
+            status, output = self.run_command(list(message["argv"]))
+            return {"status": status, "output": output}
+        if op == "status":
+            info = {"pid": os.getpid(), "socket": self.path, "uptime": round(time.time() - self.started, 1),
+                    "commands": self.commands, "refused": self.refused}
+            if self.status is not None:
+                info.update(self.status())
+            return info
+        if op == "stop":
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"stopping": True}
+        return {"status": 1, "output": f"Unknown daemon request: {op}"}
+
+    def _claim_socket(self) -> None:
+        """Remove a stale socket left by a dead daemon; refuse a live one"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            _exchange(self.path, {"op": "status"}, timeout=2.0)
+        except (OSError, ValueError):
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            return
+        raise RuntimeError(f"A daemon is already listening on {self.path}")
+
+    def start(self) -> None:
+        """Bind the socket; serve with serve_forever()"""
+        self._claim_socket()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        handler = type("Handler", (_Handler,), {"daemon": self})
+        old_umask = os.umask(0o177)
+        try:
+            self.server = socketserver.ThreadingUnixStreamServer(self.path, handler)
+        finally:
+            os.umask(old_umask)
+        self.server.daemon_threads = True
+
+    def serve_forever(self) -> None:
+        if self.server is None:
+            self.start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self.server is not None:
+            self.server.server_close()
+            self.server = None
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,895 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the MCP OpenAPI Proxy (mcpo)
+Serves the time, memory, filesystem, fetch and openscad routes from memory, with the
+same payload shapes as the real servers, for offline testing and benchmarking
+
+Usage: python3 src/mcp_fake_proxy.py [--port 8765] [--token TOKEN] [--latency-ms N] [--error-rate P]
+"""
+
+import argparse
+import contextlib
+import difflib
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import random
+import shutil
+import stat
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Callable, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Tool input schemas, shaped like the request models mcpo generates
+_OPTIONAL_INT = {"anyOf": [{"type": "integer"}, {"type": "null"}], "default": None}
+_PATH = {"path": {"type": "string"}}
+TOOL_SCHEMAS = {
+    "/time/get_current_time": {
+        "description": "Get current time in a specific timezones",
+        "properties": {"timezone": {"type": "string", "title": "Timezone"}},
+        "required": ["timezone"],
+    },
+    "/time/convert_time": {
+        "description": "Convert time between timezones",
+        "properties": {"source_timezone": {"type": "string"}, "time": {"type": "string"},
+                       "target_timezone": {"type": "string"}},
+        "required": ["source_timezone", "time", "target_timezone"],
+    },
+    "/memory/create_entities": {
+        "description": "Create multiple new entities in the knowledge graph",
+        "properties": {"entities": {"type": "array", "items": {"$ref": "#/components/schemas/Entity"}}},
+        "required": ["entities"],
+    },
+    "/memory/create_relations": {
+        "description": "Create multiple new relations between entities in the knowledge graph",
+        "properties": {"relations": {"type": "array", "items": {"$ref": "#/components/schemas/Relation"}}},
+        "required": ["relations"],
+    },
+    "/memory/add_observations": {
+        "description": "Add new observations to existing entities in the knowledge graph",
+        "properties": {"observations": {"type": "array", "items": {
+            "type": "object", "required": ["entityName", "contents"],
+            "properties": {"entityName": {"type": "string"},
+                           "contents": {"type": "array", "items": {"type": "string"}}}}}},
+        "required": ["observations"],
+    },
+    "/memory/delete_entities": {
+        "description": "Delete multiple entities and their associated relations from the knowledge graph",
+        "properties": {"entityNames": {"type": "array", "items": {"type": "string"}}},
+        "required": ["entityNames"],
+    },
+    "/memory/delete_observations": {
+        "description": "Delete specific observations from entities in the knowledge graph",
+        "properties": {"deletions": {"type": "array", "items": {
+            "type": "object", "required": ["entityName", "observations"],
+            "properties": {"entityName": {"type": "string"},
+                           "observations": {"type": "array", "items": {"type": "string"}}}}}},
+        "required": ["deletions"],
+    },
+    "/memory/delete_relations": {
+        "description": "Delete multiple relations from the knowledge graph",
+        "properties": {"relations": {"type": "array", "items": {"$ref": "#/components/schemas/Relation"}}},
+        "required": ["relations"],
+    },
+    "/memory/read_graph": {"description": "Read the entire knowledge graph", "properties": {}},
+    "/memory/search_nodes": {
+        "description": "Search for nodes in the knowledge graph based on a query",
+        "properties": {"query": {"type": "string"}},
+        "required": ["query"],
+    },
+    "/memory/open_nodes": {
+        "description": "Open specific nodes in the knowledge graph by their names",
+        "properties": {"names": {"type": "array", "items": {"type": "string"}}},
+        "required": ["names"],
+    },
+    "/filesystem/read_text_file": {
+        "description": "Read the complete contents of a file from the file system as text",
+        "properties": dict(_PATH, head=_OPTIONAL_INT, tail=_OPTIONAL_INT),
+        "required": ["path"],
+    },
+    "/filesystem/read_multiple_files": {
+        "description": "Read the contents of multiple files simultaneously",
+        "properties": {"paths": {"type": "array", "items": {"type": "string"}}},
+        "required": ["paths"],
+    },
+    "/filesystem/write_file": {
+        "description": "Create a new file or completely overwrite an existing file with new content",
+        "properties": dict(_PATH, content={"type": "string"}),
+        "required": ["path", "content"],
+    },
+    "/filesystem/edit_file": {
+        "description": "Make line-based edits to a text file",
+        "properties": dict(_PATH, dryRun={"type": "boolean", "default": False}, edits={
+            "type": "array", "items": {"type": "object", "required": ["oldText", "newText"],
+                                       "properties": {"oldText": {"type": "string"},
+                                                      "newText": {"type": "string"}}}}),
+        "required": ["path", "edits"],
+    },
+    "/filesystem/create_directory": {
+        "description": "Create a new directory or ensure a directory exists",
+        "properties": _PATH, "required": ["path"],
+    },
+    "/filesystem/list_directory": {
+        "description": "Get a detailed listing of all files and directories in a specified path",
+        "properties": _PATH, "required": ["path"],
+    },
+    "/filesystem/list_directory_with_sizes": {
+        "description": "Get a detailed listing of all files and directories in a specified path, including sizes",
+        "properties": dict(_PATH, sortBy={"type": "string", "enum": ["name", "size"], "default": "name"}),
+        "required": ["path"],
+    },
+    "/filesystem/directory_tree": {
+        "description": "Get a recursive tree view of files and directories as a JSON structure",
+        "properties": _PATH, "required": ["path"],
+    },
+    "/filesystem/move_file": {
+        "description": "Move or rename files and directories",
+        "properties": {"source": {"type": "string"}, "destination": {"type": "string"}},
+        "required": ["source", "destination"],
+    },
+    "/filesystem/search_files": {
+        "description": "Recursively search for files and directories matching a pattern",
+        "properties": dict(_PATH, pattern={"type": "string"},
+                           excludePatterns={"type": "array", "items": {"type": "string"}, "default": []}),
+        "required": ["path", "pattern"],
+    },
+    "/filesystem/get_file_info": {
+        "description": "Retrieve detailed metadata about a file or directory",
+        "properties": _PATH, "required": ["path"],
+    },
+    "/filesystem/list_allowed_directories": {
+        "description": "Returns the list of directories that this server is allowed to access",
+        "properties": {},
+    },
+    "/fetch/fetch": {
+        "description": "Fetches a URL from the internet and optionally extracts its contents as markdown",
+        "properties": {"url": {"type": "string", "format": "uri", "minLength": 1},
+                       "max_length": {"type": "integer", "default": 5000, "exclusiveMinimum": 0},
+                       "start_index": {"type": "integer", "default": 0, "minimum": 0},
+                       "raw": {"type": "boolean", "default": False}},
+        "required": ["url"],
+    },
+    "/openscad/render_openscad": {
+        "description": "Render OpenSCAD code to PNG image",
+        "properties": {"code": {"type": "string"}, "width": {"type": "integer", "default": 512},
+                       "height": {"type": "integer", "default": 512}},
+        "required": ["code"],
+    },
+    "/openscad/generate_stl": {
+        "description": "Generate STL file from OpenSCAD code",
+        "properties": {"code": {"type": "string"}, "filename": {"type": "string", "default": "model"}},
+        "required": ["code"],
+    },
+}
+
+SHARED_SCHEMAS = {
+    "Entity": {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "entityType": {"type": "string"},
+            "observations": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["name", "entityType", "observations"],
+    },
+    "Relation": {
+        "type": "object",
+        "properties": {"from": {"type": "string"}, "to": {"type": "string"}, "relationType": {"type": "string"}},
+        "required": ["from", "to", "relationType"],
+    },
+}
+
+# Canned pages for /fetch/fetch: url -> (content type, body as the server renders it)
+FETCH_PAGES = {
+    "https://example.com": ("text/html", "This domain is for use in illustrative examples in documents. "
+                            "You may use this domain in literature without prior coordination or asking "
+                            "for permission.\n\n[More information...](https://www.iana.org/domains/example)"),
+    "https://httpbin.org/json": ("application/json", json.dumps({"slideshow": {
+        "author": "Yours Truly", "date": "date of publication", "title": "Sample Slide Show",
+        "slides": [{"title": "Wake up to WonderWidgets!", "type": "all"},
+                   {"items": ["Why <em>WonderWidgets</em> are great", "Who <em>buys</em> WonderWidgets"],
+                    "title": "Overview", "type": "all"}]}}, indent=2)),
+}
+
+_WORDS = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut "
+          "labore et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco").split()
+
+
+class ToolError(Exception):
+    """A tool failure; mcpo reports these as HTTP 500 with a message"""
+
+    def __init__(self, message: str, status: int = 500):
+        super().__init__(message)
+        self.status = status
+
+
+def format_size(size: int) -> str:
+    """Human-readable size, as the filesystem server prints it"""
+    units = ["B", "KB", "MB", "GB", "TB"]
+    if size == 0:
+        return "0 B"
+    i = 0
+    while i < len(units) - 1 and size >= 1024 ** (i + 1):
+        i += 1
+    return f"{size} B" if i == 0 else f"{size / 1024 ** i:.2f} {units[i]}"
+
+
+def filler_text(size: int, seed: Any = 0) -> str:
+    """Deterministic prose of exactly ``size`` characters"""
+    rng = random.Random(str(seed))
+    words, length = [], 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+class FakeProxy:
+    """In-process fake of the MCP OpenAPI Proxy
+
+    Routes answer like mcpo in front of the reference time, memory,
+    filesystem and fetch servers and the simple OpenSCAD server: tool text that parses as JSON is returned
+    as JSON, tool errors are HTTP 500 ``{"detail": {"message": ...}}`` and
+    missing required arguments are HTTP 422.  The filesystem is rooted at
+    ``root`` (a temporary directory by default) and the knowledge graph
+    lives in memory.  With ``token`` set, requests need that bearer token.
+
+    Fault injection: every tool call waits ``latency`` seconds, plus or
+    minus up to ``jitter``, and fails with ``error_status`` with probability
+    ``error_rate`` (randomness from ``seed``).  ``bandwidth_kbps`` throttles
+    both directions.  ``fetch_bytes`` sets the size of pages generated for
+    URLs not in ``FETCH_PAGES``; ``populate_graph()`` and
+    ``populate_files()`` create bulk data.
+
+    Backends: ``server_latency`` adds per-server work time, e.g.
+    ``{"openscad": 0.2}`` for slow renders, and ``backend_concurrency``
+    limits how many calls each server runs at once, the way a stdio server
+    behind mcpo works through its requests; excess calls queue.
+
+    Responses of at least ``gzip_min_size`` bytes are gzip-compressed when
+    the client accepts it; gzip request bodies are accepted unless
+    ``gzip_requests`` is False, in which case they get 415.
+    ``/openapi.json`` and ``/<server>/openapi.json`` describe the routes the
+    way mcpo does, with an ETag unless ``etags`` is False.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, token: Optional[str] = None,
+                 root: Optional[str] = None, bandwidth_kbps: Optional[float] = None,
+                 gzip_min_size: Optional[int] = 1024, gzip_requests: bool = True, etags: bool = True,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: Optional[int] = None, fetch_bytes: int = 4096,
+                 server_latency: Optional[Dict[str, float]] = None, backend_concurrency: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.bandwidth_kbps = bandwidth_kbps
+        self.gzip_min_size = gzip_min_size
+        self.gzip_requests = gzip_requests
+        self.etags = etags
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fetch_bytes = fetch_bytes
+        self.server_latency = dict(server_latency or {})
+        self.backend_concurrency = backend_concurrency
+        self._backends: Dict[str, threading.Semaphore] = {}
+        self.random = random.Random(seed)
+        self._own_root = root is None
+        self.root = os.path.realpath(root or tempfile.mkdtemp(prefix="mcp-fake-proxy-"))
+        self.entities: Dict[str, Dict[str, Any]] = {}
+        self.relations: List[Dict[str, Any]] = []
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "bytes_in": 0, "bytes_out": 0, "injected_errors": 0}
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.routes = {
+            "/time/get_current_time": self.time_get_current_time,
+            "/time/convert_time": self.time_convert_time,
+            "/memory/create_entities": self.memory_create_entities,
+            "/memory/create_relations": self.memory_create_relations,
+            "/memory/add_observations": self.memory_add_observations,
+            "/memory/delete_entities": self.memory_delete_entities,
+            "/memory/delete_observations": self.memory_delete_observations,
+            "/memory/delete_relations": self.memory_delete_relations,
+            "/memory/read_graph": self.memory_read_graph,
+            "/memory/search_nodes": self.memory_search_nodes,
+            "/memory/open_nodes": self.memory_open_nodes,
+            "/filesystem/read_text_file": self.fs_read_text_file,
+            "/filesystem/read_multiple_files": self.fs_read_multiple_files,
+            "/filesystem/write_file": self.fs_write_file,
+            "/filesystem/edit_file": self.fs_edit_file,
+            "/filesystem/create_directory": self.fs_create_directory,
+            "/filesystem/list_directory": self.fs_list_directory,
+            "/filesystem/list_directory_with_sizes": self.fs_list_directory_with_sizes,
+            "/filesystem/directory_tree": self.fs_directory_tree,
+            "/filesystem/move_file": self.fs_move_file,
+            "/filesystem/search_files": self.fs_search_files,
+            "/filesystem/get_file_info": self.fs_get_file_info,
+            "/filesystem/list_allowed_directories": self.fs_list_allowed_directories,
+            "/fetch/fetch": self.fetch_fetch,
+            "/openscad/render_openscad": self.openscad_render_openscad,
+            "/openscad/generate_stl": self.openscad_generate_stl,
+        }
+
+    # ===== SERVER LIFECYCLE =====
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.server.server_address[1]}"
+
+    def start(self) -> str:
+        """Start serving in a background thread and return the base URL"""
+        proxy = self
+
+        class Handler(FakeProxyHandler):
+            pass
+        Handler.proxy = proxy
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="mcp-fake-proxy", daemon=True).start()
+        return self.url
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self._own_root:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def __enter__(self) -> "FakeProxy":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def throttle(self, nbytes: int) -> None:
+        """Sleep as long as nbytes would take on the simulated link"""
+        if self.bandwidth_kbps:
+            time.sleep(nbytes * 8 / (self.bandwidth_kbps * 1000))
+
+    def inject_fault(self) -> bool:
+        """Apply latency and jitter; return True if this call should fail"""
+        with self.lock:
+            delay = self.latency + (self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self.random.random() < self.error_rate
+            if fail:
+                self.stats["injected_errors"] += 1
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+
+    def run_backend(self, server: str, call: Callable[[], Any]) -> Any:
+        """Run a tool call in its server's backend, honouring its limits"""
+        with self.lock:
+            slots = self._backends.get(server)
+            if slots is None and self.backend_concurrency:
+                slots = self._backends[server] = threading.Semaphore(self.backend_concurrency)
+        with slots or contextlib.nullcontext():
+            work = self.server_latency.get(server, 0.0)
+            if work > 0:
+                time.sleep(work)
+            return call()
+
+    # ===== BULK DATA =====
+
+    def populate_graph(self, entities: int, relations_per_entity: int = 2,
+                       observations: int = 3, seed: int = 1) -> None:
+        """Add ``entities`` generated entities and their relations"""
+        rng = random.Random(seed)
+        names = [f"Entity {len(self.entities) + i}" for i in range(entities)]
+        with self.lock:
+            for name in names:
+                self.entities[name] = {
+                    "type": "entity", "name": name,
+                    "entityType": rng.choice(["Person", "Project", "Technology", "Concept"]),
+                    "observations": [filler_text(rng.randint(40, 120), (seed, name, i)) for i in range(observations)],
+                }
+            for name in names:
+                for _ in range(relations_per_entity):
+                    self.relations.append({"type": "relation", "from": name, "to": rng.choice(names),
+                                           "relationType": rng.choice(["uses", "depends_on", "part_of"])})
+
+    def populate_files(self, count: int, size: int, directory: str = "data") -> List[str]:
+        """Write ``count`` text files of ``size`` bytes under the root"""
+        base = os.path.join(self.root, directory)
+        os.makedirs(base, exist_ok=True)
+        paths = []
+        for i in range(count):
+            path = os.path.join(base, f"file_{i:05d}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(filler_text(size, (directory, i)))
+            paths.append(path)
+        return paths
+
+    # ===== OPENAPI DOCUMENTS =====
+
+    def servers(self) -> List[str]:
+        """Names of the servers that have at least one route"""
+        return sorted({route.split("/")[1] for route in self.routes})
+
+    def openapi(self, server: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The root document, or one server's document (None if unknown)"""
+        if server is None:
+            links = "".join(f"- [{name}](/{name}/docs)\n" for name in self.servers())
+            return {"openapi": "3.1.0", "paths": {}, "info": {
+                "title": "MCP OpenAPI Proxy", "version": "1.0",
+                "description": f"Automatically generated API from MCP Tool Schemas\n\n- **available tools**:\n{links}"}}
+        if server not in self.servers():
+            return None
+
+        paths, schemas = {}, dict(SHARED_SCHEMAS)
+        for route in sorted(self.routes):
+            _, prefix, tool = route.split("/", 2)
+            if prefix != server:
+                continue
+            schema = dict(TOOL_SCHEMAS.get(route, {"properties": {}}))
+            description = schema.pop("description", tool)
+            model = f"{tool}_form_model"
+            schemas[model] = dict(schema, type="object", title=model)
+            paths[f"/{tool}"] = {"post": {
+                "summary": tool.replace("_", " ").title(),
+                "description": description,
+                "operationId": f"tool_{tool}_post",
+                "requestBody": {"required": True, "content": {
+                    "application/json": {"schema": {"$ref": f"#/components/schemas/{model}"}}}},
+            }}
+        return {"openapi": "3.1.0", "info": {"title": server, "version": "1.0"},
+                "paths": paths, "components": {"schemas": schemas}}
+
+    # ===== TIME SERVER =====
+
+    @staticmethod
+    def _zone(name: str) -> ZoneInfo:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise ToolError(f"Error processing mcp-server-time query: Invalid timezone: {e}")
+
+    @staticmethod
+    def _time_result(name: str, moment: datetime) -> Dict[str, Any]:
+        return {"timezone": name, "datetime": moment.isoformat(timespec="seconds"), "is_dst": bool(moment.dst())}
+
+    def time_get_current_time(self, body: Dict) -> Any:
+        return self._time_result(body["timezone"], datetime.now(self._zone(body["timezone"])))
+
+    def time_convert_time(self, body: Dict) -> Any:
+        source_zone = self._zone(body["source_timezone"])
+        target_zone = self._zone(body["target_timezone"])
+        try:
+            parsed = datetime.strptime(body["time"], "%H:%M").time()
+        except ValueError:
+            raise ToolError("Error processing mcp-server-time query: "
+                            "Invalid time format. Expected HH:MM [24-hour format]")
+        now = datetime.now(source_zone)
+        source = datetime(now.year, now.month, now.day, parsed.hour, parsed.minute, tzinfo=source_zone)
+        target = source.astimezone(target_zone)
+        hours = ((target.utcoffset() or timedelta()) - (source.utcoffset() or timedelta())).total_seconds() / 3600
+        if hours.is_integer():
+            difference = f"{hours:+.1f}h"
+        else:
+            difference = f"{hours:+.2f}".rstrip("0").rstrip(".") + "h"
+        return {"source": self._time_result(body["source_timezone"], source),
+                "target": self._time_result(body["target_timezone"], target),
+                "time_difference": difference}
+
+    # ===== MEMORY SERVER =====
+
+    def memory_create_entities(self, body: Dict) -> Any:
+        created = []
+        with self.lock:
+            for entity in body["entities"]:
+                if entity["name"] not in self.entities:
+                    self.entities[entity["name"]] = {"type": "entity", "name": entity["name"],
+                                                     "entityType": entity["entityType"],
+                                                     "observations": list(entity.get("observations", []))}
+                    created.append(entity)
+        return created
+
+    def memory_create_relations(self, body: Dict) -> Any:
+        created = []
+        with self.lock:
+            existing = {(r["from"], r["to"], r["relationType"]) for r in self.relations}
+            for relation in body["relations"]:
+                key = (relation["from"], relation["to"], relation["relationType"])
+                if key not in existing:
+                    existing.add(key)
+                    self.relations.append({"type": "relation", "from": key[0], "to": key[1], "relationType": key[2]})
+                    created.append(relation)
+        return created
+
+    def memory_add_observations(self, body: Dict) -> Any:
+        results = []
+        with self.lock:
+            for item in body["observations"]:
+                entity = self.entities.get(item["entityName"])
+                if entity is None:
+                    raise ToolError(f"Entity with name {item['entityName']} not found")
+                added = [c for c in item["contents"] if c not in entity["observations"]]
+                entity["observations"].extend(added)
+                results.append({"entityName": item["entityName"], "addedObservations": added})
+        return results
+
+    def memory_delete_entities(self, body: Dict) -> Any:
+        names = set(body["entityNames"])
+        with self.lock:
+            for name in names:
+                self.entities.pop(name, None)
+            self.relations = [r for r in self.relations if r["from"] not in names and r["to"] not in names]
+        return "Entities deleted successfully"
+
+    def memory_delete_observations(self, body: Dict) -> Any:
+        with self.lock:
+            for item in body["deletions"]:
+                entity = self.entities.get(item["entityName"])
+                if entity is not None:
+                    entity["observations"] = [o for o in entity["observations"] if o not in item["observations"]]
+        return "Observations deleted successfully"
+
+    def memory_delete_relations(self, body: Dict) -> Any:
+        doomed = {(r["from"], r["to"], r["relationType"]) for r in body["relations"]}
+        with self.lock:
+            self.relations = [r for r in self.relations if (r["from"], r["to"], r["relationType"]) not in doomed]
+        return "Relations deleted successfully"
+
+    def memory_read_graph(self, body: Dict) -> Any:
+        with self.lock:
+            return {"entities": list(self.entities.values()), "relations": list(self.relations)}
+
+    def _subgraph(self, entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        names = {e["name"] for e in entities}
+        return {"entities": entities,
+                "relations": [r for r in self.relations if r["from"] in names and r["to"] in names]}
+
+    def memory_search_nodes(self, body: Dict) -> Any:
+        query = body["query"].lower()
+        with self.lock:
+            return self._subgraph([
+                e for e in self.entities.values()
+                if query in e["name"].lower() or query in e["entityType"].lower()
+                or any(query in o.lower() for o in e["observations"])
+            ])
+
+    def memory_open_nodes(self, body: Dict) -> Any:
+        with self.lock:
+            return self._subgraph([self.entities[n] for n in body["names"] if n in self.entities])
+
+    # ===== FILESYSTEM SERVER =====
+
+    def _resolve(self, path: str) -> str:
+        """Map a request path into the root directory, refusing escapes"""
+        path = os.path.expanduser(path)
+        full = os.path.realpath(path if os.path.isabs(path) else os.path.join(self.root, path))
+        if full != self.root and not full.startswith(self.root + os.sep):
+            raise ToolError(f"Error: Access denied - path outside allowed directories: {full} not in {self.root}")
+        return full
+
+    def _read(self, path: str) -> str:
+        try:
+            with open(self._resolve(path), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise ToolError(f"Error: ENOENT: no such file or directory, open '{path}'")
+        except IsADirectoryError:
+            raise ToolError("Error: EISDIR: illegal operation on a directory, read")
+
+    def fs_read_text_file(self, body: Dict) -> Any:
+        head, tail = body.get("head"), body.get("tail")
+        if head is not None and tail is not None:
+            raise ToolError("Error: Cannot specify both head and tail parameters simultaneously")
+        content = self._read(body["path"])
+        if head is not None:
+            return "\n".join(content.split("\n")[:head])
+        if tail is not None:
+            return "\n".join(content.split("\n")[-tail:]) if tail else ""
+        return content
+
+    def fs_read_multiple_files(self, body: Dict) -> Any:
+        parts = []
+        for path in body["paths"]:
+            try:
+                parts.append(f"{path}:\n{self._read(path)}\n")
+            except ToolError as e:
+                parts.append(f"{path}: {str(e).replace('Error: ', 'Error - ', 1)}")
+        return "\n---\n".join(parts)
+
+    def fs_write_file(self, body: Dict) -> Any:
+        path = self._resolve(body["path"])
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body["content"])
+        return f"Successfully wrote to {body['path']}"
+
+    def fs_edit_file(self, body: Dict) -> Any:
+        original = self._read(body["path"])
+        modified = original
+        for edit in body["edits"]:
+            if edit["oldText"] not in modified:
+                raise ToolError(f"Error: Could not find exact match for edit:\n{edit['oldText']}")
+            modified = modified.replace(edit["oldText"], edit["newText"], 1)
+        diff = "".join(difflib.unified_diff(original.splitlines(True), modified.splitlines(True),
+                                            body["path"], body["path"], "original", "modified"))
+        if not body.get("dryRun"):
+            with open(self._resolve(body["path"]), "w", encoding="utf-8") as f:
+                f.write(modified)
+        return f"```diff\n{diff}```\n\n"
+
+    def fs_create_directory(self, body: Dict) -> Any:
+        os.makedirs(self._resolve(body["path"]), exist_ok=True)
+        return f"Successfully created directory {body['path']}"
+
+    def _entries(self, path: str) -> List[os.DirEntry]:
+        try:
+            return list(os.scandir(self._resolve(path)))
+        except FileNotFoundError:
+            raise ToolError(f"Error: ENOENT: no such file or directory, scandir '{path}'")
+
+    def fs_list_directory(self, body: Dict) -> Any:
+        return "\n".join(f"{'[DIR]' if e.is_dir() else '[FILE]'} {e.name}" for e in self._entries(body["path"]))
+
+    def fs_list_directory_with_sizes(self, body: Dict) -> Any:
+        entries = [(e.name, e.is_dir(), 0 if e.is_dir() else e.stat().st_size) for e in self._entries(body["path"])]
+        if body.get("sortBy", "name") == "size":
+            entries.sort(key=lambda e: -e[2])
+        else:
+            entries.sort(key=lambda e: e[0])
+        lines = [f"{'[DIR]' if is_dir else '[FILE]'} {name.ljust(30)} {'' if is_dir else format_size(size).rjust(10)}"
+                 for name, is_dir, size in entries]
+        files = sum(1 for e in entries if not e[1])
+        lines += ["", f"Total: {files} files, {len(entries) - files} directories",
+                  f"Combined size: {format_size(sum(e[2] for e in entries))}"]
+        return "\n".join(lines)
+
+    def fs_directory_tree(self, body: Dict) -> Any:
+        def build(path: str) -> List[Dict[str, Any]]:
+            tree = []
+            for entry in sorted(os.scandir(path), key=lambda e: e.name):
+                node = {"name": entry.name, "type": "directory" if entry.is_dir() else "file"}
+                if entry.is_dir():
+                    node["children"] = build(entry.path)
+                tree.append(node)
+            return tree
+        self._entries(body["path"])
+        return json.dumps(build(self._resolve(body["path"])), indent=2)
+
+    def fs_move_file(self, body: Dict) -> Any:
+        source, destination = self._resolve(body["source"]), self._resolve(body["destination"])
+        if os.path.exists(destination):
+            raise ToolError(f"Error: Destination already exists: {body['destination']}")
+        os.rename(source, destination)
+        return f"Successfully moved {body['source']} to {body['destination']}"
+
+    def fs_search_files(self, body: Dict) -> Any:
+        root = self._resolve(body["path"])
+        pattern = body["pattern"].lower()
+        excludes = body.get("excludePatterns") or []
+        matches = []
+        for directory, dirs, files in os.walk(root):
+            for name in sorted(dirs) + sorted(files):
+                full = os.path.join(directory, name)
+                relative = os.path.relpath(full, root)
+                if any(fnmatch.fnmatch(relative, p) or fnmatch.fnmatch(name, p) for p in excludes):
+                    continue
+                if pattern in name.lower():
+                    matches.append(full)
+        return "\n".join(matches) if matches else "No matches found"
+
+    def fs_get_file_info(self, body: Dict) -> Any:
+        try:
+            info = os.stat(self._resolve(body["path"]))
+        except FileNotFoundError:
+            raise ToolError(f"Error: ENOENT: no such file or directory, stat '{body['path']}'")
+
+        def stamp(seconds: float) -> str:
+            moment = datetime.fromtimestamp(seconds, timezone.utc)
+            return moment.strftime("%a %b %d %Y %H:%M:%S GMT+0000 (Coordinated Universal Time)")
+        return "\n".join([
+            f"size: {info.st_size}",
+            f"created: {stamp(info.st_ctime)}",
+            f"modified: {stamp(info.st_mtime)}",
+            f"accessed: {stamp(info.st_atime)}",
+            f"isDirectory: {str(stat.S_ISDIR(info.st_mode)).lower()}",
+            f"isFile: {str(stat.S_ISREG(info.st_mode)).lower()}",
+            f"permissions: {oct(info.st_mode)[-3:]}",
+        ])
+
+    def fs_list_allowed_directories(self, body: Dict) -> Any:
+        return f"Allowed directories:\n{self.root}"
+
+    # ===== FETCH SERVER =====
+
+    def fetch_fetch(self, body: Dict) -> Any:
+        url = body["url"]
+        max_length, start_index = body.get("max_length", 5000), body.get("start_index", 0)
+        content_type, content = FETCH_PAGES.get(url.rstrip("/"), ("text/html", None))
+        if content is None:
+            content = filler_text(self.fetch_bytes, url)
+        prefix = ""
+        if body.get("raw") or content_type != "text/html":
+            prefix = f"Content type {content_type} cannot be simplified to markdown, but here is the raw content:\n"
+
+        chunk = content[start_index:start_index + max_length]
+        if not chunk:
+            chunk = "<error>No more content available.</error>"
+        elif len(chunk) == max_length and len(content) > start_index + max_length:
+            chunk += (f"\n\n<error>Content truncated. Call the fetch tool with a start_index of "
+                      f"{start_index + max_length} to get more content.</error>")
+        return f"{prefix}Contents of {url}:\n{chunk}"
+
+    # ===== OPENSCAD SERVER =====
+
+    @staticmethod
+    def _check_scad(code: str) -> None:
+        if code.count("(") != code.count(")") or code.count("{") != code.count("}"):
+            raise ToolError("❌ OpenSCAD model compilation failed:\nERROR: Parser error: syntax error")
+
+    def openscad_render_openscad(self, body: Dict) -> Any:
+        self._check_scad(body["code"])
+        width, height = body.get("width", 512), body.get("height", 512)
+        return f"✅ OpenSCAD model rendered successfully!\n📐 Image size: {width}x{height} pixels\n" \
+               f"🖼️ PNG data: {filler_text(min(width * height // 64, 65536), body['code'])}"
+
+    def openscad_generate_stl(self, body: Dict) -> Any:
+        self._check_scad(body["code"])
+        stl = f"solid {body.get('filename', 'model')}\n" + "facet normal 0 0 1\n" * (len(body["code"]) * 4)
+        return f"✅ STL file generated successfully!\n📁 Filename: {body.get('filename', 'model')}.stl\n" \
+               f"📊 Size: {len(stl)} bytes\n\n```stl\n{stl}```"
+
+
+def mcpo_result(result: Any) -> Any:
+    """mcpo returns tool text that parses as JSON as JSON, other text as a string"""
+    if isinstance(result, str):
+        try:
+            return json.loads(result)
+        except ValueError:
+            return result
+    return result
+
+
+class FakeProxyHandler(BaseHTTPRequestHandler):
+    """HTTP front end dispatching to a FakeProxy's routes"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    proxy: FakeProxy = None
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, payload: Any, extra_headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json", **(extra_headers or {})}
+        gzip_min_size = self.proxy.gzip_min_size
+        if gzip_min_size is not None and len(data) >= gzip_min_size and \
+                "gzip" in self.headers.get("Accept-Encoding", ""):
+            data = gzip.compress(data, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        headers["Content-Length"] = str(len(data))
+
+        with self.proxy.lock:
+            self.proxy.stats["bytes_out"] += len(data)
+        self.proxy.throttle(len(data))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        with self.proxy.lock:
+            self.proxy.stats["requests"] += 1
+        if self.path == "/openapi.json":
+            document = self.proxy.openapi()
+        elif self.path.endswith("/openapi.json"):
+            document = self.proxy.openapi(self.path[1:-len("/openapi.json")])
+        elif self.path.endswith("/docs"):
+            return self._reply(200, {"title": "MCP OpenAPI Proxy - Swagger UI"})
+        else:
+            document = None
+        if document is None:
+            return self._reply(404, {"detail": "Not Found"})
+
+        etag = '"%s"' % hashlib.sha256(json.dumps(document).encode()).hexdigest()[:16]
+        if self.proxy.etags and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        return self._reply(200, document, {"ETag": etag} if self.proxy.etags else None)
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.proxy.lock:
+            self.proxy.stats["requests"] += 1
+            self.proxy.stats["bytes_in"] += len(raw)
+        self.proxy.throttle(len(raw))
+
+        if self.proxy.token and self.headers.get("Authorization") != f"Bearer {self.proxy.token}":
+            return self._reply(401, {"detail": "Invalid or missing API key"})
+        route = self.proxy.routes.get(self.path)
+        if route is None:
+            return self._reply(404, {"detail": "Not Found"})
+        if self.proxy.inject_fault():
+            return self._reply(self.proxy.error_status, {"detail": "Injected failure"})
+
+        if self.headers.get("Content-Encoding") == "gzip":
+            if not self.proxy.gzip_requests:
+                return self._reply(415, {"detail": "Unsupported Content-Encoding"})
+            try:
+                raw = gzip.decompress(raw)
+            except (OSError, EOFError, zlib.error) as e:
+                return self._reply(400, {"detail": f"Invalid gzip body: {e}"})
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError as e:
+            return self._reply(422, {"detail": [{"type": "json_invalid", "loc": ["body"],
+                                                 "msg": f"JSON decode error: {e}"}]})
+
+        missing = [name for name in TOOL_SCHEMAS.get(self.path, {}).get("required", []) if name not in body]
+        if missing:
+            return self._reply(422, {"detail": [{"type": "missing", "loc": ["body", name], "msg": "Field required",
+                                                 "input": body} for name in missing]})
+        try:
+            server = self.path.split("/")[1]
+            return self._reply(200, mcpo_result(self.proxy.run_backend(server, lambda: route(body))))
+        except ToolError as e:
+            return self._reply(e.status, {"detail": {"message": str(e)}})
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            return self._reply(500, {"detail": {"message": f"Error: {e}"}})
+
+
+def main():
+    """Run the fake proxy in the foreground"""
+    parser = argparse.ArgumentParser(description="Local stand-in MCP OpenAPI Proxy")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", default=os.getenv("MCP_API_TOKEN"), help="required bearer token")
+    parser.add_argument("--root", help="filesystem root (default: a temporary directory)")
+    parser.add_argument("--bandwidth-kbps", type=float, help="simulated link speed")
+    parser.add_argument("--no-gzip", action="store_true", help="never compress responses")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added latency per tool call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random +/- variation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of tool calls that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected failures")
+    parser.add_argument("--seed", type=int, help="seed for jitter and failures")
+    parser.add_argument("--server-latency-ms", default="",
+                        help="extra work time per server, e.g. openscad=200,fetch=50")
+    parser.add_argument("--backend-concurrency", type=int, help="calls each server runs at once")
+    parser.add_argument("--fetch-kb", type=float, default=4, help="size of generated fetch pages")
+    parser.add_argument("--entities", type=int, default=0, help="pre-populate the knowledge graph")
+    parser.add_argument("--files", type=int, default=0, help="pre-populate <root>/data with text files")
+    parser.add_argument("--file-kb", type=float, default=4, help="size of pre-populated files")
+    args = parser.parse_args()
+
+    proxy = FakeProxy(args.host, args.port, token=args.token, root=args.root,
+                      bandwidth_kbps=args.bandwidth_kbps, gzip_min_size=None if args.no_gzip else 1024,
+                      latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                      error_rate=args.error_rate, error_status=args.error_status, seed=args.seed,
+                      fetch_bytes=int(args.fetch_kb * 1024),
+                      server_latency={name: float(ms) / 1000 for name, ms in
+                                      (item.split("=") for item in args.server_latency_ms.split(",") if item)},
+                      backend_concurrency=args.backend_concurrency)
+    proxy.populate_graph(args.entities)
+    if args.files:
+        proxy.populate_files(args.files, int(args.file_kb * 1024))
+    url = proxy.start()
+    print(f"🧪 Fake MCP proxy listening on {url} (filesystem root: {proxy.root})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopping")
+    finally:
+        proxy.stop()
+
+if __name__ == "__main__":
+    main()
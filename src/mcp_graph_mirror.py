@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Client-side indexed mirror of the memory server's knowledge graph
+
+Loads ``memory_read_graph`` once, indexes it by entity name, entity type
+and relation type with adjacency lists, and keeps it current by applying
+the client's own memory writes as they succeed.  A periodic refresh
+re-reads the graph but only rebuilds the indexes when its hash changed.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+READ_GRAPH = "/memory/read_graph"
+
+RelationKey = Tuple[str, str, str]
+
+
+def relation_key(relation: Dict[str, Any]) -> RelationKey:
+    return relation["from"], relation["to"], relation["relationType"]
+
+
+class GraphMirror:
+    """Indexed local copy of the knowledge graph behind a client
+
+    Attaches to ``client.transport`` and applies every successful
+    ``memory_create_entities``, ``memory_create_relations``,
+    ``memory_add_observations``, ``memory_delete_entities``,
+    ``memory_delete_observations`` and ``memory_delete_relations`` call made
+    through it, with the memory server's semantics (existing names and
+    relations are skipped, deleting an entity deletes its relations).
+
+    Writes by other clients show up at the next ``refresh``, which runs at
+    most every ``refresh_interval`` seconds when a lookup is made (None
+    turns that off).  A refresh hashes the raw ``read_graph`` body and
+    skips decoding and re-indexing when it is unchanged.
+
+    Lookups return the mirror's own dicts, which callers should treat as
+    read-only.  Listeners added with ``add_listener`` (such as
+    ``mcp_search_index.SearchIndex``) are told about every entity change.
+    """
+
+    def __init__(self, client: Any, refresh_interval: Optional[float] = 60.0, load: bool = True):
+        self.transport = client.transport
+        self.refresh_interval = refresh_interval
+        self.entities: Dict[str, Dict[str, Any]] = {}
+        self.relations: Dict[RelationKey, Dict[str, Any]] = {}
+        self.by_type: Dict[str, Set[str]] = {}
+        self.by_relation_type: Dict[str, Set[RelationKey]] = {}
+        self.outgoing: Dict[str, Set[RelationKey]] = {}
+        self.incoming: Dict[str, Set[RelationKey]] = {}
+        self.digest: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.stats = {"loads": 0, "refreshes": 0, "unchanged": 0, "raced": 0, "applied": 0}
+        self.listeners: List[Any] = []
+        self._touched: Set[str] = set()
+        self._generation = 0  # writes applied so far
+        self._lock = threading.RLock()
+        self._refreshing = threading.Lock()
+        self.transport.add_observer(self)
+        if load:
+            self.refresh()
+
+    # ===== LOADING =====
+
+    def refresh(self, attempts: int = 3) -> bool:
+        """Re-read the graph; rebuild the indexes if it changed since the last read
+
+        A write applied while the graph was being read may be missing from
+        it, so the read is repeated (up to ``attempts`` times); if writes
+        keep arriving the current indexes, which include them, are kept.
+        """
+        for _ in range(attempts):
+            with self._lock:
+                generation = self._generation
+            hasher = hashlib.sha256()
+            chunks = []
+            for chunk in self.transport.stream("POST", READ_GRAPH):
+                hasher.update(chunk)
+                chunks.append(chunk)
+            digest = hasher.hexdigest()
+            with self._lock:
+                self.loaded_at = time.monotonic()
+                if self._generation != generation:
+                    self.stats["raced"] += 1
+                    continue
+                self.stats["refreshes"] += 1
+                if digest == self.digest:
+                    self.stats["unchanged"] += 1
+                    return False
+                graph = self.transport.codec.loads(b"".join(chunks))
+                if isinstance(graph, str):  # tool text passed through as a JSON string
+                    graph = json.loads(graph)
+                self.replace(graph, digest)
+                return True
+        return False
+
+    def replace(self, graph: Dict[str, Any], digest: Optional[str] = None) -> None:
+        """Rebuild the mirror from a read_graph result"""
+        with self._lock:
+            self.entities.clear()
+            self.relations.clear()
+            self.by_type.clear()
+            self.by_relation_type.clear()
+            self.outgoing.clear()
+            self.incoming.clear()
+            for entity in graph.get("entities", []):
+                self._add_entity(entity)
+            for relation in graph.get("relations", []):
+                self._add_relation(relation)
+            self.digest = digest
+            self.stats["loads"] += 1
+            self._touched.clear()
+            for listener in self.listeners:
+                listener.sync(self.entities.values())
+
+    def add_listener(self, listener: Any) -> None:
+        """Keep ``listener`` in step with the entities
+
+        ``listener.sync(entities)`` is called with every entity now and after
+        each reload, and ``listener.update(name, entity)`` after each write
+        that creates, changes or (with ``entity`` None) deletes an entity.
+        """
+        with self._lock:
+            self.listeners.append(listener)
+            listener.sync(self.entities.values())
+
+    def refresh_if_due(self) -> None:
+        """Refresh if ``refresh_interval`` has passed since the last read
+
+        Only one caller refreshes at a time; the others carry on with the
+        current indexes instead of waiting for the download.
+        """
+        if self.refresh_interval is None:
+            return
+        if self.loaded_at is not None and time.monotonic() - self.loaded_at < self.refresh_interval:
+            return
+        if not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            self.refresh()
+        finally:
+            self._refreshing.release()
+
+    # ===== INDEX MAINTENANCE =====
+
+    def _add_entity(self, entity: Dict[str, Any]) -> None:
+        name = entity["name"]
+        self.entities[name] = entity
+        self._touched.add(name)
+        self.by_type.setdefault(entity["entityType"], set()).add(name)
+
+    def _remove_entity(self, name: str) -> None:
+        entity = self.entities.pop(name, None)
+        if entity is None:
+            return
+        self._touched.add(name)
+        names = self.by_type.get(entity["entityType"])
+        names.discard(name)
+        if not names:
+            del self.by_type[entity["entityType"]]
+        for key in list(self.outgoing.get(name, ())) + list(self.incoming.get(name, ())):
+            self._remove_relation(key)
+
+    def _add_relation(self, relation: Dict[str, Any]) -> None:
+        key = relation_key(relation)
+        if key in self.relations:
+            return
+        self.relations[key] = relation
+        self.by_relation_type.setdefault(key[2], set()).add(key)
+        self.outgoing.setdefault(key[0], set()).add(key)
+        self.incoming.setdefault(key[1], set()).add(key)
+
+    def _remove_relation(self, key: RelationKey) -> None:
+        if self.relations.pop(key, None) is None:
+            return
+        for index, field in ((self.by_relation_type, key[2]), (self.outgoing, key[0]), (self.incoming, key[1])):
+            keys = index[field]
+            keys.discard(key)
+            if not keys:
+                del index[field]
+
+    def observe(self, endpoint: str, data: Optional[Dict], result: Any) -> None:
+        """Transport hook: apply a successful memory write to the mirror"""
+        apply = self._writes.get(endpoint)
+        if apply is None or data is None:
+            return
+        with self._lock:
+            self._touched.clear()
+            apply(self, data)
+            self._generation += 1
+            self.stats["applied"] += 1
+            for listener in self.listeners:
+                for name in self._touched:
+                    listener.update(name, self.entities.get(name))
+
+    def _create_entities(self, data: Dict) -> None:
+        for entity in data["entities"]:
+            if entity["name"] not in self.entities:
+                self._add_entity({"type": "entity", "name": entity["name"], "entityType": entity["entityType"],
+                                  "observations": list(entity.get("observations", []))})
+
+    def _create_relations(self, data: Dict) -> None:
+        for relation in data["relations"]:
+            self._add_relation({"type": "relation", "from": relation["from"], "to": relation["to"],
+                                "relationType": relation["relationType"]})
+
+    def _add_observations(self, data: Dict) -> None:
+        for item in data["observations"]:
+            entity = self.entities.get(item["entityName"])
+            if entity is not None:
+                self._touched.add(item["entityName"])
+                entity["observations"].extend([c for c in item["contents"] if c not in entity["observations"]])
+
+    def _delete_entities(self, data: Dict) -> None:
+        for name in data["entityNames"]:
+            self._remove_entity(name)
+
+    def _delete_observations(self, data: Dict) -> None:
+        for item in data["deletions"]:
+            entity = self.entities.get(item["entityName"])
+            if entity is not None:
+                self._touched.add(item["entityName"])
+                entity["observations"] = [o for o in entity["observations"] if o not in item["observations"]]
+
+    def _delete_relations(self, data: Dict) -> None:
+        for relation in data["relations"]:
+            self._remove_relation(relation_key(relation))
+
+    _writes = {
+        "/memory/create_entities": _create_entities,
+        "/memory/create_relations": _create_relations,
+        "/memory/add_observations": _add_observations,
+        "/memory/delete_entities": _delete_entities,
+        "/memory/delete_observations": _delete_observations,
+        "/memory/delete_relations": _delete_relations,
+    }
+
+    # ===== LOOKUPS =====
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def __contains__(self, name: str) -> bool:
+        self.refresh_if_due()
+        return name in self.entities
+
+    def entity(self, name: str) -> Optional[Dict[str, Any]]:
+        self.refresh_if_due()
+        return self.entities.get(name)
+
+    def entities_of_type(self, entity_type: str) -> List[Dict[str, Any]]:
+        self.refresh_if_due()
+        with self._lock:
+            return [self.entities[name] for name in self.by_type.get(entity_type, ())]
+
+    def relations_of_type(self, relation_type: str) -> List[Dict[str, Any]]:
+        self.refresh_if_due()
+        with self._lock:
+            return [self.relations[key] for key in self.by_relation_type.get(relation_type, ())]
+
+    def relations_of(self, name: str, direction: str = "both") -> List[Dict[str, Any]]:
+        """Relations from (``out``), to (``in``) or touching (``both``) an entity"""
+        self.refresh_if_due()
+        with self._lock:
+            keys = set()
+            if direction in ("out", "both"):
+                keys.update(self.outgoing.get(name, ()))
+            if direction in ("in", "both"):
+                keys.update(self.incoming.get(name, ()))
+            return [self.relations[key] for key in keys]
+
+    def neighbors(self, name: str, relation_type: Optional[str] = None, direction: str = "both") -> Set[str]:
+        """Names of the entities related to ``name``, optionally by one relation type"""
+        self.refresh_if_due()
+        with self._lock:
+            found = set()
+            if direction in ("out", "both"):
+                found.update(to for _, to, kind in self.outgoing.get(name, ())
+                             if relation_type is None or kind == relation_type)
+            if direction in ("in", "both"):
+                found.update(source for source, _, kind in self.incoming.get(name, ())
+                             if relation_type is None or kind == relation_type)
+            return found
+
+    def _subgraph(self, entities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        names = {entity["name"] for entity in entities}
+        relations = []
+        for name in names:
+            relations.extend(self.relations[key] for key in self.outgoing.get(name, ()) if key[1] in names)
+        return {"entities": entities, "relations": relations}
+
+    def open_nodes(self, names: List[str]) -> Dict[str, Any]:
+        """Local ``memory_open_nodes``: the named entities and the relations among them"""
+        self.refresh_if_due()
+        with self._lock:
+            return self._subgraph([self.entities[name] for name in names if name in self.entities])
+
+    def search_nodes(self, query: str) -> Dict[str, Any]:
+        """Local ``memory_search_nodes``: case-insensitive substring match on name, type and observations"""
+        self.refresh_if_due()
+        query = query.lower()
+        with self._lock:
+            return self._subgraph([
+                entity for entity in self.entities.values()
+                if query in entity["name"].lower() or query in entity["entityType"].lower()
+                or any(query in observation.lower() for observation in entity["observations"])
+            ])
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, entities=len(self.entities), relations=len(self.relations),
+                        entity_types=len(self.by_type), relation_types=len(self.by_relation_type),
+                        digest=self.digest)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Hedged requests for read-only MCP tools
+
+A hedged call sends the request, waits for the endpoint's observed p95
+latency and, if no answer has arrived yet, sends a duplicate; whichever
+response arrives first wins.  A budget caps hedges at a fraction of traffic.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Callable, Deque, Iterable, Optional
+
+# Idempotent endpoints that may be hedged by default
+HEDGEABLE_ENDPOINTS = frozenset({
+    "/filesystem/read_text_file",
+    "/filesystem/read_multiple_files",
+    "/filesystem/get_file_info",
+    "/filesystem/list_directory",
+    "/filesystem/list_directory_with_sizes",
+    "/filesystem/directory_tree",
+    "/filesystem/search_files",
+    "/filesystem/list_allowed_directories",
+    "/memory/read_graph",
+    "/memory/search_nodes",
+    "/memory/open_nodes",
+    "/time/get_current_time",
+    "/time/convert_time",
+})
+
+
+class HedgePolicy:
+    """Adaptive hedging with a traffic budget
+
+    The hedge delay for an endpoint is the ``quantile`` of its last
+    ``window`` successful latencies (never below ``min_delay``); endpoints
+    with fewer than ``min_samples`` observations are not hedged.  At most
+    ``budget`` (a fraction, e.g. 0.05) of requests may trigger a hedge.
+
+    Once an endpoint has a delay, both attempts run on worker threads
+    (up to ``max_workers`` at once) and the caller returns the first
+    successful answer; ``hedge_wins`` counts the calls answered by the
+    hedge.
+    """
+
+    def __init__(self, budget: float = 0.05, quantile: float = 0.95, min_delay: float = 0.005,
+                 min_samples: int = 20, window: int = 256, max_workers: int = 256,
+                 endpoints: Optional[Iterable[str]] = None):
+        if not 0 <= budget <= 1:
+            raise ValueError("budget must be between 0 and 1")
+        self.budget = budget
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.endpoints = frozenset(HEDGEABLE_ENDPOINTS if endpoints is None else endpoints)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-hedge")
+
+    def applies_to(self, endpoint: str) -> bool:
+        return endpoint in self.endpoints
+
+    def delay_for(self, endpoint: str) -> Optional[float]:
+        """Current hedge delay for an endpoint, or None if not enough data"""
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, math.ceil(self.quantile * len(ordered)) - 1)
+        return max(self.min_delay, ordered[index])
+
+    def record(self, endpoint: str, latency: float) -> None:
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None:
+                samples = self._latencies[endpoint] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.budget * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def _timed(self, endpoint: str, fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = fn()
+        self.record(endpoint, time.perf_counter() - start)
+        return result
+
+    def call(self, endpoint: str, fn: Callable[[], Any]) -> Any:
+        """Run fn, hedging it with a second copy if it is slow"""
+        with self._lock:
+            self.requests += 1
+        delay = self.delay_for(endpoint)
+        if delay is None:
+            return self._timed(endpoint, fn)
+
+        primary = self._executor.submit(self._timed, endpoint, fn)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._take_budget():
+            return primary.result()
+
+        hedge = self._executor.submit(self._timed, endpoint, fn)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+        return primary.result()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Hedging counters and the current delay per endpoint"""
+        with self._lock:
+            endpoints = list(self._latencies)
+            stats = {"requests": self.requests, "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+        stats["hedge_ratio"] = round(stats["hedges"] / stats["requests"], 4) if stats["requests"] else 0.0
+        stats["delays"] = {endpoint: self.delay_for(endpoint) for endpoint in sorted(endpoints)}
+        return stats
+
+    def close(self) -> None:
+        """Stop the hedge workers"""
+        self._executor.shutdown(wait=False)
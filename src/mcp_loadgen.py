@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+mcp-loadgen: load generator for the MCP OpenAPI Proxy
+Replays a weighted mix of tool calls across the proxy's servers in open-loop
+(fixed arrival rate) or closed-loop (fixed concurrency) mode, following a
+ramp schedule, with live percentiles and a per-server final report
+
+Usage: python3 src/mcp_loadgen.py [--url URL] [--mode open|closed] [--stages 30s:50,1m:200]
+                                  [--mix mix.json] [--servers time,memory] [--output report.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, TextIO, Tuple
+try:
+    from mcp_metrics import Histogram
+    from mcp_openapi_client import OpenAPIClient, tool_prefix
+    from mcp_transport import PoolConfig
+except ImportError:
+    from .mcp_metrics import Histogram
+    from .mcp_openapi_client import OpenAPIClient, tool_prefix
+    from .mcp_transport import PoolConfig
+
+# Log-spaced latency buckets, 25% apart from 0.5 ms to about two minutes, so
+# percentiles stay within a bucket's width however long the run is
+LATENCY_BUCKETS = tuple(round(0.0005 * 1.25 ** i, 6) for i in range(56))
+
+
+@dataclass
+class MixEntry:
+    """One tool call in the mix, chosen with probability proportional to weight
+
+    String arguments may contain ``{seq}`` (a per-call sequence number) and
+    ``{fs_root}`` (the filesystem server's first allowed directory).
+    """
+    tool: str
+    args: Dict[str, Any] = field(default_factory=dict)
+    weight: float = 1.0
+
+
+# Read-only by default, so pointing the generator at a production proxy does
+# not write to its knowledge graph or filesystem
+DEFAULT_MIX = [
+    MixEntry("time_get_current_time", {"timezone": "Europe/London"}, 20),
+    MixEntry("time_convert_time", {"source_timezone": "UTC", "time": "12:00", "target_timezone": "Asia/Tokyo"}, 10),
+    MixEntry("memory_search_nodes", {"query": "project"}, 15),
+    MixEntry("memory_open_nodes", {"names": ["MCP Client"]}, 5),
+    MixEntry("memory_read_graph", {}, 2),
+    MixEntry("fs_list_allowed_directories", {}, 10),
+    MixEntry("fs_list_directory", {"path": "{fs_root}"}, 10),
+    MixEntry("fs_get_file_info", {"path": "{fs_root}"}, 5),
+    MixEntry("fetch_fetch", {"url": "https://example.com", "max_length": 2000}, 3),
+    MixEntry("openscad_render_openscad", {"code": "cube([10, 10, 10]);", "width": 256, "height": 256}, 2),
+]
+
+
+def load_mix(path: str) -> List[MixEntry]:
+    """Read a mix from JSON: [{"tool": ..., "args": {...}, "weight": N}, ...]"""
+    with open(path) as f:
+        return [MixEntry(item["tool"], dict(item.get("args") or {}), float(item.get("weight", 1)))
+                for item in json.load(f)]
+
+
+# ===== SCHEDULES =====
+
+def parse_duration(text: str) -> float:
+    """'90', '90s', '1.5m' or '1h' in seconds"""
+    match = re.fullmatch(r"\s*([\d.]+)\s*(ms|s|m|h)?\s*", text)
+    if not match:
+        raise ValueError(f"Invalid duration: {text!r}")
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[match.group(2) or "s"]
+    return float(match.group(1)) * scale
+
+
+def parse_stages(text: str) -> List[Tuple[float, float]]:
+    """Parse 'duration:level,...' into (duration seconds, level) stages"""
+    stages = []
+    for item in text.split(","):
+        duration, _, level = item.partition(":")
+        if not level:
+            raise ValueError(f"Invalid stage {item!r}: expected duration:level, e.g. 30s:100")
+        stages.append((parse_duration(duration), float(level)))
+    if not stages:
+        raise ValueError("At least one stage is required")
+    return stages
+
+
+def level_at(stages: List[Tuple[float, float]], elapsed: float) -> Optional[float]:
+    """Load level at a point in the run, or None once the schedule is over
+
+    Each stage moves linearly from the previous stage's level to its own;
+    the first stage holds its level throughout.
+    """
+    previous = stages[0][1]
+    for duration, level in stages:
+        if elapsed < duration:
+            return previous + (level - previous) * (elapsed / duration)
+        elapsed -= duration
+        previous = level
+    return None
+
+
+def render_args(value: Any, substitutions: Dict[str, str]) -> Any:
+    """Replace {placeholders} in every string inside an argument value"""
+    if isinstance(value, str):
+        for name, replacement in substitutions.items():
+            value = value.replace("{" + name + "}", replacement)
+        return value
+    if isinstance(value, list):
+        return [render_args(v, substitutions) for v in value]
+    if isinstance(value, dict):
+        return {k: render_args(v, substitutions) for k, v in value.items()}
+    return value
+
+
+# ===== STATISTICS =====
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class _ServerStats:
+    def __init__(self):
+        self.total = Histogram(LATENCY_BUCKETS)
+        self.window = Histogram(LATENCY_BUCKETS)
+        self.errors = 0
+        self.window_errors = 0
+        self.max = 0.0
+        self.error_samples: Dict[str, int] = {}
+
+
+class LoadStats:
+    """Thread-safe latency recording per server, in total and per interval"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.servers: Dict[str, _ServerStats] = {}
+        self.timeline: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self._window_start = time.perf_counter()
+
+    def record(self, server: str, latency: float, error: Optional[str] = None) -> None:
+        with self.lock:
+            stats = self.servers.get(server)
+            if stats is None:
+                stats = self.servers[server] = _ServerStats()
+            stats.total.observe(latency)
+            stats.window.observe(latency)
+            stats.max = max(stats.max, latency)
+            if error is not None:
+                stats.errors += 1
+                stats.window_errors += 1
+                kind = error[:80]
+                if kind in stats.error_samples or len(stats.error_samples) < 10:
+                    stats.error_samples[kind] = stats.error_samples.get(kind, 0) + 1
+
+    def tick(self, elapsed: float, level: Optional[float]) -> Dict[str, Any]:
+        """Close the current interval, append it to the timeline and return it"""
+        with self.lock:
+            now = time.perf_counter()
+            span = max(now - self._window_start, 1e-9)
+            self._window_start = now
+            merged = Histogram(LATENCY_BUCKETS)
+            row = {"t": round(elapsed, 2), "level": round(level, 2) if level is not None else None, "servers": {}}
+            errors = 0
+            for server, stats in self.servers.items():
+                window = stats.window
+                row["servers"][server] = {"ops_per_sec": round(window.count / span, 1), "errors": stats.window_errors,
+                                          "p50_ms": _ms(window.quantile(0.5)), "p95_ms": _ms(window.quantile(0.95))}
+                merged.counts = [a + b for a, b in zip(merged.counts, window.counts)]
+                merged.count += window.count
+                errors += stats.window_errors
+                stats.window = Histogram(LATENCY_BUCKETS)
+                stats.window_errors = 0
+            row["total"] = {"ops_per_sec": round(merged.count / span, 1), "errors": errors,
+                            "p50_ms": _ms(merged.quantile(0.5)), "p95_ms": _ms(merged.quantile(0.95)),
+                            "p99_ms": _ms(merged.quantile(0.99))}
+            self.timeline.append(row)
+            return row
+
+    def saturation(self, server: str) -> Dict[str, Any]:
+        """Peak interval throughput, and the first level where p95 doubled
+
+        The "knee" compares each interval's p95 with the best p95 seen for
+        the server; past it, more load mostly buys more queueing.
+        """
+        rows = [(r["level"], r["servers"][server]) for r in self.timeline
+                if r["level"] is not None and server in r["servers"] and r["servers"][server]["ops_per_sec"] > 0]
+        if not rows:
+            return {"peak_ops_per_sec": 0.0, "peak_level": None, "knee_level": None}
+        peak_level, peak = max(rows, key=lambda r: r[1]["ops_per_sec"])
+        best_p95 = min(s["p95_ms"] for _, s in rows)
+        knee = next((level for level, s in rows if s["p95_ms"] > 2 * best_p95 and s["p95_ms"] > 1.0), None)
+        return {"peak_ops_per_sec": peak["ops_per_sec"], "peak_level": peak_level, "knee_level": knee}
+
+    def report(self, duration: float) -> Dict[str, Any]:
+        """Final per-server summary"""
+        with self.lock:
+            servers = {}
+            for server in sorted(self.servers):
+                stats = self.servers[server]
+                total = stats.total
+                servers[server] = {
+                    "calls": total.count,
+                    "errors": stats.errors,
+                    "ops_per_sec": round(total.count / duration, 1) if duration else 0.0,
+                    "mean_ms": _ms(total.sum / total.count) if total.count else 0.0,
+                    # Interpolation within a bucket can overshoot the slowest call
+                    "p50_ms": _ms(min(total.quantile(0.5), stats.max)),
+                    "p95_ms": _ms(min(total.quantile(0.95), stats.max)),
+                    "p99_ms": _ms(min(total.quantile(0.99), stats.max)),
+                    "max_ms": _ms(stats.max),
+                    "error_samples": dict(stats.error_samples),
+                }
+        for server in servers:
+            servers[server].update(self.saturation(server))
+        return {"duration": round(duration, 2), "dropped": self.dropped, "servers": servers,
+                "timeline": list(self.timeline)}
+
+
+# ===== GENERATOR =====
+
+class LoadGenerator:
+    """Drives a client with a weighted tool mix on a ramp schedule
+
+    In ``open`` mode the level is an arrival rate in calls/s: calls start on
+    schedule whether or not earlier ones have finished, and latency is
+    measured from the scheduled start, so queueing inside the generator
+    counts against the server rather than hiding it.  At most
+    ``max_outstanding`` calls may be queued or running; arrivals beyond that
+    are counted as dropped.  In ``closed`` mode the level is the number of
+    concurrent callers, each issuing its next call as soon as the last one
+    returns.
+    """
+
+    def __init__(self, client: OpenAPIClient, mix: List[MixEntry], stages: List[Tuple[float, float]],
+                 mode: str = "closed", max_workers: int = 256, max_outstanding: int = 10000,
+                 poisson: bool = False, seed: Optional[int] = None, interval: float = 1.0,
+                 out: Optional[TextIO] = sys.stdout):
+        if mode not in ("open", "closed"):
+            raise ValueError(f"Unknown mode: {mode}")
+        self.client = client
+        self.mix = [entry for entry in mix if entry.weight > 0]
+        self.stages = stages
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_outstanding = max_outstanding
+        self.poisson = poisson
+        self.interval = interval
+        self.out = out
+        self.stats = LoadStats()
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._outstanding = 0
+        self._stop = threading.Event()
+        self._cumulative: List[float] = []
+        self._servers: List[str] = []
+        self.substitutions: Dict[str, str] = {}
+
+    def prepare(self) -> None:
+        """Resolve every tool in the mix and check its arguments up front"""
+        if not self.mix:
+            raise ValueError("The tool mix is empty")
+        if any("{fs_root}" in json.dumps(entry.args) for entry in self.mix):
+            listing = self.client.call("fs_list_allowed_directories")
+            lines = listing.splitlines()[1:] if isinstance(listing, str) else []
+            if not lines:
+                raise RuntimeError(f"Cannot find an allowed directory for {{fs_root}}: {listing}")
+            self.substitutions["fs_root"] = lines[0].strip()
+
+        total = 0.0
+        for entry in self.mix:
+            spec = self.client.tool(entry.tool)
+            spec.check(render_args(entry.args, dict(self.substitutions, seq="0")))
+            total += entry.weight
+            self._cumulative.append(total)
+            self._servers.append(spec.server)
+
+    def _pick(self) -> Tuple[int, int]:
+        with self._lock:
+            self._seq += 1
+            return bisect_right(self._cumulative, self.random.random() * self._cumulative[-1]), self._seq
+
+    def fire(self, scheduled: float) -> None:
+        """Make one call from the mix and record it against its server"""
+        index, seq = self._pick()
+        entry = self.mix[index]
+        error = None
+        try:
+            result = self.client.call(entry.tool, render_args(entry.args, dict(self.substitutions, seq=str(seq))))
+            if isinstance(result, dict) and "error" in result:
+                error = str(result["error"])
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.stats.record(self._servers[index], time.perf_counter() - scheduled, error)
+
+    def _fire_open(self, scheduled: float) -> None:
+        try:
+            self.fire(scheduled)
+        finally:
+            with self._lock:
+                self._outstanding -= 1
+
+    def _run_open(self, start: float) -> None:
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mcp-loadgen") as pool:
+            offset = 0.0
+            while not self._stop.is_set():
+                level = level_at(self.stages, offset)
+                if level is None:
+                    break
+                if level <= 0:
+                    offset += 0.01
+                    continue
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    self._stop.wait(delay)
+                with self._lock:
+                    accept = self._outstanding < self.max_outstanding
+                    if accept:
+                        self._outstanding += 1
+                if accept:
+                    pool.submit(self._fire_open, start + offset)
+                else:
+                    with self.stats.lock:
+                        self.stats.dropped += 1
+                offset += self.random.expovariate(level) if self.poisson else 1.0 / level
+
+    def _run_closed(self, start: float) -> None:
+        def caller(slot: int) -> None:
+            while not self._stop.is_set():
+                level = level_at(self.stages, time.perf_counter() - start)
+                if level is None:
+                    return
+                if slot >= round(level):
+                    self._stop.wait(0.01)
+                    continue
+                self.fire(time.perf_counter())
+
+        callers = [threading.Thread(target=caller, args=(slot,), name=f"mcp-loadgen-{slot}", daemon=True)
+                   for slot in range(int(max(level for _, level in self.stages)))]
+        for thread in callers:
+            thread.start()
+        for thread in callers:
+            thread.join()
+
+    def _live(self, start: float, done: threading.Event) -> None:
+        while not done.wait(self.interval):
+            self._print_tick(time.perf_counter() - start)
+
+    def _print_tick(self, elapsed: float) -> None:
+        # Label the interval with the level at its midpoint
+        level = level_at(self.stages, max(0.0, elapsed - self.interval / 2))
+        row = self.stats.tick(elapsed, level)
+        if self.out is not None:
+            total = row["total"]
+            unit = "calls/s" if self.mode == "open" else "callers"
+            level_text = f"{level:.0f} {unit}" if level is not None else "draining"
+            print(f"⏱️  {elapsed:6.1f}s  {level_text:>14}  {total['ops_per_sec']:8.1f} ops/s  "
+                  f"p50 {total['p50_ms']:7.2f}  p95 {total['p95_ms']:7.2f}  p99 {total['p99_ms']:7.2f} ms  "
+                  f"errors {total['errors']}", file=self.out, flush=True)
+
+    def run(self) -> Dict[str, Any]:
+        """Run the whole schedule and return the report"""
+        if not self._cumulative:
+            self.prepare()
+        start = time.perf_counter()
+        self.stats._window_start = start
+        done = threading.Event()
+        ticker = threading.Thread(target=self._live, args=(start, done), name="mcp-loadgen-live", daemon=True)
+        ticker.start()
+        try:
+            if self.mode == "open":
+                self._run_open(start)
+            else:
+                self._run_closed(start)
+        except KeyboardInterrupt:
+            self._stop.set()
+        finally:
+            done.set()
+            ticker.join()
+        duration = time.perf_counter() - start
+        # Calls finishing after the last full interval count in the totals
+        # but are too few to stand for a level of their own
+        self.stats.tick(duration, None)
+        report = self.stats.report(duration)
+        report.update(mode=self.mode, stages=[list(stage) for stage in self.stages])
+        return report
+
+
+def print_report(report: Dict[str, Any], out: TextIO = sys.stdout) -> None:
+    unit = "calls/s" if report["mode"] == "open" else "callers"
+    print(f"\n📊 Per-server results ({report['mode']} loop, {report['duration']}s"
+          f"{', ' + str(report['dropped']) + ' dropped' if report['dropped'] else ''})", file=out)
+    print(f"{'server':<12}{'calls':>8}{'errors':>8}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'max ms':>9}{'peak ops/s':>12}  {'at level':<10}{'p95 knee':<10}", file=out)
+    for server, s in report["servers"].items():
+        peak_at = f"{s['peak_level']:g}" if s["peak_level"] is not None else "-"
+        knee = f"{s['knee_level']:g}" if s["knee_level"] is not None else "-"
+        print(f"{server:<12}{s['calls']:>8}{s['errors']:>8}{s['ops_per_sec']:>9}{s['p50_ms']:>9}{s['p95_ms']:>9}"
+              f"{s['p99_ms']:>9}{s['max_ms']:>9}{s['peak_ops_per_sec']:>12}  {peak_at:<10}{knee:<10}", file=out)
+    print(f"(levels in {unit}; the knee is the first level where a server's p95 doubled)", file=out)
+    for server, s in report["servers"].items():
+        for message, count in s["error_samples"].items():
+            print(f"⚠️  {server}: {count} x {message}", file=out)
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog="mcp-loadgen", description="Load generator for the MCP OpenAPI Proxy")
+    parser.add_argument("--url", default=os.getenv("MCP_BASE_URL", "http://192.168.0.7:8000"), help="proxy base URL")
+    parser.add_argument("--token", help="bearer token (default: $MCP_API_TOKEN)")
+    parser.add_argument("--mode", choices=["open", "closed"], default="closed",
+                        help="open: stage levels are calls/s; closed: stage levels are concurrent callers")
+    parser.add_argument("--stages", default="30s:10",
+                        help="ramp schedule duration:level,...; each stage ramps linearly from the previous level")
+    parser.add_argument("--mix", help="JSON file with [{\"tool\", \"args\", \"weight\"}, ...]")
+    parser.add_argument("--servers", help="only use mix entries for these servers, e.g. time,memory")
+    parser.add_argument("--poisson", action="store_true", help="open loop: exponential inter-arrival times")
+    parser.add_argument("--max-workers", type=int, default=256, help="open loop: threads making calls")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between live lines")
+    parser.add_argument("--seed", type=int, help="seed for the mix and arrival times")
+    parser.add_argument("--output", help="write the report, with its timeline, as JSON")
+    args = parser.parse_args()
+
+    stages = parse_stages(args.stages)
+    peak = int(max(level for _, level in stages))
+    workers = args.max_workers if args.mode == "open" else peak
+    client = OpenAPIClient(args.url, token=args.token,
+                           pool=PoolConfig(connections_per_host=max(workers, 10), block=True))
+    mix = load_mix(args.mix) if args.mix else list(DEFAULT_MIX)
+    available = client.servers()
+    wanted = set(args.servers.split(",")) if args.servers else set(available)
+    prefixes = tuple(tool_prefix(server) + "_" for server in wanted & set(available))
+    if args.servers or not args.mix:
+        # A custom mix is used as given; the default one skips absent servers
+        mix = [entry for entry in mix if entry.tool.startswith(prefixes)]
+
+    generator = LoadGenerator(client, mix, stages, mode=args.mode, max_workers=args.max_workers,
+                              poisson=args.poisson, seed=args.seed, interval=args.interval)
+    try:
+        generator.prepare()
+    except Exception as e:
+        print(f"❌ Cannot prepare the tool mix: {e}")
+        sys.exit(2)
+    print(f"🚀 {args.mode}-loop load on {args.url}: {len(generator.mix)} tools, "
+          f"{sum(d for d, _ in stages):g}s, stages {args.stages}")
+    report = generator.run()
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Offline fast path for the time server's tools
+Answers time_get_current_time and time_convert_time in-process with
+zoneinfo, producing the same payloads as mcp-server-time behind mcpo
+"""
+
+import json
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+CURRENT_TIME = "/time/get_current_time"
+CONVERT_TIME = "/time/convert_time"
+TIME_ENDPOINTS = (CURRENT_TIME, CONVERT_TIME)
+
+
+def payload_bytes(payload: Any) -> bytes:
+    """Encode a tool result the way mcpo (FastAPI) writes it to the wire"""
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def time_difference(source: datetime, target: datetime) -> str:
+    """Offset between two aware datetimes, formatted like mcp-server-time ("+5.5h", "-8.0h")"""
+    hours = ((target.utcoffset() or timedelta()) - (source.utcoffset() or timedelta())).total_seconds() / 3600
+    if hours.is_integer():
+        return f"{hours:+.1f}h"
+    return f"{hours:+.2f}".rstrip("0").rstrip(".") + "h"
+
+
+class LocalTimeEngine:
+    """Computes the time tools' results locally instead of calling the server
+
+    ``answer`` returns the payload the server would send, or None when the
+    call has to go to the server: an unknown endpoint, a timezone the local
+    tz database cannot resolve, a malformed time (so the server produces
+    its own error), or an engine disabled after drift.
+
+    A ``verify_rate`` fraction of answered calls is also sent to the server
+    by the transport and compared with ``verify``.  Current times may differ
+    by up to ``tolerance`` seconds; everything else must match byte for
+    byte.  With ``disable_on_drift`` the first mismatch switches the engine
+    off, so every later call goes to the server.  Set ``day_of_week`` for
+    mcp-server-time releases that include that field.
+    """
+
+    def __init__(self, verify_rate: float = 0.01, tolerance: float = 2.0, day_of_week: bool = False,
+                 disable_on_drift: bool = True, seed: Optional[int] = None):
+        self.verify_rate = verify_rate
+        self.tolerance = tolerance
+        self.day_of_week = day_of_week
+        self.disable_on_drift = disable_on_drift
+        self.enabled = True
+        self.answered = 0
+        self.fallbacks = 0
+        self.verified = 0
+        self.drift = 0
+        self.last_drift: Optional[Dict[str, Any]] = None
+        self._unknown_zones = set()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def answers(self, endpoint: str) -> bool:
+        return endpoint in TIME_ENDPOINTS
+
+    def zone(self, name: Any) -> Optional[ZoneInfo]:
+        """The named zone, or None if the local tz database cannot resolve it"""
+        if not isinstance(name, str) or name in self._unknown_zones:
+            return None
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            self._unknown_zones.add(name)
+            return None
+
+    def answer(self, endpoint: str, data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """The server's payload for this call, or None to send it to the server"""
+        result = self._compute(endpoint, data) if self.enabled else None
+        with self._lock:
+            if result is None:
+                self.fallbacks += 1
+            else:
+                self.answered += 1
+        return result
+
+    def _compute(self, endpoint: str, data: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        if data is None:
+            return None
+        if endpoint == CURRENT_TIME:
+            return self.current_time(data.get("timezone"))
+        if endpoint == CONVERT_TIME:
+            return self.convert_time(data.get("source_timezone"), data.get("time"), data.get("target_timezone"))
+        return None
+
+    def current_time(self, timezone: Any) -> Optional[Dict[str, Any]]:
+        zone = self.zone(timezone)
+        if zone is None:
+            return None
+        return self._time_result(timezone, datetime.now(zone))
+
+    def convert_time(self, source_timezone: Any, time: Any, target_timezone: Any) -> Optional[Dict[str, Any]]:
+        source_zone = self.zone(source_timezone)
+        target_zone = self.zone(target_timezone)
+        if source_zone is None or target_zone is None or not isinstance(time, str):
+            return None
+        try:
+            parsed = datetime.strptime(time, "%H:%M").time()
+        except ValueError:
+            return None
+        # Like the server: the given wall time on today's date in the source zone
+        now = datetime.now(source_zone)
+        source = datetime(now.year, now.month, now.day, parsed.hour, parsed.minute, tzinfo=source_zone)
+        target = source.astimezone(target_zone)
+        return {"source": self._time_result(source_timezone, source),
+                "target": self._time_result(target_timezone, target),
+                "time_difference": time_difference(source, target)}
+
+    def _time_result(self, name: str, moment: datetime) -> Dict[str, Any]:
+        result = {"timezone": name, "datetime": moment.isoformat(timespec="seconds")}
+        if self.day_of_week:
+            result["day_of_week"] = moment.strftime("%A")
+        result["is_dst"] = bool(moment.dst())
+        return result
+
+    def should_verify(self) -> bool:
+        """Pick the calls to check against the server"""
+        if self.verify_rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.verify_rate
+
+    def verify(self, endpoint: str, data: Dict, local: Any, remote: Any) -> bool:
+        """Compare a local answer with the server's and record any drift"""
+        matched = self._matches(endpoint, local, remote)
+        if not matched and endpoint == CONVERT_TIME:
+            # The source zone's date may have rolled over during the round trip
+            again = self._compute(endpoint, data)
+            matched = again is not None and payload_bytes(again) == payload_bytes(remote)
+        with self._lock:
+            self.verified += 1
+            if not matched:
+                self.drift += 1
+                self.last_drift = {"endpoint": endpoint, "arguments": data, "local": local, "remote": remote}
+                if self.disable_on_drift:
+                    self.enabled = False
+        return matched
+
+    def _matches(self, endpoint: str, local: Any, remote: Any) -> bool:
+        if payload_bytes(local) == payload_bytes(remote):
+            return True
+        if endpoint != CURRENT_TIME or not isinstance(remote, dict) or list(local) != list(remote):
+            return False
+        try:
+            skew = abs((datetime.fromisoformat(remote["datetime"]) -
+                        datetime.fromisoformat(local["datetime"])).total_seconds())
+        except (TypeError, ValueError):
+            return False
+        same_rest = payload_bytes(dict(local, datetime=None)) == payload_bytes(dict(remote, datetime=None))
+        same_offset = local["datetime"][19:] == remote["datetime"][19:]
+        return skew <= self.tolerance and same_rest and same_offset
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "answered": self.answered,
+                "fallbacks": self.fallbacks,
+                "verified": self.verified,
+                "drift": self.drift,
+                "last_drift": self.last_drift,
+            }
+
+    def to_prometheus(self, prefix: str = "mcp_client") -> str:
+        """Local answers, fallbacks and drift checks as Prometheus counters"""
+        snapshot = self.snapshot()
+        metrics = [
+            ("local_time_enabled", "gauge", "enabled", "1 while the local time engine answers calls."),
+            ("local_time_answered_total", "counter", "answered", "Time calls answered locally."),
+            ("local_time_fallbacks_total", "counter", "fallbacks", "Time calls sent to the server."),
+            ("local_time_verified_total", "counter", "verified", "Local answers checked against the server."),
+            ("local_time_drift_total", "counter", "drift", "Local answers that differed from the server."),
+        ]
+        lines = []
+        for name, kind, key, help_text in metrics:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"{prefix}_{name} {int(snapshot[key])}")
+        return "\n".join(lines) + "\n"
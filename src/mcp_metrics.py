@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Client-side instrumentation for the MCP transport
+
+Records per-endpoint latency histograms split into connect, time to first
+byte, download and JSON decode phases, request/response byte counts and
+error/retry counters.  Export as a Prometheus textfile or a JSON snapshot.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Any, List, Tuple
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+PHASES = ("connect", "ttfb", "download", "decode", "total")
+
+_connect_timer = threading.local()
+
+
+def reset_connect_time() -> None:
+    """Start measuring TCP/TLS connect time for the current thread"""
+    _connect_timer.elapsed = 0.0
+
+
+def connect_time() -> float:
+    """Seconds spent opening connections since the last reset, this thread"""
+    return getattr(_connect_timer, 'elapsed', 0.0)
+
+
+class _TimedConnectMixin:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timer.elapsed = connect_time() + time.perf_counter() - start
+
+
+class TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def install_connect_timing(session) -> None:
+    """Make the session's adapters open connections that report connect time"""
+    for adapter in set(session.adapters.values()):
+        poolmanager = getattr(adapter, 'poolmanager', None)
+        if poolmanager is not None:
+            poolmanager.pool_classes_by_scheme = {
+                "http": TimedHTTPConnectionPool,
+                "https": TimedHTTPSConnectionPool,
+            }
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, upper in enumerate(self.buckets):
+            if seen + self.counts[i] >= rank:
+                fraction = (rank - seen) / self.counts[i] if self.counts[i] else 0.0
+                return lower + (upper - lower) * fraction
+            seen += self.counts[i]
+            lower = upper
+        return self.buckets[-1]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.50), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+        }
+
+
+class _EndpointStats:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.phases = {phase: Histogram(buckets) for phase in PHASES}
+        self.statuses: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class ClientMetrics:
+    """Thread-safe per-endpoint metrics shared by a transport"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = "mcp_client"):
+        self.buckets = buckets
+        self.prefix = prefix
+        self._endpoints: Dict[str, _EndpointStats] = {}
+        self._collectors: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def add_collector(self, name: str, collector: Any) -> None:
+        """Export another component's state with these metrics
+
+        ``collector`` needs ``snapshot()`` (added to the JSON snapshot under
+        ``name``) and ``to_prometheus(prefix)`` (appended to the textfile).
+        """
+        with self._lock:
+            self._collectors[name] = collector
+
+    def _stats(self, endpoint: str) -> _EndpointStats:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats(self.buckets)
+        return stats
+
+    def record_request(self, endpoint: str, status: int, timings: Dict[str, float],
+                       request_bytes: int, response_bytes: int) -> None:
+        """Record one completed HTTP exchange"""
+        with self._lock:
+            stats = self._stats(endpoint)
+            for phase, seconds in timings.items():
+                stats.phases[phase].observe(seconds)
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+
+    def record_error(self, endpoint: str, kind: str) -> None:
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.errors[kind] = stats.errors.get(kind, 0) + 1
+
+    def record_retry(self, endpoint: str) -> None:
+        with self._lock:
+            self._stats(endpoint).retries += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable view of every endpoint's metrics"""
+        with self._lock:
+            collectors = dict(self._collectors)
+            snapshot = {
+                "timestamp": time.time(),
+                "endpoints": {
+                    endpoint: {
+                        "requests": sum(stats.statuses.values()),
+                        "statuses": dict(stats.statuses),
+                        "errors": dict(stats.errors),
+                        "retries": stats.retries,
+                        "request_bytes": stats.request_bytes,
+                        "response_bytes": stats.response_bytes,
+                        "latency": {phase: hist.summary() for phase, hist in stats.phases.items()},
+                    }
+                    for endpoint, stats in sorted(self._endpoints.items())
+                }
+            }
+        for name, collector in collectors.items():
+            snapshot[name] = collector.snapshot()
+        return snapshot
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        p = self.prefix
+        lines: List[str] = [
+            f"# HELP {p}_request_duration_seconds MCP request latency by phase.",
+            f"# TYPE {p}_request_duration_seconds histogram",
+        ]
+        counters: Dict[str, List[str]] = {
+            "requests_total": [], "errors_total": [], "retries_total": [],
+            "request_bytes_total": [], "response_bytes_total": [],
+        }
+        with self._lock:
+            collectors = list(self._collectors.values())
+            for endpoint, stats in sorted(self._endpoints.items()):
+                ep = _escape(endpoint)
+                for phase, hist in stats.phases.items():
+                    labels = f'endpoint="{ep}",phase="{phase}"'
+                    cumulative = 0
+                    for upper, count in zip(self.buckets, hist.counts):
+                        cumulative += count
+                        lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="{upper}"}} {cumulative}')
+                    lines.append(f'{p}_request_duration_seconds_bucket{{{labels},le="+Inf"}} {hist.count}')
+                    lines.append(f'{p}_request_duration_seconds_sum{{{labels}}} {hist.sum:.6f}')
+                    lines.append(f'{p}_request_duration_seconds_count{{{labels}}} {hist.count}')
+                for status, count in sorted(stats.statuses.items()):
+                    counters["requests_total"].append(f'{{endpoint="{ep}",status="{status}"}} {count}')
+                for kind, count in sorted(stats.errors.items()):
+                    counters["errors_total"].append(f'{{endpoint="{ep}",kind="{_escape(kind)}"}} {count}')
+                counters["retries_total"].append(f'{{endpoint="{ep}"}} {stats.retries}')
+                counters["request_bytes_total"].append(f'{{endpoint="{ep}"}} {stats.request_bytes}')
+                counters["response_bytes_total"].append(f'{{endpoint="{ep}"}} {stats.response_bytes}')
+
+        for name, samples in counters.items():
+            lines.append(f"# TYPE {p}_{name} counter")
+            lines.extend(f"{p}_{name}{sample}" for sample in samples)
+        return "\n".join(lines) + "\n" + "".join(collector.to_prometheus(p) for collector in collectors)
+
+    def write_textfile(self, path: str) -> None:
+        """Atomically write a textfile for the node_exporter textfile collector"""
+        self._write(path, self.to_prometheus())
+
+    def write_json(self, path: str) -> None:
+        """Atomically write the JSON snapshot"""
+        self._write(path, json.dumps(self.snapshot(), indent=2))
+
+    @staticmethod
+    def _write(path: str, text: str) -> None:
+        path = os.path.expanduser(path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
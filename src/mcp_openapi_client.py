@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+OpenAPI-driven MCP client
+Discovers servers and tools from the proxy's openapi.json documents and
+builds typed, locally validated call stubs for them on first use
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
+
+import requests
+try:
+    from mcp_transport import MCPTransport, PoolConfig
+    from mcp_batch import BatchResult, Call, run_batch, stream_batch
+    from mcp_cache import ResponseCache
+    from mcp_resilience import CircuitBreakers, RetryPolicy
+    from mcp_hedging import HedgePolicy
+    from mcp_metrics import ClientMetrics
+    from mcp_cassette import CassetteRecorder
+    from mcp_concurrency import AdaptiveConcurrency
+    from mcp_localtime import LocalTimeEngine
+    from mcp_schema import SchemaCompiler, Validator
+except ImportError:
+    from .mcp_transport import MCPTransport, PoolConfig
+    from .mcp_batch import BatchResult, Call, run_batch, stream_batch
+    from .mcp_cache import ResponseCache
+    from .mcp_resilience import CircuitBreakers, RetryPolicy
+    from .mcp_hedging import HedgePolicy
+    from .mcp_metrics import ClientMetrics
+    from .mcp_cassette import CassetteRecorder
+    from .mcp_concurrency import AdaptiveConcurrency
+    from .mcp_localtime import LocalTimeEngine
+    from .mcp_schema import SchemaCompiler, Validator
+
+DEFAULT_SPEC_CACHE = "~/.cache/mcp-client/openapi"
+
+# Tool name prefix per server, where it differs from the server name
+SERVER_ALIASES = {"filesystem": "fs"}
+
+# mcpo lists its servers in the root description as "- [name](/name/docs)"
+_SERVER_LINK = re.compile(r"\[[^\]]*\]\((/[^)\s]+?)/docs\)")
+
+
+class SpecCache:
+    """On-disk cache of OpenAPI documents
+
+    A cached document younger than ``max_age`` seconds is used without any
+    network traffic.  Older ones are revalidated: with ``If-None-Match``
+    when the server sent an ETag, otherwise by comparing the SHA-256 of the
+    fresh body with the cached one.  Either way the document's ``hash``
+    tells callers whether anything compiled from it is still current.
+    """
+
+    def __init__(self, path: str = DEFAULT_SPEC_CACHE, max_age: float = 3600.0):
+        self.path = os.path.expanduser(path)
+        self.max_age = max_age
+        self.stats = {"fresh": 0, "not_modified": 0, "unchanged": 0, "fetched": 0}
+
+    def _file(self, url: str) -> str:
+        return os.path.join(self.path, hashlib.sha256(url.encode()).hexdigest()[:32] + ".json")
+
+    def _load(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._file(url), "r") as f:
+                entry = json.load(f)
+            return entry if isinstance(entry, dict) and entry.get("url") == url else None
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, entry: Dict[str, Any]) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        path = self._file(entry["url"])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def get(self, session: requests.Session, url: str, timeout: Any = None) -> Tuple[Dict[str, Any], str]:
+        """Return ``(document, sha256)`` for url, fetching only when needed"""
+        entry = self._load(url)
+        if entry is not None and time.time() - entry["fetched"] < self.max_age:
+            self.stats["fresh"] += 1
+            return entry["spec"], entry["hash"]
+
+        headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else {}
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            self.stats["not_modified"] += 1
+        else:
+            response.raise_for_status()
+            digest = hashlib.sha256(response.content).hexdigest()
+            if entry is not None and entry["hash"] == digest:
+                self.stats["unchanged"] += 1
+            else:
+                self.stats["fetched"] += 1
+                entry = {"url": url, "spec": response.json(), "hash": digest}
+            entry["etag"] = response.headers.get("ETag")
+        entry["fetched"] = time.time()
+        self._save(entry)
+        return entry["spec"], entry["hash"]
+
+
+@dataclass
+class ToolSpec:
+    """One proxy tool, compiled from its server's OpenAPI document"""
+    name: str
+    server: str
+    endpoint: str
+    description: str
+    schema: Dict[str, Any]
+    validate: Validator
+    signature: inspect.Signature
+
+    def check(self, args: Dict[str, Any]) -> None:
+        """Validate arguments locally; raises SchemaValidationError"""
+        self.validate(args, self.name)
+
+
+def discover_servers(root_spec: Dict[str, Any]) -> Dict[str, str]:
+    """Map server name to mount path from the proxy's root openapi.json"""
+    servers = {}
+    description = root_spec.get("info", {}).get("description", "")
+    for mount in _SERVER_LINK.findall(description):
+        servers[mount.strip("/")] = mount
+    return servers
+
+
+def tool_prefix(server: str) -> str:
+    """Prefix of the tool names for a server, e.g. 'fs' for 'filesystem'"""
+    return SERVER_ALIASES.get(server, re.sub(r"\W", "_", server))
+
+
+def compile_tools(server: str, mount: str, spec: Dict[str, Any]) -> Dict[str, ToolSpec]:
+    """Build a ToolSpec for every POST operation in a server's document"""
+    compiler = SchemaCompiler(spec)
+    tools = {}
+    for path, operations in spec.get("paths", {}).items():
+        operation = operations.get("post")
+        if operation is None:
+            continue
+        content = operation.get("requestBody", {}).get("content", {})
+        schema = content.get("application/json", {}).get("schema", {"type": "object"})
+        resolved = compiler.resolve(schema)
+        if "additionalProperties" not in resolved:
+            # mcpo's models silently drop unknown fields, so a misspelt
+            # argument would be ignored; reject it locally instead
+            resolved = dict(resolved, additionalProperties=False)
+        name = f"{tool_prefix(server)}_{path.strip('/').replace('/', '_')}"
+        tools[name] = ToolSpec(
+            name=name,
+            server=server,
+            endpoint=f"{mount}{path}",
+            description=operation.get("description") or operation.get("summary") or "",
+            schema=resolved,
+            validate=compiler.compile(resolved),
+            signature=_signature(compiler, resolved),
+        )
+    return tools
+
+
+def _signature(compiler: SchemaCompiler, schema: Dict[str, Any]) -> inspect.Signature:
+    """Keyword signature for a tool: required arguments first, then optional ones"""
+    properties = schema.get("properties", {})
+    required = set(schema.get("required", []))
+    ordered = sorted(properties, key=lambda name: name not in required)
+    parameters = [
+        inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY,
+                          default=inspect.Parameter.empty if name in required else properties[name].get("default"),
+                          annotation=compiler.annotation(properties[name]))
+        for name in ordered if name.isidentifier()
+    ]
+    if any(not name.isidentifier() for name in properties) or schema.get("additionalProperties") is not False:
+        parameters.append(inspect.Parameter("extra", inspect.Parameter.VAR_KEYWORD))
+    return inspect.Signature(parameters, return_annotation=Any)
+
+
+class OpenAPIClient:
+    """MCP client whose tool methods are generated from the proxy's OpenAPI specs
+
+    Servers are discovered from ``/openapi.json`` and each server's tools
+    from ``/<server>/openapi.json`` the first time one of them is used.
+    Tool methods are named like the hand-written clients'
+    (``memory_read_graph``, ``fs_write_file``, ``fetch_fetch``...), take
+    keyword arguments named as in the schema, and validate them locally
+    before anything is sent.  Specs are cached on disk (see ``SpecCache``).
+
+    Servers can be given as ``{"memory": "/memory", ...}`` to skip the
+    root document.  Transport options are the same as ``MCPProxyClient``'s.
+    """
+
+    def __init__(self, base_url: str = "http://192.168.0.7:8000", token: Optional[str] = None,
+                 spec_cache: Optional[str] = None, max_age: float = 3600.0,
+                 servers: Optional[Dict[str, str]] = None, pool: Optional[PoolConfig] = None,
+                 cache: Optional[ResponseCache] = None, coalesce: bool = False,
+                 retry: Optional[RetryPolicy] = None, breakers: Optional[CircuitBreakers] = None,
+                 hedge: Optional[HedgePolicy] = None, metrics: Optional[ClientMetrics] = None,
+                 codec: Optional[str] = None, compress_min_bytes: Optional[int] = None,
+                 recorder: Optional[CassetteRecorder] = None,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 local_time: Optional[LocalTimeEngine] = None):
+        self.base_url = base_url.rstrip('/')
+        self.transport = MCPTransport(self.base_url, pool=pool, cache=cache, coalesce=coalesce,
+                                      retry=retry, breakers=breakers, hedge=hedge, metrics=metrics,
+                                      codec=codec, compress_min_bytes=compress_min_bytes,
+                                      recorder=recorder, concurrency=concurrency,
+                                      local_time=local_time)
+        self.session = self.transport.session
+        token = token or os.getenv("MCP_API_TOKEN")
+        if token:
+            self.session.headers.update({"Authorization": f"Bearer {token}"})
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "User-Agent": "MCP-OpenAPI-Client/1.0"
+        })
+        self.specs = SpecCache(spec_cache or os.getenv("MCP_SPEC_CACHE", DEFAULT_SPEC_CACHE), max_age)
+        self._servers = dict(servers) if servers is not None else None
+        self._discovered_servers = servers is None  # re-discovered on refresh
+        self._tools: Dict[str, Dict[str, ToolSpec]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def _spec(self, path: str) -> Tuple[Dict[str, Any], str]:
+        return self.specs.get(self.session, f"{self.base_url}{path}", self.transport.pool.timeout)
+
+    # ===== DISCOVERY =====
+
+    def servers(self) -> Dict[str, str]:
+        """Server name -> mount path, from the proxy's root document"""
+        with self._lock:
+            if self._servers is None:
+                self._servers = discover_servers(self._spec("/openapi.json")[0])
+            return dict(self._servers)
+
+    def server_tools(self, server: str) -> Dict[str, ToolSpec]:
+        """Tools of one server, compiling its document on first use"""
+        with self._lock:
+            if server not in self._tools:
+                mount = self.servers()[server]
+                spec, digest = self._spec(f"{mount}/openapi.json")
+                self._tools[server] = compile_tools(server, mount, spec)
+                self._hashes[server] = digest
+            return self._tools[server]
+
+    def tools(self) -> Dict[str, ToolSpec]:
+        """Every tool on every server (loads all server documents)"""
+        tools = {}
+        for server in self.servers():
+            tools.update(self.server_tools(server))
+        return tools
+
+    def tool(self, name: str) -> ToolSpec:
+        """Look up a tool by name, loading only the server it belongs to"""
+        for server in self.servers():
+            if name.startswith(tool_prefix(server) + "_"):
+                spec = self.server_tools(server).get(name)
+                if spec is not None:
+                    return spec
+        raise AttributeError(f"Unknown tool: {name}")
+
+    def refresh(self) -> List[str]:
+        """Revalidate loaded documents; return the servers whose spec changed"""
+        with self._lock:
+            self.specs.max_age, max_age = 0, self.specs.max_age
+            try:
+                if self._discovered_servers and self._servers is not None:
+                    self._servers = discover_servers(self._spec("/openapi.json")[0])
+                changed = []
+                for server in list(self._tools):
+                    mount = self._servers.get(server) if self._servers else None
+                    digest = self._spec(f"{mount}/openapi.json")[1] if mount else None
+                    if digest != self._hashes.get(server):
+                        changed.append(server)
+                        self._tools.pop(server)
+                        self._hashes.pop(server, None)
+                        for name in [n for n in vars(self) if n.startswith(tool_prefix(server) + "_")]:
+                            delattr(self, name)
+                return changed
+            finally:
+                self.specs.max_age = max_age
+
+    # ===== CALLS =====
+
+    def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Any:
+        """Make HTTP request to the proxy"""
+        try:
+            return self.transport.request(method, endpoint, data)
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+
+    def call(self, name: str, args: Optional[Dict[str, Any]] = None) -> Any:
+        """Validate and run a tool by name with a dict of arguments"""
+        spec = self.tool(name)
+        args = dict(args or {})
+        spec.check(args)
+        return self._make_request("POST", spec.endpoint, args or None)
+
+    def _stub(self, spec: ToolSpec) -> Callable[..., Any]:
+        def stub(**kwargs):
+            spec.check(kwargs)
+            return self._make_request("POST", spec.endpoint, kwargs or None)
+        stub.__name__ = stub.__qualname__ = spec.name
+        stub.__doc__ = spec.description
+        stub.__signature__ = spec.signature
+        return stub
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        stub = self._stub(self.tool(name))
+        setattr(self, name, stub)
+        return stub
+
+    def __dir__(self) -> List[str]:
+        names = list(super().__dir__())
+        for tools in list(self._tools.values()):
+            names.extend(tools)
+        return sorted(set(names))
+
+    def warm(self, n: int) -> int:
+        """Pre-open ``n`` pooled connections to the proxy in parallel"""
+        return self.transport.warm(n)
+
+    def batch(self, calls: Iterable[Call], max_workers: int = 8) -> List[BatchResult]:
+        """Run many tool calls in parallel; results come back in input order"""
+        return run_batch(self, calls, max_workers)
+
+    def batch_stream(self, calls: Iterable[Call], max_workers: int = 8,
+                     ordered: bool = False) -> Iterator[BatchResult]:
+        """Like batch(), but yield each result as soon as it completes
+
+        With ``ordered`` set, results keep input order and each is yielded
+        as soon as all earlier ones have been.
+        """
+        return stream_batch(self, calls, max_workers, ordered)
+
+
+def main():
+    """CLI: list the proxy's tools, or call one with JSON arguments"""
+    if len(sys.argv) < 2:
+        print("Usage: python3 mcp_openapi_client.py tools")
+        print("       python3 mcp_openapi_client.py <tool> ['{\"arg\": \"value\"}']")
+        return
+
+    client = OpenAPIClient()
+    try:
+        if sys.argv[1] == "tools":
+            for name, spec in sorted(client.tools().items()):
+                print(f"{name}{spec.signature}")
+                if spec.description:
+                    print(f"    {spec.description.strip().splitlines()[0]}")
+            return
+        args = json.loads(sys.argv[2]) if len(sys.argv) > 2 else {}
+        print(json.dumps(client.call(sys.argv[1], args), indent=2))
+    except (AttributeError, ValueError, requests.exceptions.RequestException) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,52 @@ A client for interacting with the MCP OpenAPI Proxy at http://192.168.0.7:8000
 import requests
 import json
 import sys
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
+try:
+    from mcp_transport import MCPTransport, PoolConfig
+    from mcp_batch import BatchResult, Call, run_batch, stream_batch
+    from mcp_cache import ResponseCache
+    from mcp_resilience import CircuitBreakers, RetryPolicy
+    from mcp_hedging import HedgePolicy
+    from mcp_metrics import ClientMetrics
+    from mcp_cassette import CassetteRecorder
+    from mcp_concurrency import AdaptiveConcurrency
+    from mcp_localtime import LocalTimeEngine
+    from mcp_tzbulk import convert_times
+    from mcp_streaming import iter_graph, iter_tree_nodes
+except ImportError:
+    from .mcp_transport import MCPTransport, PoolConfig
+    from .mcp_batch import BatchResult, Call, run_batch, stream_batch
+    from .mcp_cache import ResponseCache
+    from .mcp_resilience import CircuitBreakers, RetryPolicy
+    from .mcp_hedging import HedgePolicy
+    from .mcp_metrics import ClientMetrics
+    from .mcp_cassette import CassetteRecorder
+    from .mcp_concurrency import AdaptiveConcurrency
+    from .mcp_localtime import LocalTimeEngine
+    from .mcp_tzbulk import convert_times
+    from .mcp_streaming import iter_graph, iter_tree_nodes
 
 class MCPProxyClient:
     """Client for interacting with MCP OpenAPI Proxy"""
     
-    def __init__(self, base_url: str = "http://192.168.0.7:8000", token: Optional[str] = None):
+    def __init__(self, base_url: str = "http://192.168.0.7:8000", token: Optional[str] = None,
+                 pool: Optional[PoolConfig] = None,
+                 cache: Optional[ResponseCache] = None, coalesce: bool = False,
+                 retry: Optional[RetryPolicy] = None, breakers: Optional[CircuitBreakers] = None,
+                 hedge: Optional[HedgePolicy] = None, metrics: Optional[ClientMetrics] = None,
+                 codec: Optional[str] = None, compress_min_bytes: Optional[int] = None,
+                 recorder: Optional[CassetteRecorder] = None,
+                 concurrency: Optional[AdaptiveConcurrency] = None,
+                 local_time: Optional[LocalTimeEngine] = None):
         self.base_url = base_url.rstrip('/')
-        self.session = requests.Session()
+        self.transport = MCPTransport(self.base_url, pool=pool, cache=cache, coalesce=coalesce,
+                                      retry=retry, breakers=breakers, hedge=hedge, metrics=metrics,
+                                      codec=codec, compress_min_bytes=compress_min_bytes,
+                                      recorder=recorder, concurrency=concurrency,
+                                      local_time=local_time)
+        self.session = self.transport.session
         
         # Set up authentication if token is provided
         if token:
@@ -29,23 +66,39 @@ class MCPProxyClient:
 
     def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
         """Make HTTP request to the proxy"""
-        url = f"{self.base_url}{endpoint}"
-        
         try:
-            if method.upper() == "GET":
-                response = self.session.get(url)
-            elif method.upper() == "POST":
-                response = self.session.post(url, json=data)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-                
-            response.raise_for_status()
-            return response.json()
+            return self.transport.request(method, endpoint, data)
             
         except requests.exceptions.RequestException as e:
             print(f"Request failed: {e}")
             return {"error": str(e)}
 
+    def warm(self, n: int) -> int:
+        """Pre-open ``n`` pooled connections to the proxy in parallel"""
+        return self.transport.warm(n)
+
+    def breaker_state(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state per server prefix (empty without breakers)"""
+        return self.transport.breakers.snapshot() if self.transport.breakers is not None else {}
+
+    def batch(self, calls: Iterable[Call], max_workers: int = 8) -> List[BatchResult]:
+        """Run many tool calls in parallel; results come back in input order
+
+        Each call is ``("fs_read_text_file", {"path": ...})`` or
+        ``{"tool": ..., "args": {...}}``.  Failures are reported per item in
+        ``BatchResult.error`` rather than raised.
+        """
+        return run_batch(self, calls, max_workers)
+
+    def batch_stream(self, calls: Iterable[Call], max_workers: int = 8,
+                     ordered: bool = False) -> Iterator[BatchResult]:
+        """Like batch(), but yield each result as soon as it completes
+
+        With ``ordered`` set, results keep input order and each is yielded
+        as soon as all earlier ones have been.
+        """
+        return stream_batch(self, calls, max_workers, ordered)
+
     # ===== MEMORY SERVER METHODS =====
     
     def memory_create_entities(self, entities: List[Dict]) -> Dict:
@@ -64,6 +117,15 @@ class MCPProxyClient:
         """Read the entire knowledge graph"""
         return self._make_request("POST", "/memory/read_graph")
     
+    def memory_read_graph_stream(self) -> Iterator[Tuple[str, Dict]]:
+        """Stream the knowledge graph as ("entity" | "relation", item) pairs
+
+        The body is parsed incrementally, so memory stays bounded and the
+        first item arrives before the download finishes.  Failures raise
+        ``requests.RequestException`` instead of returning an error dict.
+        """
+        return iter_graph(self.transport.stream("POST", "/memory/read_graph"))
+    
     def memory_search_nodes(self, query: str) -> Dict:
         """Search for nodes in the knowledge graph"""
         return self._make_request("POST", "/memory/search_nodes", {"query": query})
@@ -90,6 +152,15 @@ class MCPProxyClient:
             "target_timezone": target_timezone
         })
 
+    def time_convert_times(self, times: Any, source_timezone: str, target_timezone: str) -> Any:
+        """Convert an array of wall-clock times between timezones locally
+
+        Vectorised with NumPy (see ``mcp_tzbulk.convert_times``); nothing is
+        sent to the proxy.  Returns a datetime64 array.  Raises ImportError
+        if numpy is not installed.
+        """
+        return convert_times(times, source_timezone, target_timezone)
+
     # ===== FILESYSTEM SERVER METHODS =====
     
     def fs_list_allowed_directories(self) -> Dict:
@@ -135,6 +206,10 @@ class MCPProxyClient:
     def fs_directory_tree(self, path: str) -> Dict:
         """Get directory tree structure"""
         return self._make_request("POST", "/filesystem/directory_tree", {"path": path})
+    
+    def fs_directory_tree_stream(self, path: str) -> Iterator[Dict]:
+        """Stream directory tree nodes depth-first (see mcp_streaming.iter_tree_nodes)"""
+        return iter_tree_nodes(self.transport.stream("POST", "/filesystem/directory_tree", {"path": path}))
 
 def main():
     """CLI interface for the MCP Proxy Client"""
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Retry with backoff and per-server circuit breakers for the MCP transport
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, FrozenSet
+
+import requests
+
+try:
+    from mcp_cache import server_prefix
+except ImportError:
+    from .mcp_cache import server_prefix
+
+# HTTP statuses that mean the backend (not the request) is at fault
+FAILURE_STATUSES = frozenset({502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised without sending anything while a server's breaker is open"""
+
+
+def is_backend_failure(error: Exception, statuses: FrozenSet[int] = FAILURE_STATUSES) -> bool:
+    """True for connection errors, timeouts and gateway-style HTTP statuses"""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code in statuses
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter for idempotent tool calls"""
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    statuses: FrozenSet[int] = field(default_factory=lambda: FAILURE_STATUSES)
+
+    def delay(self, attempt: int) -> float:
+        """Sleep before retry number ``attempt`` (1-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one backend server
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    calls fail fast with ``CircuitOpenError``.  Once ``reset_timeout``
+    seconds have passed, up to ``half_open_max`` probe calls are let
+    through: a success closes the breaker, a failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def before_call(self, name: str = "") -> None:
+        """Reserve permission to call, or raise CircuitOpenError"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"Circuit open for {name or 'server'}; failing fast")
+
+    def release(self) -> None:
+        """Give back a reservation for a call that was never sent"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == OPEN:
+                retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+            return {"state": self.state, "failures": self.failures,
+                    "rejected": self.rejected, "retry_in": round(retry_in, 3)}
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per server path prefix (/memory, /filesystem, ...)"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max: int = 1):
+        self.settings = dict(failure_threshold=failure_threshold, reset_timeout=reset_timeout,
+                             half_open_max=half_open_max)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_endpoint(self, endpoint: str) -> CircuitBreaker:
+        prefix = server_prefix(endpoint)
+        with self._lock:
+            breaker = self._breakers.get(prefix)
+            if breaker is None:
+                breaker = self._breakers[prefix] = CircuitBreaker(**self.settings)
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """State of every breaker seen so far, keyed by prefix"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {prefix: breaker.snapshot() for prefix, breaker in sorted(breakers.items())}
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Precompiled JSON Schema validation for MCP tool arguments
+Covers the subset of JSON Schema that mcpo emits for tool request bodies
+"""
+
+from typing import Dict, Any, Callable, List, Optional
+
+# A compiled validator: validate(value, path) raises SchemaValidationError
+Validator = Callable[[Any, str], None]
+
+_TYPE_CHECKS = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, (list, tuple)),
+    "object": lambda v: isinstance(v, dict),
+    "null": lambda v: v is None,
+}
+
+_PY_TYPES = {"string": str, "integer": int, "number": float, "boolean": bool,
+             "array": list, "object": dict, "null": type(None)}
+
+
+class SchemaValidationError(ValueError):
+    """Raised when tool arguments do not match the tool's input schema"""
+
+
+def _json_type(value: Any) -> str:
+    for name, check in _TYPE_CHECKS.items():
+        if check(value):
+            return name
+    return type(value).__name__
+
+
+class SchemaCompiler:
+    """Turns schemas from one OpenAPI document into validator closures
+
+    ``$ref`` pointers are resolved against ``document`` once at compile time,
+    and each referenced schema is compiled only once, so recursive models
+    work and validation does no lookups per call.
+    """
+
+    def __init__(self, document: Optional[Dict[str, Any]] = None):
+        self.document = document or {}
+        self._refs: Dict[str, Validator] = {}
+
+    def resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Follow ``$ref`` pointers until a concrete schema is reached"""
+        seen = set()
+        while "$ref" in schema:
+            ref = schema["$ref"]
+            if ref in seen or not ref.startswith("#/"):
+                raise ValueError(f"Unresolvable schema reference: {ref}")
+            seen.add(ref)
+            target: Any = self.document
+            try:
+                for part in ref[2:].split("/"):
+                    target = target[part.replace("~1", "/").replace("~0", "~")]
+            except (KeyError, TypeError):
+                raise ValueError(f"Unresolvable schema reference: {ref}")
+            schema = target
+        return schema
+
+    def compile(self, schema: Dict[str, Any]) -> Validator:
+        """Compile a schema into a ``validate(value, path)`` function"""
+        if "$ref" in schema:
+            return self._compile_ref(schema["$ref"])
+
+        checks: List[Validator] = []
+        types = schema.get("type")
+        if types is not None:
+            checks.append(self._type_check([types] if isinstance(types, str) else list(types)))
+        if "enum" in schema:
+            checks.append(self._enum_check(schema["enum"]))
+        if "const" in schema:
+            checks.append(self._enum_check([schema["const"]]))
+        for keyword in ("anyOf", "oneOf"):
+            if keyword in schema:
+                checks.append(self._any_of([self.compile(s) for s in schema[keyword]]))
+        for sub in schema.get("allOf", []):
+            checks.append(self.compile(sub))
+        checks.extend(self._bounds(schema))
+        if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+            checks.append(self._object_check(schema))
+        if "items" in schema:
+            checks.append(self._items_check(self.compile(schema["items"])))
+
+        def validate(value: Any, path: str = "$") -> None:
+            for check in checks:
+                check(value, path)
+        return validate
+
+    def _compile_ref(self, ref: str) -> Validator:
+        if ref not in self._refs:
+            target: List[Validator] = []
+            # Placeholder first, so a model that refers to itself terminates
+            self._refs[ref] = lambda value, path: target[0](value, path)
+            target.append(self.compile(self.resolve({"$ref": ref})))
+        return self._refs[ref]
+
+    @staticmethod
+    def _type_check(types: List[str]) -> Validator:
+        checks = [_TYPE_CHECKS[t] for t in types if t in _TYPE_CHECKS]
+        expected = " or ".join(types)
+
+        def validate(value: Any, path: str) -> None:
+            if not any(check(value) for check in checks):
+                raise SchemaValidationError(f"{path}: expected {expected}, got {_json_type(value)}")
+        return validate
+
+    @staticmethod
+    def _enum_check(options: List[Any]) -> Validator:
+        def validate(value: Any, path: str) -> None:
+            if value not in options:
+                raise SchemaValidationError(f"{path}: {value!r} is not one of {options!r}")
+        return validate
+
+    @staticmethod
+    def _any_of(alternatives: List[Validator]) -> Validator:
+        def validate(value: Any, path: str) -> None:
+            errors = []
+            for alternative in alternatives:
+                try:
+                    alternative(value, path)
+                    return
+                except SchemaValidationError as e:
+                    errors.append(str(e))
+            # Optional[int] fails as "expected integer" and "expected null";
+            # report that as one "expected integer or null"
+            prefix = f"{path}: expected "
+            if all(e.startswith(prefix) and ", got " in e for e in errors):
+                expected = " or ".join(e[len(prefix):].rsplit(", got ", 1)[0] for e in errors)
+                raise SchemaValidationError(f"{prefix}{expected}, got {_json_type(value)}")
+            raise SchemaValidationError(" / ".join(errors))
+        return validate
+
+    @staticmethod
+    def _bounds(schema: Dict[str, Any]) -> List[Validator]:
+        """Numeric, length and size limits, each applied only to its own type"""
+        checks = []
+        limits = [
+            ("minimum", _TYPE_CHECKS["number"], lambda v, n: v >= n, "must be >= {}"),
+            ("maximum", _TYPE_CHECKS["number"], lambda v, n: v <= n, "must be <= {}"),
+            ("exclusiveMinimum", _TYPE_CHECKS["number"], lambda v, n: v > n, "must be > {}"),
+            ("exclusiveMaximum", _TYPE_CHECKS["number"], lambda v, n: v < n, "must be < {}"),
+            ("minLength", _TYPE_CHECKS["string"], lambda v, n: len(v) >= n, "must be at least {} characters"),
+            ("maxLength", _TYPE_CHECKS["string"], lambda v, n: len(v) <= n, "must be at most {} characters"),
+            ("minItems", _TYPE_CHECKS["array"], lambda v, n: len(v) >= n, "must have at least {} items"),
+            ("maxItems", _TYPE_CHECKS["array"], lambda v, n: len(v) <= n, "must have at most {} items"),
+        ]
+        for keyword, applies, ok, message in limits:
+            # Draft 4 spells exclusive bounds as booleans next to minimum/maximum
+            if keyword in schema and not isinstance(schema[keyword], bool):
+                checks.append(SchemaCompiler._limit(schema[keyword], applies, ok, message.format(schema[keyword])))
+        return checks
+
+    @staticmethod
+    def _limit(bound: Any, applies: Callable, ok: Callable, message: str) -> Validator:
+        def validate(value: Any, path: str) -> None:
+            if applies(value) and not ok(value, bound):
+                raise SchemaValidationError(f"{path}: {message}")
+        return validate
+
+    def _object_check(self, schema: Dict[str, Any]) -> Validator:
+        properties = {name: self.compile(sub) for name, sub in schema.get("properties", {}).items()}
+        required = list(schema.get("required", []))
+        extra = schema.get("additionalProperties", True)
+        extra_check = self.compile(extra) if isinstance(extra, dict) else None
+
+        def validate(value: Any, path: str) -> None:
+            if not isinstance(value, dict):
+                return
+            # Unknown names first: a misspelt argument also shows up as a
+            # missing one, and the misspelling is the more useful message
+            for name, item in value.items():
+                check = properties.get(name)
+                if check is not None:
+                    check(item, f"{path}.{name}")
+                elif extra is False:
+                    raise SchemaValidationError(f"{path}: unexpected property '{name}'")
+                elif extra_check is not None:
+                    extra_check(item, f"{path}.{name}")
+            for name in required:
+                if name not in value:
+                    raise SchemaValidationError(f"{path}: missing required property '{name}'")
+        return validate
+
+    @staticmethod
+    def _items_check(item_check: Validator) -> Validator:
+        def validate(value: Any, path: str) -> None:
+            if isinstance(value, (list, tuple)):
+                for i, item in enumerate(value):
+                    item_check(item, f"{path}[{i}]")
+        return validate
+
+    def annotation(self, schema: Dict[str, Any]) -> Any:
+        """Best-effort Python type for a schema, for stub signatures"""
+        schema = self.resolve(schema)
+        options = schema.get("anyOf") or schema.get("oneOf")
+        if options:
+            types = [self.annotation(s) for s in options]
+            concrete = [t for t in types if t is not type(None)]
+            if len(concrete) == 1:
+                return Optional[concrete[0]] if len(types) > 1 else concrete[0]
+            return Any
+        kind = schema.get("type")
+        if isinstance(kind, list):
+            concrete = [k for k in kind if k != "null"]
+            kind = concrete[0] if len(concrete) == 1 else None
+        if kind == "array" and "items" in schema:
+            return List[self.annotation(schema["items"])]
+        if kind == "object":
+            return Dict[str, Any]
+        return _PY_TYPES.get(kind, Any)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+BM25 full-text search over the knowledge graph
+A local inverted index over entity names, types and observations, kept in
+step with a GraphMirror and persisted to disk, as a ranked alternative to
+memory_search_nodes
+"""
+
+import atexit
+import bisect
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+_TOKEN = re.compile(r"\w+")
+
+# Weight of a term occurrence in each field of an entity
+DEFAULT_FIELD_WEIGHTS = {"name": 3.0, "entityType": 2.0, "observations": 1.0}
+
+INDEX_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens"""
+    return _TOKEN.findall(text.lower())
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over a GraphMirror's entities
+
+    Each entity is one document; term frequencies are weighted by field
+    (``field_weights``).  Queries are OR-ed terms scored with BM25 (``k1``,
+    ``b``); with ``prefix`` set, each query term also matches up to
+    ``max_expansions`` longer terms starting with it, at ``prefix_weight``
+    of their score.  A query term ending in ``*`` always matches as a
+    prefix.
+
+    The index follows the mirror's writes entity by entity.  With ``path``
+    it is loaded from disk at start-up (a gzip-compressed JSON file) and
+    saved at exit; on load and on each mirror reload only entities whose
+    content changed are re-tokenized.
+    """
+
+    def __init__(self, mirror: Any = None, path: Optional[str] = None, k1: float = 1.2, b: float = 0.75,
+                 field_weights: Optional[Dict[str, float]] = None, prefix: bool = True,
+                 prefix_weight: float = 0.5, max_expansions: int = 50):
+        self.mirror = mirror
+        self.path = os.path.expanduser(path) if path else None
+        self.k1 = k1
+        self.b = b
+        self.field_weights = dict(field_weights or DEFAULT_FIELD_WEIGHTS)
+        self.prefix = prefix
+        self.prefix_weight = prefix_weight
+        self.max_expansions = max_expansions
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.documents: Dict[str, Tuple[str, float, Dict[str, float]]] = {}  # name -> (signature, length, terms)
+        self.total_length = 0.0
+        self.stats = {"indexed": 0, "unchanged": 0, "removed": 0, "queries": 0}
+        self._sorted_terms: Optional[List[str]] = None
+        self._lock = threading.RLock()
+        if self.path:
+            self.load()
+            atexit.register(self.save)
+        if mirror is not None:
+            mirror.add_listener(self)
+
+    # ===== MAINTENANCE =====
+
+    def _signature(self, entity: Dict[str, Any]) -> str:
+        content = json.dumps([entity["name"], entity["entityType"], entity["observations"]], ensure_ascii=False)
+        return hashlib.blake2b(content.encode(), digest_size=12).hexdigest()
+
+    def _terms(self, entity: Dict[str, Any]) -> Dict[str, float]:
+        terms: Dict[str, float] = {}
+        fields = (("name", [entity["name"]]), ("entityType", [entity["entityType"]]),
+                  ("observations", entity["observations"]))
+        for field, texts in fields:
+            weight = self.field_weights.get(field, 1.0)
+            for text in texts:
+                for token in tokenize(text):
+                    terms[token] = terms.get(token, 0.0) + weight
+        return terms
+
+    def update(self, name: str, entity: Optional[Dict[str, Any]]) -> None:
+        """Index, re-index or (with ``entity`` None) remove one entity"""
+        with self._lock:
+            if entity is None:
+                self._remove(name)
+                return
+            signature = self._signature(entity)
+            current = self.documents.get(name)
+            if current is not None and current[0] == signature:
+                self.stats["unchanged"] += 1
+                return
+            self._remove(name)
+            self._add(name, signature, self._terms(entity))
+
+    def sync(self, entities: Iterable[Dict[str, Any]]) -> None:
+        """Bring the index in line with a full set of entities"""
+        with self._lock:
+            seen = set()
+            for entity in entities:
+                seen.add(entity["name"])
+                self.update(entity["name"], entity)
+            for name in [name for name in self.documents if name not in seen]:
+                self._remove(name)
+
+    def _add(self, name: str, signature: str, terms: Dict[str, float]) -> None:
+        length = sum(terms.values())
+        self.documents[name] = (signature, length, terms)
+        self.total_length += length
+        for term, frequency in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                self._sorted_terms = None
+            postings[name] = frequency
+        self.stats["indexed"] += 1
+
+    def _remove(self, name: str) -> None:
+        document = self.documents.pop(name, None)
+        if document is None:
+            return
+        _, length, terms = document
+        self.total_length -= length
+        for term in terms:
+            postings = self.postings[term]
+            del postings[name]
+            if not postings:
+                del self.postings[term]
+                self._sorted_terms = None
+        self.stats["removed"] += 1
+
+    # ===== QUERIES =====
+
+    def _expand(self, token: str, prefix: bool) -> List[Tuple[str, float]]:
+        """Index terms matching a query token, with their weight"""
+        matches = [(token, 1.0)] if token in self.postings else []
+        if not prefix:
+            return matches
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        terms = self._sorted_terms
+        position = bisect.bisect_left(terms, token)
+        while position < len(terms) and len(matches) < self.max_expansions and terms[position].startswith(token):
+            if terms[position] != token:
+                matches.append((terms[position], self.prefix_weight))
+            position += 1
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = 10) -> List[Tuple[str, float]]:
+        """Entity names ranked by BM25 score for ``query``, best first
+
+        At most ``limit`` results (None for all).  The mirror is refreshed
+        first if its ``refresh_interval`` has passed, so other clients'
+        writes are found as they would be by ``GraphMirror.search_nodes``.
+        """
+        if self.mirror is not None:
+            self.mirror.refresh_if_due()
+        with self._lock:
+            self.stats["queries"] += 1
+            count = len(self.documents)
+            if count == 0:
+                return []
+            average = self.total_length / count or 1.0
+            scores: Dict[str, float] = {}
+            for raw in query.split():
+                explicit = raw.endswith("*")
+                for token in tokenize(raw):
+                    best: Dict[str, float] = {}
+                    for term, weight in self._expand(token, self.prefix or explicit):
+                        postings = self.postings[term]
+                        idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                        for name, frequency in postings.items():
+                            length = self.documents[name][1]
+                            score = weight * idf * frequency * (self.k1 + 1) / (
+                                frequency + self.k1 * (1 - self.b + self.b * length / average))
+                            if score > best.get(name, 0.0):
+                                best[name] = score
+                    for name, score in best.items():
+                        scores[name] = scores.get(name, 0.0) + score
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            return ranked[:limit] if limit is not None else ranked
+
+    def search_nodes(self, query: str, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Ranked ``memory_search_nodes``: best matches first, with relations among them and scores
+
+        Like ``memory_search_nodes`` it returns every match unless ``limit``
+        is given.
+        """
+        ranked = self.search(query, limit)
+        names = [name for name, _ in ranked]
+        result = self.mirror.open_nodes(names)
+        result["scores"] = {name: round(score, 6) for name, score in ranked}
+        return result
+
+    # ===== PERSISTENCE =====
+
+    def _settings(self) -> Dict[str, Any]:
+        return {"version": INDEX_VERSION, "field_weights": self.field_weights}
+
+    def save(self) -> None:
+        """Write the index to ``path``"""
+        if not self.path:
+            return
+        with self._lock:
+            stored = dict(self._settings(), documents={
+                name: [signature, terms] for name, (signature, _, terms) in self.documents.items()})
+            payload = json.dumps(stored, ensure_ascii=False, separators=(",", ":")).encode()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with gzip.open(tmp_path, "wb", compresslevel=5) as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def load(self) -> bool:
+        """Read the index from ``path``; False if it is missing or was built with other settings"""
+        try:
+            with gzip.open(self.path, "rb") as f:
+                stored = json.loads(f.read())
+        except (OSError, ValueError, EOFError):
+            return False
+        if {key: stored.get(key) for key in self._settings()} != self._settings():
+            return False
+        with self._lock:
+            self.postings.clear()
+            self.documents.clear()
+            self.total_length = 0.0
+            for name, (signature, terms) in stored["documents"].items():
+                self._add(name, signature, terms)
+            self.stats["indexed"] = 0
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats, documents=len(self.documents), terms=len(self.postings))
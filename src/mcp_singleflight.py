@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Single-flight coalescing of identical in-flight MCP requests
+"""
+
+import threading
+from typing import Dict, Any, Callable
+
+
+class _Flight:
+    """One in-flight call and the threads waiting on it"""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share it
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait and receive the same result object, or
+    the same exception.  Shared results must be treated as read-only.
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.shared = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn for key, or join the identical call already in flight"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters: calls executed, calls saved by sharing, calls in flight"""
+        with self._lock:
+            return {"executed": self.executed, "saved": self.shared, "in_flight": len(self._flights)}
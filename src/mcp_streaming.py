@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON decoding for very large MCP responses
+
+``parse_events`` turns a stream of byte chunks into ijson-style
+``(prefix, event, value)`` tuples without holding the whole document in
+memory; ``iter_items`` rebuilds the values found at one prefix, and
+``iter_graph`` / ``iter_tree_nodes`` apply this to ``memory_read_graph`` and
+``fs_directory_tree`` responses.
+"""
+
+import codecs
+import json
+import re
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?')
+_NUMBER_TAIL = re.compile(r'[-+.eE0-9]*\Z')
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+_TREE_NODE = re.compile(r'^item(?:\.children\.item)*$')
+_SCALARS = ("string", "number", "boolean", "null")
+
+Event = Tuple[str, str, Any]
+
+
+def _tokens(chunks: Iterable[bytes]) -> Iterator[Tuple[str, Any]]:
+    """Yield (kind, value) tokens from UTF-8 byte chunks"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buf = ""
+    pos = 0
+    chunks = iter(chunks)
+    eof = False
+
+    while True:
+        pos = _WHITESPACE.match(buf, pos).end()
+        if pos >= len(buf):
+            if eof:
+                return
+            buf, pos = "", 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                buf = decoder.decode(b"", final=True)
+            else:
+                buf = decoder.decode(chunk)
+            continue
+
+        char = buf[pos]
+        if char in "{}[]:,":
+            pos += 1
+            yield char, None
+            continue
+
+        if char == '"':
+            match = _STRING.match(buf, pos)
+        elif char in _LITERALS:
+            text, value = _LITERALS[char]
+            if len(buf) - pos >= len(text):
+                if not buf.startswith(text, pos):
+                    raise ValueError(f"Invalid JSON literal at {buf[pos:pos + 10]!r}")
+                pos += len(text)
+                yield "literal", value
+                continue
+            match = None
+        else:
+            match = _NUMBER.match(buf, pos)
+            if not eof and _NUMBER_TAIL.match(buf, match.end() if match else pos):
+                match = None  # the number may continue in the next chunk
+            elif match is None:
+                raise ValueError(f"Invalid JSON at {buf[pos:pos + 10]!r}")
+
+        if match is None:
+            if eof:
+                raise ValueError("Truncated JSON document")
+            chunk = next(chunks, None)
+            buf = buf[pos:]
+            pos = 0
+            if chunk is None:
+                eof = True
+                buf += decoder.decode(b"", final=True)
+            else:
+                buf += decoder.decode(chunk)
+            continue
+
+        token = match.group()
+        pos = match.end()
+        if char == '"':
+            yield "string", json.loads(token) if "\\" in token else token[1:-1]
+        else:
+            yield "number", json.loads(token)
+
+
+def parse_events(chunks: Iterable[bytes]) -> Iterator[Event]:
+    """Yield ijson-style (prefix, event, value) tuples
+
+    Events are start_map, map_key, end_map, start_array, end_array, string,
+    number, boolean and null.  Array items have the prefix of their array
+    plus ``.item``; map values the prefix of their map plus ``.key``.
+    """
+    stack: List[List[Any]] = []  # [container, prefix, expecting_key, pending_key]
+
+    def value_prefix() -> str:
+        if not stack:
+            return ""
+        container, prefix, _, key = stack[-1]
+        child = "item" if container == "[" else key
+        return f"{prefix}.{child}" if prefix else child
+
+    for kind, value in _tokens(chunks):
+        if kind == ",":
+            if stack and stack[-1][0] == "{":
+                stack[-1][2] = True
+            continue
+        if kind == ":":
+            continue
+        if stack and stack[-1][0] == "{" and stack[-1][2] and kind == "string":
+            stack[-1][2] = False
+            stack[-1][3] = value
+            yield stack[-1][1], "map_key", value
+            continue
+
+        if kind == "{":
+            prefix = value_prefix()
+            yield prefix, "start_map", None
+            stack.append(["{", prefix, True, None])
+        elif kind == "[":
+            prefix = value_prefix()
+            yield prefix, "start_array", None
+            stack.append(["[", prefix, False, None])
+        elif kind in "}]":
+            _, prefix, _, _ = stack.pop()
+            yield prefix, "end_map" if kind == "}" else "end_array", None
+        elif kind == "literal":
+            event = "null" if value is None else "boolean"
+            yield value_prefix(), event, value
+        else:
+            yield value_prefix(), kind, value
+
+
+def _build(first: Event, events: Iterator[Event]) -> Any:
+    """Rebuild the value that starts with ``first`` from the event stream"""
+    _, event, value = first
+    if event == "start_map":
+        obj: Dict[str, Any] = {}
+        for item in events:
+            if item[1] == "end_map":
+                return obj
+            obj[item[2]] = _build(next(events), events)
+    if event == "start_array":
+        arr: List[Any] = []
+        for item in events:
+            if item[1] == "end_array":
+                return arr
+            arr.append(_build(item, events))
+    return value
+
+
+def iter_items(events: Iterable[Event], prefix: str) -> Iterator[Any]:
+    """Yield each complete value found at ``prefix``"""
+    events = iter(events)
+    for event in events:
+        if event[0] == prefix and event[1] not in ("map_key", "end_map", "end_array"):
+            yield _build(event, events)
+
+
+def _embedded_document(events: Iterator[Event]) -> Iterator[Event]:
+    """Handle proxies that return the tool's JSON text as a JSON string
+
+    Such a document cannot be streamed, so it is re-parsed from memory.
+    """
+    first = next(events, None)
+    if first is None:
+        return iter(())
+    if first[1] == "string":
+        return parse_events([first[2].encode()])
+
+    def chained():
+        yield first
+        yield from events
+    return chained()
+
+
+def iter_graph(chunks: Iterable[bytes]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ("entity", {...}) and ("relation", {...}) from a read_graph body"""
+    events = _embedded_document(parse_events(chunks))
+    for prefix, event, value in events:
+        if prefix in ("entities.item", "relations.item") and event == "start_map":
+            kind = "entity" if prefix == "entities.item" else "relation"
+            yield kind, _build((prefix, event, value), events)
+
+
+def iter_tree_nodes(chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """Yield directory_tree nodes depth-first, without their children
+
+    Each node carries its scalar fields (``name``, ``type``, ...) plus
+    ``path`` (names from the root) and ``depth``.  A directory is yielded as
+    soon as its ``children`` start, before its contents, so memory use is
+    bounded by the depth of the tree rather than its size.
+    """
+    events = _embedded_document(parse_events(chunks))
+    stack: List[List[Any]] = []  # [prefix, node or None once yielded]
+    ancestors: List[str] = []
+
+    def emit(node: Dict[str, Any]) -> Dict[str, Any]:
+        node["path"] = ancestors + [str(node.get("name", ""))]
+        node["depth"] = len(ancestors)
+        return node
+
+    for prefix, event, value in events:
+        if event == "start_map" and _TREE_NODE.match(prefix):
+            stack.append([prefix, {}])
+        elif not stack:
+            continue
+        elif event == "start_array" and prefix == stack[-1][0] + ".children":
+            node = stack[-1][1]
+            yield emit(node)
+            ancestors.append(str(node.get("name", "")))
+            stack[-1][1] = None
+        elif event == "end_map" and prefix == stack[-1][0]:
+            _, node = stack.pop()
+            if node is None:
+                ancestors.pop()
+            else:
+                yield emit(node)
+        elif event in _SCALARS and stack[-1][1] is not None:
+            node_prefix = stack[-1][0] + "."
+            if prefix.startswith(node_prefix) and "." not in prefix[len(node_prefix):]:
+                stack[-1][1][prefix[len(node_prefix):]] = value
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP transport for the MCP OpenAPI Proxy clients
+Owns the pooled requests.Session, its timeouts and connection pre-warming
+"""
+
+import gzip
+import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, Optional
+from requests.adapters import HTTPAdapter
+
+try:
+    from mcp_cache import MUTATING_ENDPOINTS, canonical_key
+    from mcp_singleflight import SingleFlight
+    from mcp_resilience import CircuitBreakers, RetryPolicy, is_backend_failure
+    from mcp_hedging import HedgePolicy
+    from mcp_metrics import ClientMetrics, connect_time, install_connect_timing, reset_connect_time
+    from mcp_codec import JSONCodec, get_codec
+    from mcp_concurrency import AdaptiveConcurrency, ConcurrencyLimitExceeded
+    from mcp_localtime import LocalTimeEngine
+except ImportError:
+    from .mcp_cache import MUTATING_ENDPOINTS, canonical_key
+    from .mcp_singleflight import SingleFlight
+    from .mcp_resilience import CircuitBreakers, RetryPolicy, is_backend_failure
+    from .mcp_hedging import HedgePolicy
+    from .mcp_metrics import ClientMetrics, connect_time, install_connect_timing, reset_connect_time
+    from .mcp_codec import JSONCodec, get_codec
+    from .mcp_concurrency import AdaptiveConcurrency, ConcurrencyLimitExceeded
+    from .mcp_localtime import LocalTimeEngine
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool and timeout settings for a client session
+
+    ``connections_per_host`` is the number of keep-alive connections kept per
+    host and should be at least the number of threads sharing the client.
+    With ``block`` set, threads wait for a free connection instead of opening
+    throwaway ones that are discarded with "connection pool is full".
+    """
+    connections_per_host: int = 10
+    max_pools: int = 10
+    block: bool = False
+    keep_alive: bool = True
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+
+    @property
+    def timeout(self) -> tuple:
+        return (self.connect_timeout, self.read_timeout)
+
+
+def build_session(pool: PoolConfig) -> requests.Session:
+    """Create a requests.Session with adapters sized by the pool config"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool.max_pools,
+                          pool_maxsize=pool.connections_per_host,
+                          pool_block=pool.block)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not pool.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+class MCPTransport:
+    """Pooled HTTP transport shared by the MCP clients
+
+    An optional ``cache`` (see ``mcp_cache.ResponseCache``) is consulted
+    before each request and told about each completed one.  With
+    ``coalesce`` set, identical non-mutating requests that are in flight at
+    the same time share one round trip (see ``mcp_singleflight``).
+    ``retry`` re-sends idempotent requests after backend failures and
+    ``breakers`` fail fast while a server is unhealthy (see
+    ``mcp_resilience``).  ``hedge`` duplicates slow idempotent requests
+    (see ``mcp_hedging``).  ``metrics`` records per-endpoint latency by
+    phase, byte counts and error/retry counters (see ``mcp_metrics``).
+    Bodies are encoded and decoded with ``codec`` (a ``mcp_codec.JSONCodec``
+    or codec name; default: the fastest installed).
+
+    Responses are requested with ``Accept-Encoding: gzip`` unless
+    ``accept_gzip`` is False.  Request bodies of at least
+    ``compress_min_bytes`` are sent gzip-compressed; if the proxy rejects a
+    compressed body (400/415/422) it is re-sent uncompressed and request
+    compression is switched off for this transport.
+
+    ``concurrency`` (see ``mcp_concurrency.AdaptiveConcurrency``) caps the
+    calls in flight to each server at an adaptive limit; callers over it
+    wait in the client.  Its limits and queue depths are exported with
+    ``metrics`` when both are given.
+
+    ``local_time`` (see ``mcp_localtime.LocalTimeEngine``) answers the time
+    tools in-process when it can, checking a sample of its answers against
+    the server; the checked calls return the server's result.
+
+    A ``recorder`` (see ``mcp_cassette.CassetteRecorder``) is given every
+    HTTP exchange with its timing, after caching and coalescing, so each
+    retry and hedge is a record of its own.
+    """
+
+    def __init__(self, base_url: str, pool: Optional[PoolConfig] = None, cache: Any = None,
+                 coalesce: bool = False, retry: Optional[RetryPolicy] = None,
+                 breakers: Optional[CircuitBreakers] = None, hedge: Optional[HedgePolicy] = None,
+                 metrics: Optional[ClientMetrics] = None, codec: Any = None,
+                 compress_min_bytes: Optional[int] = None, accept_gzip: bool = True,
+                 recorder: Any = None, concurrency: Optional[AdaptiveConcurrency] = None,
+                 local_time: Optional[LocalTimeEngine] = None):
+        self.base_url = base_url.rstrip('/')
+        self.pool = pool or PoolConfig()
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.retry = retry
+        self.breakers = breakers
+        self.hedge = hedge
+        self.metrics = metrics
+        self.codec = codec if isinstance(codec, JSONCodec) else get_codec(codec)
+        self.compress_min_bytes = compress_min_bytes
+        self.recorder = recorder
+        self.concurrency = concurrency
+        self.local_time = local_time
+        self.observers = []
+        self.session = build_session(self.pool)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate" if accept_gzip else "identity"
+        if metrics is not None:
+            install_connect_timing(self.session)
+            if concurrency is not None:
+                metrics.add_collector("concurrency", concurrency)
+            if local_time is not None:
+                metrics.add_collector("local_time", local_time)
+
+    def request(self, method: str, endpoint: str, data: Dict = None) -> Any:
+        """Send a request and return the decoded JSON body
+
+        Raises ``requests.RequestException`` (``HTTPError`` for 4xx/5xx
+        statuses, with the response attached) so each client can map
+        failures onto its own error format.
+        """
+        if self.local_time is not None and self.local_time.answers(endpoint):
+            local = self.local_time.answer(endpoint, data)
+            if local is not None:
+                if not self.local_time.should_verify():
+                    return local
+                remote = self._fetch(method, endpoint, data)
+                self.local_time.verify(endpoint, data, local, remote)
+                return remote
+
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, data)
+            if cached is not None:
+                return cached
+
+        if self.single_flight is not None and endpoint not in MUTATING_ENDPOINTS:
+            key = f"{method.upper()} {canonical_key(endpoint, data)}"
+            return self.single_flight.do(key, lambda: self._fetch(method, endpoint, data))
+        return self._fetch(method, endpoint, data)
+
+    def add_observer(self, observer: Any) -> None:
+        """Have ``observer.observe(endpoint, data, result)`` called after each successful request"""
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: Any) -> None:
+        """Stop calling an observer added with ``add_observer``"""
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def _fetch(self, method: str, endpoint: str, data: Dict = None) -> Any:
+        """Send a request and feed the outcome to the cache and observers"""
+        if self.cache is None:
+            result = self._call(method, endpoint, data)
+        else:
+            result = None
+            try:
+                result = self._call(method, endpoint, data)
+            finally:
+                self.cache.observe(endpoint, data, result)
+        for observer in self.observers:
+            observer.observe(endpoint, data, result)
+        return result
+
+    def _call(self, method: str, endpoint: str, data: Dict = None) -> Any:
+        """Send a request through the circuit breaker, retrying if allowed"""
+        breaker = self.breakers.for_endpoint(endpoint) if self.breakers is not None else None
+        retryable = self.retry is not None and endpoint not in MUTATING_ENDPOINTS
+        attempts = self.retry.max_attempts if retryable else 1
+        hedged = self.hedge is not None and self.hedge.applies_to(endpoint)
+
+        for attempt in range(1, attempts + 1):
+            if breaker is not None:
+                breaker.before_call(endpoint)
+            try:
+                if hedged:
+                    result = self.hedge.call(endpoint, lambda: self._send(method, endpoint, data))
+                else:
+                    result = self._send(method, endpoint, data)
+            except ConcurrencyLimitExceeded:
+                # Rejected by the client-side queue: the server saw nothing,
+                # so neither the breaker nor the HTTP error metrics hear of it
+                if breaker is not None:
+                    breaker.release()
+                raise
+            except requests.exceptions.RequestException as e:
+                failed = is_backend_failure(e)
+                if breaker is not None:
+                    if failed:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                if self.metrics is not None:
+                    response = getattr(e, 'response', None)
+                    kind = f"http_{response.status_code}" if response is not None else type(e).__name__
+                    self.metrics.record_error(endpoint, kind)
+                if not (retryable and attempt < attempts and is_backend_failure(e, self.retry.statuses)):
+                    raise
+                if self.metrics is not None:
+                    self.metrics.record_retry(endpoint)
+                time.sleep(self.retry.delay(attempt))
+                continue
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+    def _send(self, method: str, endpoint: str, data: Dict = None) -> Any:
+        """Perform the HTTP round trip within the server's concurrency limit"""
+        if self.concurrency is None:
+            return self._round_trip(method, endpoint, data)
+
+        limit = self.concurrency.for_endpoint(endpoint)
+        limit.acquire(endpoint)
+        start = time.perf_counter()
+        dropped = False
+        try:
+            return self._round_trip(method, endpoint, data)
+        except requests.exceptions.RequestException as e:
+            dropped = is_backend_failure(e)
+            raise
+        finally:
+            limit.release(time.perf_counter() - start, dropped)
+
+    def _round_trip(self, method: str, endpoint: str, data: Dict = None) -> Any:
+        """Perform the HTTP round trip"""
+        url = f"{self.base_url}{endpoint}"
+        body = self.codec.dumps(data) if data is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else None
+        compressed = body is not None and self.compress_min_bytes is not None and \
+            len(body) >= self.compress_min_bytes
+        if compressed:
+            plain_body, plain_headers = body, headers
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+            headers = dict(headers, **{"Content-Encoding": "gzip"})
+
+        if self.metrics is not None:
+            reset_connect_time()
+        start = time.perf_counter()
+        if method.upper() == "GET":
+            response = self.session.get(url, timeout=self.pool.timeout, stream=True)
+        elif method.upper() == "POST":
+            response = self.session.post(url, data=body, headers=headers,
+                                         timeout=self.pool.timeout, stream=True)
+            if compressed and response.status_code in (400, 415, 422):
+                response.close()
+                body = plain_body
+                response = self.session.post(url, data=body, headers=plain_headers,
+                                             timeout=self.pool.timeout, stream=True)
+                if response.status_code < 400:
+                    self.compress_min_bytes = None
+        else:
+            raise ValueError(f"Unsupported method: {method}")
+        headers_at = time.perf_counter()
+        content = response.content
+        body_at = time.perf_counter()
+        if self.recorder is not None:
+            self.recorder.record(method, endpoint, data, response.status_code, content, start, body_at - start)
+
+        if self.metrics is None:
+            response.raise_for_status()
+            return self._decode(response, content)
+
+        connect = connect_time()
+        timings = {
+            "connect": connect,
+            "ttfb": max(0.0, headers_at - start - connect),
+            "download": body_at - headers_at,
+        }
+        try:
+            response.raise_for_status()
+            result = self._decode(response, content)
+            timings["decode"] = time.perf_counter() - body_at
+            return result
+        finally:
+            timings["total"] = time.perf_counter() - start
+            self.metrics.record_request(endpoint, response.status_code, timings,
+                                        len(body or b""), len(content))
+
+    def _decode(self, response: requests.Response, content: bytes) -> Any:
+        """Decode a JSON body with the configured codec"""
+        try:
+            return self.codec.loads(content)
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(
+                f"Invalid JSON in response from {response.url}: {e}", response=response) from e
+
+    def stream(self, method: str, endpoint: str, data: Dict = None,
+               chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield the raw response body in chunks as it arrives
+
+        Bypasses caching, coalescing, retries and hedging, which all need
+        the complete response; the connection is released when the
+        generator is exhausted or closed.
+        """
+        url = f"{self.base_url}{endpoint}"
+        breaker = self.breakers.for_endpoint(endpoint) if self.breakers is not None else None
+        if breaker is not None:
+            breaker.before_call(endpoint)
+        try:
+            body = self.codec.dumps(data) if data is not None else None
+            response = self.session.request(method.upper(), url, data=body,
+                                            headers={"Content-Type": "application/json"},
+                                            timeout=self.pool.timeout, stream=True)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if breaker is not None:
+                if is_backend_failure(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        with response:
+            raw = response.raw
+            if not hasattr(raw, "read1"):  # urllib3 < 2 waits for full chunks
+                yield from response.iter_content(chunk_size)
+                return
+            while True:
+                chunk = raw.read1(chunk_size, decode_content=True)
+                if not chunk:
+                    return
+                yield chunk
+
+    def warm(self, n: int) -> int:
+        """Open up to ``n`` keep-alive connections to the proxy in parallel
+
+        Returns the number of connections that were established and parked
+        in the pool, ready for the next burst of calls.
+        """
+        if not self.pool.keep_alive or n < 1:
+            return 0
+        n = min(n, self.pool.connections_per_host)
+        conn_pool = self._connection_pool()
+
+        connections = [conn_pool._get_conn() for _ in range(n)]
+
+        def connect(conn) -> bool:
+            try:
+                conn.timeout = self.pool.connect_timeout
+                conn.connect()
+                return True
+            except OSError:
+                conn.close()
+                return False
+
+        try:
+            with ThreadPoolExecutor(max_workers=n) as executor:
+                opened = sum(executor.map(connect, connections))
+        finally:
+            for conn in connections:
+                conn_pool._put_conn(conn)
+        return opened
+
+    def _connection_pool(self) -> Any:
+        """The urllib3 pool that requests to the proxy are sent through
+
+        requests 2.32+ keys pools by TLS settings as well as host, so the
+        pool is looked up the way ``Session.request`` and
+        ``HTTPAdapter.send`` look it up.
+        """
+        adapter = self.session.get_adapter(self.base_url)
+        # verify/cert/proxies as Session.request resolves them (e.g. REQUESTS_CA_BUNDLE)
+        settings = self.session.merge_environment_settings(self.base_url, {}, None, None, None)
+        if hasattr(adapter, "get_connection_with_tls_context"):
+            prepared = self.session.prepare_request(requests.Request("POST", f"{self.base_url}/"))
+            return adapter.get_connection_with_tls_context(prepared, verify=settings["verify"],
+                                                           proxies=settings["proxies"], cert=settings["cert"])
+        return adapter.get_connection(self.base_url, settings["proxies"])
+
+    def close(self) -> None:
+        """Close all pooled connections and stop the hedge workers"""
+        self.session.close()
+        if self.hedge is not None:
+            self.hedge.close()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Vectorised bulk timezone conversion with NumPy
+Converts whole columns of wall-clock times between timezones, using
+per-zone tables of UTC offset transitions and NumPy datetime64 arrays,
+with the same DST rules as zoneinfo (and so as time_convert_time)
+"""
+
+import calendar
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Tuple, Union
+from zoneinfo import ZoneInfo
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+# Units per second of the datetime64 units kept as they are
+UNIT_SCALES = {"s": 1, "ms": 10 ** 3, "us": 10 ** 6, "ns": 10 ** 9}
+EPOCH = datetime(1970, 1, 1)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Bulk timezone conversion requires numpy: pip install numpy")
+
+
+class TransitionTable:
+    """UTC offset transitions of one zone between ``start_year`` and ``end_year``
+
+    ``transitions[i]`` is the UTC second at which ``offsets[i + 1]`` (and
+    ``dst[i + 1]``) take over; ``offsets[0]`` applies before the first.
+    zoneinfo does not expose its transition list, so the table is built by
+    sampling the zone every ``step_hours`` and bisecting each change to the
+    second; changes that revert within one step are missed.
+
+    ``wall`` holds each transition as local wall time on the later side of
+    the clock change, which resolves local times the way zoneinfo does
+    with ``fold=0``: a time in a spring-forward gap uses the offset from
+    before the gap, and a repeated time in a fall-back fold is the first
+    (earlier) one.
+    """
+
+    def __init__(self, name: str, start_year: int = 1970, end_year: int = 2100, step_hours: int = 24):
+        _require_numpy()
+        self.name = name
+        self.zone = ZoneInfo(name)
+        self.start = calendar.timegm((start_year, 1, 1, 0, 0, 0))
+        self.end = calendar.timegm((end_year + 1, 1, 1, 0, 0, 0))
+        step = step_hours * 3600
+
+        state = self._state(self.start)
+        transitions, offsets, dst = [], [state[0]], [state[1]]
+        t = self.start
+        while t < self.end:
+            probe = min(t + step, self.end)
+            if self._state(probe) == state:
+                t = probe
+                continue
+            low, high = t, probe
+            while high - low > 1:
+                middle = (low + high) // 2
+                if self._state(middle) == state:
+                    low = middle
+                else:
+                    high = middle
+            state = self._state(high)
+            transitions.append(high)
+            offsets.append(state[0])
+            dst.append(state[1])
+            t = high
+
+        self.transitions = np.array(transitions, dtype=np.int64)
+        self.offsets = np.array([offset // timedelta(seconds=1) for offset in offsets], dtype=np.int64)
+        self.dst = np.array([bool(saving) for saving in dst], dtype=bool)
+        self.wall = self.transitions + np.maximum(self.offsets[:-1], self.offsets[1:])
+
+    def _state(self, seconds: int) -> Tuple[timedelta, timedelta]:
+        moment = datetime.fromtimestamp(seconds, self.zone)
+        return moment.utcoffset(), moment.dst()
+
+    def utc_index(self, utc: "np.ndarray") -> "np.ndarray":
+        """Index into ``offsets``/``dst`` for UTC seconds"""
+        return np.searchsorted(self.transitions, utc, side="right")
+
+    def local_index(self, local: "np.ndarray") -> "np.ndarray":
+        """Index into ``offsets``/``dst`` for local wall-clock seconds"""
+        return np.searchsorted(self.wall, local, side="right")
+
+
+_tables: Dict[str, TransitionTable] = {}
+_tables_lock = threading.Lock()
+
+
+def transition_table(name: str) -> TransitionTable:
+    """The (cached) transition table for a zone name"""
+    with _tables_lock:
+        table = _tables.get(name)
+    if table is None:
+        table = TransitionTable(name)
+        with _tables_lock:
+            table = _tables.setdefault(name, table)
+    return table
+
+
+def as_datetime64(times: Any) -> "np.ndarray":
+    """Times as a datetime64 array in s, ms, us or ns
+
+    Accepts datetime64 arrays, ISO 8601 strings and naive datetimes.
+    """
+    _require_numpy()
+    array = np.asarray(times)
+    if array.dtype.kind != "M":
+        array = array.astype("datetime64")
+    unit, count = np.datetime_data(array.dtype)
+    if unit not in UNIT_SCALES or count != 1:
+        array = array.astype("datetime64[ns]" if unit in ("ps", "fs", "as") else "datetime64[s]")
+    return array
+
+
+def convert_times(times: Any, source_timezone: str, target_timezone: str,
+                  return_dst: bool = False) -> Union["np.ndarray", Tuple["np.ndarray", "np.ndarray"]]:
+    """Convert wall-clock times in one zone to wall-clock times in another
+
+    ``times`` are naive local times in ``source_timezone`` (see
+    ``as_datetime64``); the result is a datetime64 array of the same unit
+    and shape holding the same instants as local times in
+    ``target_timezone``.  Gap and fold times resolve like zoneinfo's
+    ``fold=0``.  NaT stays NaT.  Times outside the tables' years are
+    converted one by one with zoneinfo.  With ``return_dst``, also returns
+    a boolean array telling which results fall in daylight saving time.
+    """
+    array = as_datetime64(times)
+    unit = np.datetime_data(array.dtype)[0]
+    scale = UNIT_SCALES[unit]
+    source = transition_table(source_timezone)
+    target = transition_table(target_timezone)
+
+    values = array.view(np.int64)
+    missing = np.isnat(array)
+    local = values // scale
+    fraction = values - local * scale
+    source_index = source.local_index(local)
+    utc = local - source.offsets[source_index]
+    if target is source:
+        # zoneinfo's astimezone() leaves times in the same zone as they are,
+        # even ones in a gap, and so does time_convert_time
+        converted = local.copy()
+        is_dst = source.dst[source_index]
+    else:
+        target_index = target.utc_index(utc)
+        converted = utc + target.offsets[target_index]
+        is_dst = target.dst[target_index]
+
+    outside = ~missing & ((utc < max(source.start, target.start)) | (utc >= min(source.end, target.end)))
+    for position in zip(*np.nonzero(outside)):
+        moment = (EPOCH + timedelta(seconds=int(local[position]))).replace(tzinfo=source.zone)
+        moment = moment.astimezone(target.zone)
+        converted[position] = calendar.timegm(moment.timetuple())
+        is_dst[position] = bool(moment.dst())
+
+    result = converted * scale + fraction
+    result[missing] = np.iinfo(np.int64).min
+    result = result.view(f"datetime64[{unit}]")
+    if return_dst:
+        is_dst[missing] = False
+        return result, is_dst
+    return result
@@ -3,9 +3,10 @@
 
 import requests
 import json
+import os
 
-SERVER_URL = "http://192.168.0.7:8000"
-API_KEY = "mcp-secret-key-1754822293"
+SERVER_URL = os.getenv("MCP_BASE_URL", "http://192.168.0.7:8000")
+API_KEY = os.getenv("MCP_API_TOKEN", "mcp-secret-key-1754822293")
 
 def test_fetch_examples():
     headers = {
@@ -5,8 +5,9 @@ import requests
 import json
 import os
 
-SERVER_URL = "http://192.168.0.7:8000"
-API_KEY = "mcp-secret-key-1754822293"
+SERVER_URL = os.getenv("MCP_BASE_URL", "http://192.168.0.7:8000")
+API_KEY = os.getenv("MCP_API_TOKEN", "mcp-secret-key-1754822293")
+FILES_DIR = os.getenv("MCP_FS_ROOT", "/home/ajlennon/mcp-service/files")
 
 def test_filesystem_operations():
     headers = {
@@ -39,7 +40,7 @@ def test_filesystem_operations():
         response = requests.post(
             f"{SERVER_URL}/filesystem/list_directory",
             headers=headers,
-            json={"path": "/home/ajlennon/mcp-service/files"}
+            json={"path": FILES_DIR}
         )
         if response.status_code == 200:
             result = response.json()
@@ -55,7 +56,7 @@ def test_filesystem_operations():
         response = requests.post(
             f"{SERVER_URL}/filesystem/list_directory",
             headers=headers,
-            json={"path": "/home/ajlennon/mcp-service"}
+            json={"path": os.path.dirname(FILES_DIR)}
         )
         if response.status_code == 500:
             print(f"   ✅ Security working: Access denied as expected")
@@ -72,7 +73,7 @@ def test_filesystem_operations():
             f"{SERVER_URL}/filesystem/write_file",
             headers=headers,
             json={
-                "path": "/home/ajlennon/mcp-service/files/test.txt",
+                "path": os.path.join(FILES_DIR, "test.txt"),
                 "content": "Hello from MCP filesystem test!"
             }
         )
@@ -90,7 +91,7 @@ def test_filesystem_operations():
         response = requests.post(
             f"{SERVER_URL}/filesystem/read_text_file",
             headers=headers,
-            json={"path": "/home/ajlennon/mcp-service/files/test.txt"}
+            json={"path": os.path.join(FILES_DIR, "test.txt")}
         )
         if response.status_code == 200:
             result = response.json()
@@ -5,6 +5,7 @@ Authentication Helper for MCP OpenAPI Proxy
 
 import requests
 import json
+import os
 import sys
 
 def explore_auth_options(base_url="http://192.168.0.7:8000"):
@@ -133,7 +134,7 @@ def main():
     if len(sys.argv) > 1:
         base_url = sys.argv[1]
     else:
-        base_url = "http://192.168.0.7:8000"
+        base_url = os.getenv("MCP_BASE_URL", "http://192.168.0.7:8000")
     
     # Explore authentication
     working_headers = explore_auth_options(base_url)
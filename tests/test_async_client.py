@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio MCP client against a local aiohttp stub
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import asyncio
+
+from aiohttp import web
+from mcp_async_client import AsyncMCPClient
+
+
+async def _start_stub(delay: float = 0.0, memory_delay: float = None):
+    """Start a stub proxy that records the peak number of concurrent requests"""
+    state = {"active": 0, "peak": 0, "memory_active": 0, "memory_peak": 0}
+
+    async def handler(request):
+        is_memory = request.path.startswith("/memory")
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        if is_memory:
+            state["memory_active"] += 1
+            state["memory_peak"] = max(state["memory_peak"], state["memory_active"])
+        try:
+            await asyncio.sleep(memory_delay if is_memory and memory_delay is not None else delay)
+            if request.path == "/time/get_current_time":
+                body = await request.json()
+                return web.json_response({"timezone": body["timezone"], "datetime": "2024-01-01T00:00:00+00:00"})
+            if request.path == "/memory/read_graph":
+                return web.json_response({"entities": [], "relations": []})
+            return web.json_response({"detail": "Not Found"}, status=404)
+        finally:
+            state["active"] -= 1
+            if is_memory:
+                state["memory_active"] -= 1
+
+    app = web.Application()
+    app.router.add_route("POST", "/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", state
+
+
+def test_concurrent_calls_respect_limits():
+    """Global and per-server limits bound the requests in flight"""
+    async def run():
+        runner, url, state = await _start_stub(delay=0.02)
+        try:
+            async with AsyncMCPClient(url, token="t", max_concurrency=8,
+                                      server_limits={"/memory": 2}) as client:
+                calls = [client.time_get_current_time(f"Zone/{i}") for i in range(40)]
+                calls += [client.memory_read_graph() for _ in range(10)]
+                results = await asyncio.gather(*calls)
+        finally:
+            await runner.cleanup()
+        return results, state
+
+    results, state = asyncio.run(run())
+    assert results[3]["timezone"] == "Zone/3"
+    assert results[-1] == {"entities": [], "relations": []}
+    assert 1 < state["peak"] <= 8
+    assert state["memory_peak"] <= 2
+
+
+def test_saturated_server_does_not_block_others():
+    """Calls queued on a slow, tightly limited server leave global slots to the others"""
+    async def run():
+        runner, url, _ = await _start_stub(delay=0.0, memory_delay=0.3)
+        try:
+            async with AsyncMCPClient(url, token="t", max_concurrency=4,
+                                      server_limits={"/memory": 2}) as client:
+                slow = [asyncio.ensure_future(client.memory_read_graph()) for _ in range(8)]
+                await asyncio.sleep(0.05)
+                start = asyncio.get_running_loop().time()
+                fast = await asyncio.gather(*(client.time_get_current_time(f"Zone/{i}") for i in range(20)))
+                fast_elapsed = asyncio.get_running_loop().time() - start
+                await asyncio.gather(*slow)
+        finally:
+            await runner.cleanup()
+        return fast, fast_elapsed
+
+    fast, fast_elapsed = asyncio.run(run())
+    assert all("timezone" in result for result in fast)
+    assert fast_elapsed < 0.2
+
+
+def test_invalid_json_returns_error_dict():
+    """A 2xx response that isn't JSON comes back as an error dict"""
+    async def run():
+        async def handler(request):
+            return web.Response(text="<html>proxy login</html>", content_type="text/html")
+
+        app = web.Application()
+        app.router.add_route("POST", "/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with AsyncMCPClient(f"http://127.0.0.1:{port}", token="t") as client:
+                return await client.memory_read_graph()
+        finally:
+            await runner.cleanup()
+
+    result = asyncio.run(run())
+    assert "Invalid JSON" in result["error"]
+
+
+def test_http_error_returns_error_dict():
+    """HTTP errors come back as error dicts like the sync clients"""
+    async def run():
+        runner, url, _ = await _start_stub()
+        try:
+            async with AsyncMCPClient(url, token="t") as client:
+                return await client.fs_list_allowed_directories()
+        finally:
+            await runner.cleanup()
+
+    result = asyncio.run(run())
+    assert "404" in result["error"]
+    assert result["detail"] == {"detail": "Not Found"}
+
+
+def test_client_survives_a_second_event_loop():
+    """One client can be used under two asyncio.run() calls while its limits are contended"""
+    client = AsyncMCPClient("http://127.0.0.1:1", token="t", max_concurrency=2,
+                            server_limits={"/memory": 1})
+
+    async def run():
+        runner, url, state = await _start_stub(delay=0.01)
+        client.base_url = url
+        try:
+            async with client:
+                calls = [client.time_get_current_time(f"Zone/{i}") for i in range(6)]
+                calls += [client.memory_read_graph() for _ in range(3)]
+                results = await asyncio.gather(*calls)
+        finally:
+            await runner.cleanup()
+        return results, state
+
+    for _ in range(2):
+        results, state = asyncio.run(run())
+        assert results[5]["timezone"] == "Zone/5"
+        assert state["peak"] <= 2 and state["memory_peak"] <= 1
+
+
+def main():
+    """Run all tests"""
+    test_concurrent_calls_respect_limits()
+    test_saturated_server_does_not_block_others()
+    test_invalid_json_returns_error_dict()
+    test_http_error_returns_error_dict()
+    test_client_survives_a_second_event_loop()
+    print("✅ All async client tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Offline tests for MCPAuthenticatedClient using a stub transport adapter
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import io
+import json
+import tempfile
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+import mcp_transport
+from mcp_authenticated_client import MCPAuthenticatedClient, MCPAuthenticationError, run_pipe
+from mcp_fake_proxy import FakeProxy
+from mcp_localtime import LocalTimeEngine
+
+
+class StubAdapter(BaseAdapter):
+    """Answers every request locally and records the paths it saw"""
+
+    def __init__(self, valid_token: str = "good"):
+        super().__init__()
+        self.valid_token = valid_token
+        self.paths = []
+
+    def send(self, request, **kwargs):
+        self.paths.append(request.path_url)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if request.headers.get("Authorization") != f"Bearer {self.valid_token}":
+            response.status_code = 401
+            response._content = b'{"detail": "Invalid token"}'
+        else:
+            response.status_code = 200
+            response._content = json.dumps({"timezone": "Etc/UTC"}).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def _client(token: str, adapter: StubAdapter, **kwargs) -> MCPAuthenticatedClient:
+    """Build a client whose session is served by the stub adapter"""
+    original = mcp_transport.build_session
+
+    def build_stub_session(pool):
+        session = original(pool)
+        session.mount("http://", adapter)
+        return session
+
+    mcp_transport.build_session = build_stub_session
+    try:
+        return MCPAuthenticatedClient("http://proxy.test", token=token, **kwargs)
+    finally:
+        mcp_transport.build_session = original
+
+
+def test_construction_does_not_probe():
+    """Creating a client makes no network calls"""
+    adapter = StubAdapter()
+    client = _client("good", adapter)
+    assert adapter.paths == []
+    assert client.time_get_current_time() == {"timezone": "Etc/UTC"}
+    assert adapter.paths == ["/time/get_current_time"]
+    assert client.authenticated
+
+
+def test_rejected_token_raises_typed_error():
+    """A 401 on any call raises MCPAuthenticationError"""
+    client = _client("bad", StubAdapter())
+    with pytest.raises(MCPAuthenticationError):
+        client.fs_list_allowed_directories()
+    assert not client.authenticated
+
+
+def test_auth_cache_skips_eager_probe():
+    """A fresh cache entry lets eager clients skip the probe"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "auth.json")
+
+        first = StubAdapter()
+        _client("good", first, eager_auth=True, auth_cache=cache_path)
+        assert first.paths == ["/time/get_current_time"]
+        assert "good" not in open(cache_path).read()
+
+        second = StubAdapter()
+        client = _client("good", second, eager_auth=True, auth_cache=cache_path)
+        assert second.paths == []
+        assert client.authenticated
+
+        expired = StubAdapter()
+        _client("good", expired, eager_auth=True, auth_cache=cache_path, auth_cache_ttl=0)
+        assert expired.paths == ["/time/get_current_time"]
+
+        with pytest.raises(MCPAuthenticationError):
+            _client("bad", StubAdapter(), eager_auth=True, auth_cache=cache_path)
+
+
+def test_local_answers_do_not_verify_the_token():
+    """Time tools answered in-process never mark a rejected token as verified"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "auth.json")
+        adapter = StubAdapter()
+        client = _client("bad", adapter, auth_cache=cache_path, local_time=LocalTimeEngine(verify_rate=0))
+        assert client.time_get_current_time("Europe/London")["timezone"] == "Europe/London"
+        assert adapter.paths == [] and not client.authenticated
+        assert not client.auth_cache.is_verified("http://proxy.test", "bad")
+
+        with pytest.raises(MCPAuthenticationError):
+            _client("bad", StubAdapter(), eager_auth=True, auth_cache=cache_path)
+
+
+def test_pipe_streams_ndjson_results():
+    """pipe mode answers every NDJSON line, in input or completion order"""
+    with FakeProxy(token="good") as proxy:
+        client = MCPAuthenticatedClient(proxy.url, token="good")
+        lines = [
+            '{"tool": "time_get_current_time", "args": {"timezone": "Asia/Tokyo"}}',
+            "",
+            '{"tool": "fs_read_text_file", "args": {"path": "missing.txt"}}',
+            "not json",
+        ] + ['{"tool": "time_get_current_time", "args": {}}'] * 20
+        for ordered in (True, False):
+            out = io.StringIO()
+            assert run_pipe(client, lines, out, concurrency=4, ordered=ordered) == (23, 2)
+            results = [json.loads(line) for line in out.getvalue().splitlines()]
+            assert sorted(r["index"] for r in results) == list(range(23))
+            by_index = {r["index"]: r for r in results}
+            assert by_index[0]["result"]["timezone"] == "Asia/Tokyo"
+            assert "500" in by_index[1]["error"] and by_index[2]["error"].startswith("Invalid call")
+            if ordered:
+                assert [r["index"] for r in results] == list(range(23))
+
+
+def main():
+    """Run all tests"""
+    test_construction_does_not_probe()
+    test_rejected_token_raises_typed_error()
+    test_auth_cache_skips_eager_probe()
+    test_local_answers_do_not_verify_the_token()
+    test_pipe_streams_ndjson_results()
+    print("✅ All authenticated client tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for batch execution of MCP tool calls
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import threading
+import time
+
+from mcp_batch import run_batch, stream_batch
+from mcp_proxy_client import MCPProxyClient
+
+
+class FakeClient:
+    """Tool methods that sleep, fail or raise, and track concurrency"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def fs_read_text_file(self, path: str, delay: float = 0.01):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(delay)
+        with self.lock:
+            self.active -= 1
+        return {"content": f"contents of {path}"}
+
+    def memory_open_nodes(self, names):
+        return {"error": "500 Server Error", "detail": {"names": names}}
+
+    def time_get_current_time(self, timezone: str = "Etc/UTC"):
+        raise RuntimeError("boom")
+
+
+def test_batch_keeps_order_and_bounds_concurrency():
+    """Results come back in input order with at most max_workers in flight"""
+    client = FakeClient()
+    calls = [("fs_read_text_file", {"path": f"/f{i}"}) for i in range(40)]
+    calls.append({"tool": "memory_open_nodes", "args": {"names": ["a"]}})
+    results = run_batch(client, calls, max_workers=4)
+
+    assert [r.index for r in results] == list(range(41))
+    assert results[7].result == {"content": "contents of /f7"}
+    assert results[7].ok and results[7].elapsed > 0
+    assert results[40].error == "500 Server Error"
+    assert 1 < client.peak <= 4
+
+
+def test_batch_reports_per_item_errors():
+    """Exceptions and bad calls are captured per item"""
+    results = run_batch(FakeClient(), [
+        ("time_get_current_time", {}),
+        ("_make_request", {}),
+        {"args": {}},
+    ])
+    assert results[0].error == "RuntimeError: boom"
+    assert results[1].error == "ValueError: Unknown tool: _make_request"
+    assert results[2].error.startswith("Invalid call")
+
+
+def test_stream_yields_in_completion_order_from_generator():
+    """The streaming variant consumes generators and yields fastest first"""
+    calls = (("fs_read_text_file", {"path": p, "delay": d}) for p, d in [("slow", 0.2), ("fast", 0.0)])
+    results = list(stream_batch(FakeClient(), calls, max_workers=2))
+    assert [r.args["path"] for r in results] == ["fast", "slow"]
+
+
+def test_ordered_stream_keeps_input_order_within_window():
+    """Ordered streams yield in input order without racing ahead unboundedly"""
+    client = FakeClient()
+    delays = [0.15] + [0.0] * 30
+    calls = ('{"tool": "fs_read_text_file", "args": {"path": "/f%d", "delay": %s}}' % (i, d)
+             for i, d in enumerate(delays))
+    started = time.perf_counter()
+    first = None
+    indexes = []
+    for result in stream_batch(client, calls, max_workers=2, ordered=True):
+        first = first or time.perf_counter() - started
+        indexes.append(result.index)
+    assert indexes == list(range(31))
+    assert first >= 0.15
+    assert all(r.ok for r in run_batch(client, ['{"tool": "fs_read_text_file", "args": {"path": "/x"}}']))
+    assert run_batch(client, ["{not json"])[0].error.startswith("Invalid call")
+
+
+def test_client_batch_method():
+    """Clients expose batch() over their own tool methods"""
+    client = MCPProxyClient("http://127.0.0.1:9")
+    results = client.batch([("fs_read_text_file", {"path": "/x"})], max_workers=1)
+    assert results[0].tool == "fs_read_text_file"
+    assert not results[0].ok
+
+
+def main():
+    """Run all tests"""
+    test_batch_keeps_order_and_bounds_concurrency()
+    test_batch_reports_per_item_errors()
+    test_stream_yields_in_completion_order_from_generator()
+    test_ordered_stream_keeps_input_order_within_window()
+    test_client_batch_method()
+    print("✅ All batch tests passed")
+
+if __name__ == "__main__":
+    main()
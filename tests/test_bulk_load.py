@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for chunked, concurrent bulk loading into the knowledge graph
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import csv
+import json
+import tempfile
+
+from mcp_bulk_load import BulkLoader, load_checkpoint, read_records
+from mcp_fake_proxy import FakeProxy
+from mcp_proxy_client import MCPProxyClient
+
+
+def _write_ndjson(path: str, records: list) -> None:
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+class _WriteOrder:
+    """Transport observer checking that relations only reference entities already created"""
+
+    def __init__(self):
+        self.created = set()
+        self.early = []
+
+    def observe(self, endpoint, data, result):
+        if endpoint == "/memory/create_entities":
+            self.created.update(entity["name"] for entity in data["entities"])
+        elif endpoint == "/memory/create_relations":
+            self.early.extend(r for r in data["relations"] if not {r["from"], r["to"]} <= self.created)
+
+
+def test_dedupes_orders_relations_and_chunks():
+    """Existing data is skipped, relations wait for their entities, chunks respect both limits"""
+    with FakeProxy(server_latency={"memory": 0.01}) as proxy, tempfile.TemporaryDirectory() as tmp:
+        client = MCPProxyClient(proxy.url)
+        order = _WriteOrder()
+        client.transport.add_observer(order)
+        client.memory_create_entities([{"name": "E0", "entityType": "Node", "observations": ["seen"]}])
+        records = [{"type": "relation", "from": f"E{i}", "to": f"E{(i + 1) % 300}", "relationType": "next"}
+                   for i in range(300)]
+        records += [{"type": "entity", "name": f"E{i}", "entityType": "Node", "observations": ["seen", f"obs {i}"]}
+                    for i in range(300)]
+        records += [{"type": "entity", "name": "E5", "entityType": "Node", "observations": ["obs 5"]},
+                    {"entityName": "E7", "contents": ["obs 7", "later"]},
+                    {"from": "E1", "to": "Nowhere", "relationType": "dangling"}]
+        path = os.path.join(tmp, "graph.ndjson")
+        _write_ndjson(path, records)
+
+        loader = BulkLoader(client, max_items=64, max_bytes=2048, max_workers=4)
+        totals = loader.run(read_records(path))
+        assert totals["entity"] == 299 and totals["relation"] == 300
+        assert totals["observation"] == 2 and totals["duplicates"] == 1 and totals["blocked"] == 1
+        assert all(c["ok"] and c["items"] <= 64 and c["bytes"] <= 2048 for c in loader.chunks)
+        assert order.early == [] and len(order.created) == 300
+        assert client.transport.observers == [order]
+
+        graph = client.memory_read_graph()
+        entities = {e["name"]: e for e in graph["entities"]}
+        assert len(entities) == 300 and len(graph["relations"]) == 300
+        assert entities["E0"]["observations"] == ["seen", "obs 0"]
+        assert entities["E7"]["observations"] == ["seen", "obs 7", "later"]
+
+
+def test_csv_input_and_resume_after_failures():
+    """Failed chunks hold the checkpoint back; the next run skips what was done and finishes"""
+    with FakeProxy() as proxy, tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, ["type", "name", "entityType", "observations", "from", "to", "relationType"])
+            writer.writeheader()
+            for i in range(200):
+                writer.writerow({"type": "entity", "name": f"N{i}", "entityType": "Row",
+                                 "observations": f"first {i}|second {i}"})
+            for i in range(199):
+                writer.writerow({"type": "relation", "from": f"N{i}", "to": f"N{i + 1}", "relationType": "follows"})
+        checkpoint = os.path.join(tmp, "load.checkpoint.json")
+        client = MCPProxyClient(proxy.url)
+
+        def fail_after_first(report):
+            proxy.error_rate = 1.0
+
+        first = BulkLoader(client, max_items=20, max_workers=1, max_pending=1, checkpoint=checkpoint,
+                           progress=fail_after_first).run(read_records(path))
+        assert first["failed"] > 0 and first["entity"] >= 20
+        done = load_checkpoint(checkpoint)["records_done"]
+        assert 20 <= done < 399
+
+        proxy.error_rate = 0.0
+        second = BulkLoader(client, max_items=20, checkpoint=checkpoint).run(read_records(path))
+        assert second["resumed"] == done and second["failed"] == 0 and second["blocked"] == 0
+        assert load_checkpoint(checkpoint)["records_done"] == 399
+
+        graph = client.memory_read_graph()
+        assert len(graph["entities"]) == 200 and len(graph["relations"]) == 199
+        assert graph["entities"][0]["observations"] == ["first 0", "second 0"]
+
+
+def main():
+    """Run all tests"""
+    test_dedupes_orders_relations_and_chunks()
+    test_csv_input_and_resume_after_failures()
+    print("✅ All bulk load tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the MCP response cache
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import tempfile
+import time
+
+from mcp_cache import ResponseCache, canonical_key
+from mcp_transport import MCPTransport
+
+
+class CountingTransport(MCPTransport):
+    """Transport whose round trips are answered locally and counted"""
+
+    def __init__(self, cache):
+        super().__init__("http://proxy.test", cache=cache)
+        self.sent = []
+
+    def _send(self, method, endpoint, data=None):
+        self.sent.append(endpoint)
+        return {"endpoint": endpoint, "data": data, "n": len(self.sent)}
+
+
+def test_key_is_canonical():
+    """Key order and whitespace in the body do not matter"""
+    assert canonical_key("/memory/open_nodes", {"a": 1, "b": [2]}) == \
+        canonical_key("/memory/open_nodes", {"b": [2], "a": 1})
+
+
+def test_hits_are_fresh_copies_and_expire():
+    """Hits return independent objects until the TTL runs out"""
+    cache = ResponseCache(ttls={"/memory/read_graph": 0.05})
+    cache.put("/memory/read_graph", None, {"entities": []})
+    first = cache.get("/memory/read_graph", None)
+    first["entities"].append("mutated")
+    assert cache.get("/memory/read_graph", None) == {"entities": []}
+    time.sleep(0.06)
+    assert cache.get("/memory/read_graph", None) is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_lru_byte_bound():
+    """The least recently used entries are evicted past max_bytes"""
+    cache = ResponseCache(ttls={"/filesystem/get_file_info": 60}, max_bytes=130)
+    for name in ("a", "b", "c"):
+        cache.put("/filesystem/get_file_info", {"path": name}, {"size": "x" * 30})
+    cache.get("/filesystem/get_file_info", {"path": "a"})
+    cache.put("/filesystem/get_file_info", {"path": "d"}, {"size": "x" * 30})
+    assert cache.size <= 130
+    assert cache.get("/filesystem/get_file_info", {"path": "b"}) is None
+    assert cache.get("/filesystem/get_file_info", {"path": "a"}) is not None
+
+
+def test_transport_caches_and_invalidates_on_mutation():
+    """Mutating calls drop cached responses from the same server only"""
+    transport = CountingTransport(ResponseCache())
+    transport.request("POST", "/memory/read_graph")
+    transport.request("POST", "/memory/read_graph")
+    transport.request("POST", "/time/convert_time", {"time": "14:30"})
+    assert transport.sent == ["/memory/read_graph", "/time/convert_time"]
+
+    transport.request("POST", "/memory/create_entities", {"entities": []})
+    transport.request("POST", "/memory/read_graph")
+    transport.request("POST", "/time/convert_time", {"time": "14:30"})
+    assert transport.sent[-2:] == ["/memory/create_entities", "/memory/read_graph"]
+
+    transport.request("POST", "/memory/search_nodes", {"query": "x"})
+    transport.request("POST", "/memory/search_nodes", {"query": "x"})
+    assert transport.sent.count("/memory/search_nodes") == 2
+
+
+def test_persistence_round_trip():
+    """Entries saved to disk are reloaded by a new cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.json")
+        cache = ResponseCache(path=path)
+        cache.put("/filesystem/list_allowed_directories", None, ["/srv"])
+        cache.save()
+        reloaded = ResponseCache(path=path)
+        assert reloaded.get("/filesystem/list_allowed_directories", None) == ["/srv"]
+
+
+def main():
+    """Run all tests"""
+    test_key_is_canonical()
+    test_hits_are_fresh_copies_and_expire()
+    test_lru_byte_bound()
+    test_transport_caches_and_invalidates_on_mutation()
+    test_persistence_round_trip()
+    print("✅ All cache tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for recording proxy traffic to cassettes and replaying it
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import gzip
+import tempfile
+import time
+
+import requests
+from mcp_cassette import CassetteRecorder, RecordingProxy, ReplayServer, play, read_cassette
+from mcp_fake_proxy import FakeProxy
+from mcp_proxy_client import MCPProxyClient
+
+
+def _record_session(path: str) -> None:
+    """A short burst of memory and filesystem calls through a recording client"""
+    with FakeProxy(server_latency={"memory": 0.05}) as proxy, CassetteRecorder(path, proxy.url) as recorder:
+        client = MCPProxyClient(proxy.url, recorder=recorder)
+        client.memory_create_entities([{"name": "Cassette", "entityType": "Test", "observations": []}])
+        client.memory_read_graph()
+        client.memory_read_graph()
+        client.fs_list_allowed_directories()
+        client.fs_read_text_file(os.path.join(proxy.root, "missing.txt"))
+
+
+def test_client_recording_keeps_order_timing_and_errors():
+    """Every round trip is recorded with its status, body and duration"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.jsonl.gz")
+        _record_session(path)
+        header, records = read_cassette(path)
+        assert header["cassette"] == 1
+        assert [r["e"] for r in records] == ["/memory/create_entities", "/memory/read_graph", "/memory/read_graph",
+                                             "/filesystem/list_allowed_directories", "/filesystem/read_text_file"]
+        assert records[1]["d"] >= 0.05 and records[1]["t"] >= records[0]["t"] + records[0]["d"]
+        assert records[-1]["s"] == 500 and "ENOENT" in records[-1]["b"]
+
+
+def test_replay_server_at_original_speed_and_full_speed():
+    """Recorded responses come back in order, slowly or immediately"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.jsonl")
+        _record_session(path)
+        for speed, slow in ((1.0, True), (0, False)):
+            with ReplayServer(path, speed=speed) as replay:
+                client = MCPProxyClient(replay.url)
+                start = time.perf_counter()
+                graph = client.memory_read_graph()
+                elapsed = time.perf_counter() - start
+                assert graph["entities"][0]["name"] == "Cassette"
+                assert (elapsed >= 0.05) == slow
+                missing = requests.post(f"{replay.url}/memory/search_nodes", json={"query": "x"})
+                assert missing.status_code == 404 and replay.stats["unmatched"] == 1
+
+
+def test_recording_proxy_and_traffic_playback():
+    """A recording reverse proxy captures a session that plays back against its replay"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "webui.jsonl.gz")
+        with FakeProxy(token="secret") as proxy, RecordingProxy(proxy.url, path) as recording:
+            client = MCPProxyClient(recording.url, token="secret")
+            assert client.time_get_current_time("UTC")["timezone"] == "UTC"
+            client.memory_read_graph()
+            assert requests.get(f"{recording.url}/openapi.json").status_code == 200
+        _, records = read_cassette(path)
+        assert [r["e"] for r in records] == ["/time/get_current_time", "/memory/read_graph", "/openapi.json"]
+        with gzip.open(path, "rt") as f:
+            assert "secret" not in f.read()
+
+        with ReplayServer(path, speed=0) as replay:
+            summary = play(records, replay.url, speed=0)
+        assert summary["requests"] == 3 and summary["mismatched"] == []
+        assert set(summary["endpoints"]) == {"/time/get_current_time", "/memory/read_graph", "/openapi.json"}
+
+
+def main():
+    """Run all tests"""
+    test_client_recording_keeps_order_timing_and_errors()
+    test_replay_server_at_original_speed_and_full_speed()
+    test_recording_proxy_and_traffic_playback()
+    print("✅ All cassette tests passed")
+
+if __name__ == "__main__":
+    main()
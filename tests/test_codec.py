@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable JSON codecs
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pytest
+import requests
+from mcp_codec import JSONCodec, available_codecs, get_codec
+from mcp_transport import MCPTransport
+
+PAYLOAD = {"entities": [{"name": "Café \"MCP\" → \\path", "observations": ["a", 1, 2.5, True, None]}]}
+
+
+def test_every_codec_round_trips():
+    """All installed codecs agree with each other and with stdlib json"""
+    stdlib = JSONCodec()
+    for codec in available_codecs().values():
+        assert codec.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+        assert stdlib.loads(codec.dumps(PAYLOAD)) == PAYLOAD
+        assert codec.loads(stdlib.dumps(PAYLOAD)) == PAYLOAD
+
+
+def test_selection():
+    """The default is the fastest codec; names and the env var select one"""
+    assert get_codec().name == next(iter(available_codecs()))
+    assert get_codec("json").name == "json"
+    with pytest.raises(ValueError):
+        get_codec("simdjson-not-installed")
+    assert MCPTransport("http://proxy.test", codec="json").codec.name == "json"
+
+
+def test_invalid_json_is_a_request_exception():
+    """Decode failures surface as requests.InvalidJSONError for the clients"""
+    transport = MCPTransport("http://proxy.test")
+    response = requests.Response()
+    response.url = "http://proxy.test/memory/read_graph"
+    with pytest.raises(requests.exceptions.InvalidJSONError):
+        transport._decode(response, b"{not json")
+
+
+def main():
+    """Run all tests"""
+    test_every_codec_round_trips()
+    test_selection()
+    test_invalid_json_is_a_request_exception()
+    print("✅ All codec tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for gzip request/response compression against the fake proxy
+"""
+
+import sys
+import os
+import requests
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mcp_fake_proxy import FakeProxy
+from mcp_proxy_client import MCPProxyClient
+from mcp_transport import MCPTransport
+
+CONTENT = "def handler(request):\n    return {'status': 'ok'}\n" * 2000
+
+
+def test_large_bodies_are_compressed_both_ways():
+    """Big writes go up gzipped and big reads come back gzipped"""
+    with FakeProxy() as proxy:
+        client = MCPProxyClient(proxy.url, compress_min_bytes=1024)
+        path = os.path.join(proxy.root, "handler.py")
+        client.fs_write_file(path, CONTENT)
+        assert proxy.stats["bytes_in"] < len(CONTENT) / 10
+
+        assert client.fs_read_text_file(path) == CONTENT
+        assert proxy.stats["bytes_out"] < len(CONTENT) / 10
+
+
+def test_opt_out_stays_plain():
+    """With compression off both directions travel uncompressed"""
+    with FakeProxy() as proxy:
+        path = os.path.join(proxy.root, "handler.py")
+        transport = MCPTransport(proxy.url, accept_gzip=False)
+        transport.request("POST", "/filesystem/write_file", {"path": path, "content": CONTENT})
+        assert proxy.stats["bytes_in"] > len(CONTENT)
+        before = proxy.stats["bytes_out"]
+        transport.request("POST", "/filesystem/read_text_file", {"path": path})
+        assert proxy.stats["bytes_out"] - before > len(CONTENT)
+
+
+def test_falls_back_when_proxy_rejects_gzip_bodies():
+    """A 415 for a compressed body re-sends it plain and stops compressing"""
+    with FakeProxy(gzip_requests=False) as proxy:
+        transport = MCPTransport(proxy.url, compress_min_bytes=1024)
+        path = os.path.join(proxy.root, "handler.py")
+        result = transport.request("POST", "/filesystem/write_file", {"path": path, "content": CONTENT})
+        assert result.startswith("Successfully wrote")
+        assert transport.compress_min_bytes is None
+        assert proxy.stats["requests"] == 2
+
+
+def test_malformed_gzip_body_gets_400():
+    """A body that claims gzip but is not gets an error reply, not a dropped connection"""
+    with FakeProxy() as proxy:
+        for body in (b"not gzip", b"\x1f\x8b\x08\x00"):
+            response = requests.post(f"{proxy.url}/time/get_current_time", data=body, timeout=5,
+                                     headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+            assert response.status_code == 400
+
+
+def main():
+    """Run all tests"""
+    test_large_bodies_are_compressed_both_ways()
+    test_opt_out_stays_plain()
+    test_falls_back_when_proxy_rejects_gzip_bodies()
+    test_malformed_gzip_body_gets_400()
+    print("✅ All compression tests passed")
+
+if __name__ == "__main__":
+    main()
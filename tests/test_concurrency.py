@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for adaptive per-server concurrency limits
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from concurrent.futures import ThreadPoolExecutor
+
+from mcp_concurrency import AIMD, GRADIENT, AdaptiveConcurrency, ConcurrencyLimit, ConcurrencyLimitExceeded
+from mcp_fake_proxy import FakeProxy
+from mcp_metrics import ClientMetrics
+from mcp_proxy_client import MCPProxyClient
+from mcp_resilience import HALF_OPEN, CircuitBreakers
+
+
+def test_aimd_grows_when_busy_and_backs_off_on_failures():
+    """Additive increase while the limit is in use, multiplicative decrease on drops"""
+    limit = ConcurrencyLimit(AIMD, initial_limit=2, max_limit=8)
+    for _ in range(40):
+        limit.acquire()
+        limit.acquire()
+        limit.release(0.01)
+        limit.release(0.01)
+    grown = limit.limit
+    assert grown > 4
+    limit.acquire()
+    limit.release(0.01, dropped=True)
+    assert limit.limit < grown and limit.snapshot()["dropped"] == 1
+
+
+def test_gradient_shrinks_as_latency_rises_and_queue_rejects():
+    """Rising latency pulls the limit down; a full queue rejects without waiting"""
+    limit = ConcurrencyLimit(GRADIENT, initial_limit=16, max_queue=0)
+    for latency in [0.01] * 20 + [0.1] * 40:
+        limit.acquire()
+        limit.release(latency)
+    assert limit.limit < 8
+    for _ in range(int(limit.limit)):
+        limit.acquire()
+    try:
+        limit.acquire("/memory")
+        assert False, "expected a full queue"
+    except ConcurrencyLimitExceeded as e:
+        assert "/memory" in str(e) and limit.snapshot()["rejected"] == 1
+
+
+def test_client_queues_calls_over_the_limit_per_server():
+    """Concurrent callers wait in the client and the backend never sees more than the limit"""
+    concurrency = AdaptiveConcurrency(AIMD, initial_limit=2, max_limit=2)
+    metrics = ClientMetrics()
+    with FakeProxy(server_latency={"memory": 0.05}, backend_concurrency=1) as proxy:
+        client = MCPProxyClient(proxy.url, metrics=metrics, concurrency=concurrency)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: client.memory_read_graph(), range(16)))
+        client.time_get_current_time("UTC")
+
+    stats = concurrency.snapshot()
+    assert set(stats) == {"/memory", "/time"}
+    assert stats["/memory"]["peak_in_flight"] <= 2 and stats["/memory"]["peak_queued"] > 0
+    assert stats["/memory"]["completed"] == 16 and stats["/memory"]["in_flight"] == 0
+    assert metrics.snapshot()["concurrency"]["/memory"]["queue_seconds"] > 0
+    text = metrics.to_prometheus()
+    assert 'mcp_client_concurrency_limit{server="/memory"} 2' in text
+    assert 'mcp_client_concurrency_queue_depth{server="/time"} 0' in text
+
+
+def test_queue_rejections_leave_the_breaker_alone():
+    """A call rejected in the client neither closes a half-open breaker nor counts as an HTTP error"""
+    concurrency = AdaptiveConcurrency(AIMD, initial_limit=1, max_limit=1, max_queue=0)
+    breakers = CircuitBreakers(failure_threshold=1, reset_timeout=0)
+    metrics = ClientMetrics()
+    with FakeProxy() as proxy:
+        client = MCPProxyClient(proxy.url, breakers=breakers, concurrency=concurrency, metrics=metrics)
+        breaker = breakers.for_endpoint("/memory/read_graph")
+        breaker.record_failure()
+        limit = concurrency.for_endpoint("/memory/read_graph")
+        limit.acquire()
+        assert "Client queue" in client.memory_read_graph()["error"]
+        assert breaker.state == HALF_OPEN and breaker.failures == 1
+        assert "/memory/read_graph" not in metrics.snapshot().get("endpoints", {})
+        limit.release(0.01, False)
+
+        # The probe slot was handed back, so the next call can close the breaker
+        assert "entities" in client.memory_read_graph()
+        assert breaker.snapshot()["state"] == "closed"
+
+
+def main():
+    """Run all tests"""
+    test_aimd_grows_when_busy_and_backs_off_on_failures()
+    test_gradient_shrinks_as_latency_rises_and_queue_rejects()
+    test_client_queues_calls_over_the_limit_per_server()
+    test_queue_rejections_leave_the_breaker_alone()
+    print("✅ All concurrency tests passed")
+
+if __name__ == "__main__":
+    main()
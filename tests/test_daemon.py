@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the Unix-socket CLI daemon against the fake proxy
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import json
+import socket
+import stat
+import subprocess
+import tempfile
+import threading
+
+import pytest
+from mcp_authenticated_client import MCPAuthenticatedClient, run_command
+from mcp_daemon import MCPDaemon, forward, identity, request
+from mcp_fake_proxy import FakeProxy
+
+CLI = os.path.join(os.path.dirname(__file__), '..', 'src', 'mcp_authenticated_client.py')
+
+
+def _serve(daemon: MCPDaemon) -> threading.Thread:
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_commands_run_in_the_daemon():
+    """Forwarded commands reuse the daemon's client and its connection"""
+    with FakeProxy(token="secret") as proxy, tempfile.TemporaryDirectory() as tmp:
+        client = MCPAuthenticatedClient(proxy.url, token="secret")
+        path = os.path.join(tmp, "mcp.sock")
+        thread = _serve(MCPDaemon(lambda argv: run_command(client, argv), path))
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        status, output = forward(["time_now", "Europe/London"], path)
+        assert status == 0 and json.loads(output)["timezone"] == "Europe/London"
+        assert forward(["fs_read"], path) == (0, "Usage: fs_read <path>")
+        assert request("status", path)["commands"] == 2
+
+        assert request("stop", path) == {"stopping": True}
+        thread.join(5)
+        assert not os.path.exists(path)
+        assert forward(["time_now"], path) is None
+
+
+def test_cli_forwards_to_running_daemon():
+    """The CLI prints the daemon's answer, unless the daemon uses another proxy or token"""
+    with FakeProxy(token="secret") as proxy, tempfile.TemporaryDirectory() as tmp:
+        client = MCPAuthenticatedClient(proxy.url, token="secret")
+        path = os.path.join(tmp, "mcp.sock")
+        daemon = MCPDaemon(lambda argv: run_command(client, argv), path, identity=identity(proxy.url, "secret"))
+        _serve(daemon)
+        try:
+            env = dict(os.environ, MCP_DAEMON_SOCKET=path, MCP_BASE_URL=proxy.url, MCP_API_TOKEN="secret")
+            done = subprocess.run([sys.executable, CLI, "time_now", "Asia/Tokyo"], env=env,
+                                  capture_output=True, text=True, timeout=30)
+            assert done.returncode == 0
+            assert json.loads(done.stdout)["timezone"] == "Asia/Tokyo"
+            assert request("status", path)["commands"] == 1
+
+            # A different token runs in-process, where the proxy rejects it
+            env["MCP_API_TOKEN"] = "other"
+            done = subprocess.run([sys.executable, CLI, "time_now", "Asia/Tokyo"], env=env,
+                                  capture_output=True, text=True, timeout=30)
+            assert done.returncode == 1 and "Authentication failed" in done.stdout
+            assert forward(["time_now"], path, identity(proxy.url + "/other", "secret")) is None
+            status = request("status", path)
+            assert status["commands"] == 1 and status["refused"] == 2
+        finally:
+            request("stop", path)
+
+
+def test_stale_socket_is_replaced_and_live_one_refused():
+    """A leftover socket file is cleaned up; a second daemon is refused"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mcp.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+
+        first = MCPDaemon(lambda argv: (0, "first"), path)
+        _serve(first)
+        try:
+            with pytest.raises(RuntimeError):
+                MCPDaemon(lambda argv: (0, "second"), path).start()
+            assert forward(["anything"], path) == (0, "first")
+        finally:
+            request("stop", path)
+
+        # Any socket error means "no daemon": here the path is too long to connect to
+        assert forward(["anything"], os.path.join(tmp, "x" * 200, "mcp.sock")) is None
+        assert request("status", os.path.join(tmp, "x" * 200, "mcp.sock")) is None
+
+
+def test_only_private_sockets_owned_by_this_user_are_trusted():
+    """Commands are not sent to a socket others can reach or to a non-socket path"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mcp.sock")
+        _serve(MCPDaemon(lambda argv: (0, "daemon"), path))
+        try:
+            os.chmod(path, 0o666)
+            assert forward(["anything"], path) is None
+            assert request("status", path) is None
+            os.chmod(path, 0o600)
+            assert forward(["anything"], path) == (0, "daemon")
+            if os.getuid() == 0:
+                os.chown(path, 65534, -1)
+                assert forward(["anything"], path) is None
+                os.chown(path, 0, -1)
+        finally:
+            request("stop", path)
+
+        plain = os.path.join(tmp, "plain")
+        with open(plain, "w"):
+            pass
+        os.chmod(plain, 0o600)
+        assert forward(["anything"], plain) is None
+
+
+def main():
+    """Run all tests"""
+    test_commands_run_in_the_daemon()
+    test_cli_forwards_to_running_daemon()
+    test_stale_socket_is_replaced_and_live_one_refused()
+    test_only_private_sockets_owned_by_this_user_are_trusted()
+    print("✅ All daemon tests passed")
+
+if __name__ == "__main__":
+    main()
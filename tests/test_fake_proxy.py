@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the local fake MCP proxy: payload shapes, errors and fault injection
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import time
+
+import requests
+from mcp_fake_proxy import FakeProxy
+
+
+def _post(proxy: FakeProxy, route: str, body, token: str = None) -> requests.Response:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    return requests.post(proxy.url + route, json=body, headers=headers, timeout=10)
+
+
+def test_time_payloads():
+    """Time routes answer with the mcp-server-time shapes"""
+    with FakeProxy() as proxy:
+        now = _post(proxy, "/time/get_current_time", {"timezone": "Europe/London"}).json()
+        assert set(now) == {"timezone", "datetime", "is_dst"} and now["timezone"] == "Europe/London"
+
+        converted = _post(proxy, "/time/convert_time", {"source_timezone": "UTC", "time": "12:00",
+                                                        "target_timezone": "Asia/Kolkata"}).json()
+        assert converted["target"]["datetime"].endswith("T17:30:00+05:30")
+        assert converted["time_difference"] == "+5.5h"
+
+        bad = _post(proxy, "/time/get_current_time", {"timezone": "Mars/Olympus"})
+        assert bad.status_code == 500 and "Invalid timezone" in bad.json()["detail"]["message"]
+
+
+def test_memory_graph():
+    """Entities and relations round-trip; search and open return subgraphs"""
+    with FakeProxy() as proxy:
+        _post(proxy, "/memory/create_entities", {"entities": [
+            {"name": "Alice", "entityType": "Person", "observations": ["writes Rust"]},
+            {"name": "Ferris", "entityType": "Mascot", "observations": []}]})
+        _post(proxy, "/memory/create_relations", {"relations": [
+            {"from": "Alice", "to": "Ferris", "relationType": "likes"}]})
+        added = _post(proxy, "/memory/add_observations", {"observations": [
+            {"entityName": "Alice", "contents": ["writes Rust", "likes crabs"]}]}).json()
+        assert added == [{"entityName": "Alice", "addedObservations": ["likes crabs"]}]
+
+        found = _post(proxy, "/memory/search_nodes", {"query": "rust"}).json()
+        assert [e["name"] for e in found["entities"]] == ["Alice"] and found["relations"] == []
+        opened = _post(proxy, "/memory/open_nodes", {"names": ["Alice", "Ferris"]}).json()
+        assert opened["relations"][0]["relationType"] == "likes"
+
+        assert _post(proxy, "/memory/delete_entities", {"entityNames": ["Ferris"]}).json() == \
+            "Entities deleted successfully"
+        graph = _post(proxy, "/memory/read_graph", {}).json()
+        assert [e["name"] for e in graph["entities"]] == ["Alice"] and graph["relations"] == []
+
+        proxy.populate_graph(50)
+        assert len(_post(proxy, "/memory/read_graph", {}).json()["entities"]) == 51
+
+
+def test_filesystem_routes():
+    """Listings, trees and edits behave like the filesystem server, inside the root only"""
+    with FakeProxy() as proxy:
+        root = proxy.root
+        _post(proxy, "/filesystem/create_directory", {"path": f"{root}/src"})
+        _post(proxy, "/filesystem/write_file", {"path": f"{root}/src/app.py", "content": "x = 1\n"})
+        assert _post(proxy, "/filesystem/list_directory", {"path": root}).json() == "[DIR] src"
+
+        tree = _post(proxy, "/filesystem/directory_tree", {"path": root}).json()
+        assert tree == [{"name": "src", "type": "directory", "children": [{"name": "app.py", "type": "file"}]}]
+
+        diff = _post(proxy, "/filesystem/edit_file", {"path": f"{root}/src/app.py",
+                                                      "edits": [{"oldText": "x = 1", "newText": "x = 2"}]}).json()
+        assert diff.startswith("```diff") and "+x = 2" in diff
+        assert _post(proxy, "/filesystem/read_text_file", {"path": f"{root}/src/app.py"}).json() == "x = 2\n"
+
+        denied = _post(proxy, "/filesystem/read_text_file", {"path": "/etc/passwd"})
+        assert denied.status_code == 500 and "Access denied" in denied.json()["detail"]["message"]
+
+
+def test_fetch_truncates_like_the_fetch_server():
+    """Pages are cut at max_length with a pointer to the next start_index"""
+    with FakeProxy(fetch_bytes=1000) as proxy:
+        page = _post(proxy, "/fetch/fetch", {"url": "https://example.org/big", "max_length": 300}).json()
+        assert page.startswith("Contents of https://example.org/big:\n")
+        assert "start_index of 300" in page
+        again = _post(proxy, "/fetch/fetch", {"url": "https://example.org/big", "max_length": 300}).json()
+        assert again == page
+
+
+def test_auth_and_validation_errors():
+    """Wrong tokens get 401; missing arguments get a pydantic-style 422"""
+    with FakeProxy(token="secret") as proxy:
+        assert _post(proxy, "/time/get_current_time", {"timezone": "UTC"}).status_code == 401
+        assert _post(proxy, "/time/get_current_time", {"timezone": "UTC"}, token="wrong").status_code == 401
+        missing = _post(proxy, "/time/convert_time", {"time": "10:00"}, token="secret")
+        assert missing.status_code == 422
+        assert [d["loc"][1] for d in missing.json()["detail"]] == ["source_timezone", "target_timezone"]
+
+
+def test_fault_injection():
+    """Latency is added per call and failures follow the error rate"""
+    with FakeProxy(latency=0.05, error_rate=1.0, error_status=502, seed=7) as proxy:
+        started = time.perf_counter()
+        response = _post(proxy, "/time/get_current_time", {"timezone": "UTC"})
+        assert time.perf_counter() - started >= 0.05
+        assert response.status_code == 502 and proxy.stats["injected_errors"] == 1
+
+    outcomes = []
+    for _ in range(2):
+        with FakeProxy(error_rate=0.5, seed=42) as proxy:
+            outcomes.append([_post(proxy, "/memory/read_graph", {}).status_code for _ in range(20)])
+    assert outcomes[0] == outcomes[1] and {200, 503} == set(outcomes[0])
+
+
+def main():
+    """Run all tests"""
+    test_time_payloads()
+    test_memory_graph()
+    test_filesystem_routes()
+    test_fetch_truncates_like_the_fetch_server()
+    test_auth_and_validation_errors()
+    test_fault_injection()
+    print("✅ All fake proxy tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the client-side indexed knowledge graph mirror
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import threading
+import time
+
+from mcp_fake_proxy import FakeProxy
+from mcp_graph_mirror import GraphMirror, relation_key
+from mcp_proxy_client import MCPProxyClient
+
+
+def _same_graph(mirror: GraphMirror, graph: dict) -> bool:
+    """Mirror content equals a read_graph result, ignoring order"""
+    return (mirror.entities == {e["name"]: e for e in graph["entities"]}
+            and set(mirror.relations) == {relation_key(r) for r in graph["relations"]})
+
+
+def test_indexes_and_local_queries_match_the_server():
+    """Name, type and relation indexes, adjacency, and open/search parity"""
+    with FakeProxy() as proxy:
+        proxy.populate_graph(60)
+        client = MCPProxyClient(proxy.url)
+        mirror = GraphMirror(client, refresh_interval=None)
+        graph = client.memory_read_graph()
+        assert _same_graph(mirror, graph) and len(mirror) == 60
+
+        first = graph["entities"][0]
+        assert mirror.entity(first["name"]) == first and first["name"] in mirror
+        assert {e["name"] for e in mirror.entities_of_type(first["entityType"])} == \
+            {e["name"] for e in graph["entities"] if e["entityType"] == first["entityType"]}
+        kind = graph["relations"][0]["relationType"]
+        assert len(mirror.relations_of_type(kind)) == sum(r["relationType"] == kind for r in graph["relations"])
+        assert mirror.neighbors(first["name"], direction="out") == \
+            {r["to"] for r in graph["relations"] if r["from"] == first["name"]}
+        assert mirror.neighbors(first["name"]) == \
+            {r["to"] for r in graph["relations"] if r["from"] == first["name"]} | \
+            {r["from"] for r in graph["relations"] if r["to"] == first["name"]}
+
+        names = [e["name"] for e in graph["entities"][:10]]
+        for local, remote in ((mirror.open_nodes(names), client.memory_open_nodes(names)),
+                              (mirror.search_nodes("entity 1"), client.memory_search_nodes("entity 1"))):
+            assert sorted(e["name"] for e in local["entities"]) == sorted(e["name"] for e in remote["entities"])
+            assert {relation_key(r) for r in local["relations"]} == {relation_key(r) for r in remote["relations"]}
+
+
+def test_own_writes_are_applied_without_reloading():
+    """Creates, observations and deletes keep the mirror equal to the server"""
+    with FakeProxy() as proxy:
+        proxy.populate_graph(20)
+        client = MCPProxyClient(proxy.url)
+        mirror = GraphMirror(client, refresh_interval=None)
+        client.memory_create_entities([{"name": "Mirror", "entityType": "Test", "observations": ["a"]},
+                                       {"name": "Entity 0", "entityType": "Ignored", "observations": []}])
+        client.memory_create_relations([{"from": "Mirror", "to": "Entity 1", "relationType": "mirrors"}])
+        client.memory_add_observations([{"entityName": "Mirror", "contents": ["a", "b", "b"]}])
+        client.memory_delete_entities(["Entity 1"])
+        client.memory_add_observations([{"entityName": "Nobody", "contents": ["x"]}])  # fails on the server
+
+        assert mirror.entity("Mirror")["observations"] == ["a", "b", "b"]
+        assert mirror.entity("Entity 0")["entityType"] != "Ignored"
+        assert "Entity 1" not in mirror and mirror.relations_of_type("mirrors") == []
+        assert _same_graph(mirror, client.memory_read_graph())
+        assert mirror.snapshot()["loads"] == 1 and mirror.snapshot()["applied"] == 4
+
+
+def test_refresh_skips_unchanged_graphs_and_picks_up_other_writers():
+    """The body hash decides whether to rebuild; lookups refresh once the interval passes"""
+    with FakeProxy() as proxy:
+        proxy.populate_graph(20)
+        client = MCPProxyClient(proxy.url)
+        mirror = GraphMirror(client, refresh_interval=None)
+        assert mirror.refresh() is False and mirror.snapshot()["unchanged"] == 1
+
+        other = MCPProxyClient(proxy.url)
+        other.memory_create_entities([{"name": "Elsewhere", "entityType": "Test", "observations": []}])
+        assert "Elsewhere" not in mirror
+        mirror.refresh_interval = 0
+        assert "Elsewhere" in mirror and mirror.snapshot()["loads"] == 2
+
+
+def test_write_during_refresh_is_not_lost():
+    """A write applied while the graph is being read survives the refresh"""
+    with FakeProxy() as proxy:
+        client = MCPProxyClient(proxy.url)
+        client.memory_create_entities([{"name": "Early", "entityType": "Node", "observations": []}])
+        mirror = GraphMirror(client, refresh_interval=None)
+        stream = client.transport.stream
+        writes = []
+
+        def write_mid_read(method, endpoint, data=None):
+            chunks = list(stream(method, endpoint, data))
+            if not writes:
+                writer = threading.Thread(target=lambda: writes.append(client.memory_create_entities(
+                    [{"name": "Late", "entityType": "Node", "observations": []}])))
+                writer.start()
+                writer.join()
+            yield from chunks
+
+        client.transport.stream = write_mid_read
+        assert mirror.refresh()
+        assert "Late" in mirror.entities and _same_graph(mirror, client.memory_read_graph())
+        assert mirror.snapshot()["raced"] == 1
+
+
+def test_concurrent_lookups_share_one_refresh():
+    """Lookups made while a refresh is downloading don't start their own"""
+    with FakeProxy() as proxy:
+        client = MCPProxyClient(proxy.url)
+        client.memory_create_entities([{"name": "A", "entityType": "Node", "observations": []}])
+        mirror = GraphMirror(client, refresh_interval=0)
+        stream = client.transport.stream
+        reads = []
+        started = threading.Event()
+
+        def slow_read(method, endpoint, data=None):
+            reads.append(endpoint)
+            started.set()
+            chunks = list(stream(method, endpoint, data))
+            time.sleep(0.2)
+            yield from chunks
+
+        client.transport.stream = slow_read
+        refresher = threading.Thread(target=mirror.entity, args=("A",))
+        refresher.start()
+        started.wait(5)
+        lookups = [threading.Thread(target=lambda: mirror.entity("A")) for _ in range(8)]
+        for thread in lookups:
+            thread.start()
+        for thread in lookups:
+            thread.join(0.1)
+        assert not any(thread.is_alive() for thread in lookups)  # served from the current indexes
+        refresher.join()
+        assert reads == ["/memory/read_graph"]
+
+
+def main():
+    """Run all tests"""
+    test_indexes_and_local_queries_match_the_server()
+    test_own_writes_are_applied_without_reloading()
+    test_refresh_skips_unchanged_graphs_and_picks_up_other_writers()
+    test_write_during_refresh_is_not_lost()
+    test_concurrent_lookups_share_one_refresh()
+    print("✅ All graph mirror tests passed")
+
+if __name__ == "__main__":
+    main()
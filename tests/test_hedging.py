@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for hedged requests
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import itertools
+import threading
+import time
+
+import requests
+from mcp_hedging import HedgePolicy
+from mcp_transport import MCPTransport
+
+
+class StallingTransport(MCPTransport):
+    """Answers in ``latency`` seconds, except that every call in ``stalls`` hangs
+
+    A stalled call in ``failures`` raises when it wakes up.
+    """
+
+    def __init__(self, stalls, stall=0.5, failures=(), latency=0.002, **kwargs):
+        super().__init__("http://proxy.test", **kwargs)
+        self.stalls = set(stalls)
+        self.stall = stall
+        self.failures = set(failures)
+        self.latency = latency
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def _send(self, method, endpoint, data=None):
+        with self.lock:
+            n = next(self.counter)
+        time.sleep(self.stall if n in self.stalls else self.latency)
+        if n in self.failures:
+            raise requests.exceptions.ConnectionError(f"call {n} failed")
+        return {"call": n}
+
+
+def test_no_hedging_until_enough_samples():
+    """Without latency history requests are sent once"""
+    policy = HedgePolicy(min_samples=5)
+    assert policy.delay_for("/memory/search_nodes") is None
+    for _ in range(5):
+        policy.record("/memory/search_nodes", 0.01)
+    assert policy.delay_for("/memory/search_nodes") == 0.01
+
+
+def test_stalled_request_is_hedged():
+    """A stall past the p95 delay is answered by the hedge"""
+    policy = HedgePolicy(budget=0.5, min_samples=10)
+    transport = StallingTransport(stalls={10}, hedge=policy)
+    for _ in range(10):
+        transport.request("POST", "/filesystem/read_text_file", {"path": "/a"})
+
+    start = time.perf_counter()
+    result = transport.request("POST", "/filesystem/read_text_file", {"path": "/a"})
+    assert time.perf_counter() - start < 0.2
+    assert result == {"call": 11}
+    assert policy.snapshot()["hedges"] == 1 and policy.snapshot()["hedge_wins"] == 1
+    transport.close()
+
+
+def test_failed_primary_is_answered_by_the_hedge():
+    """A slow primary that then fails returns the hedge's answer instead"""
+    policy = HedgePolicy(budget=0.5, min_samples=10)
+    transport = StallingTransport(stalls={10}, stall=0.1, failures={10}, hedge=policy)
+    for _ in range(10):
+        transport.request("POST", "/memory/read_graph")
+    assert transport.request("POST", "/memory/read_graph") == {"call": 11}
+    transport.close()
+
+
+def test_primary_that_answers_first_is_not_a_hedge_win():
+    """hedge_wins only counts calls whose answer came from the hedge"""
+    policy = HedgePolicy(budget=0.5, min_samples=10)
+    transport = StallingTransport(stalls={10, 11}, stall=0.1, hedge=policy)
+    for _ in range(10):
+        transport.request("POST", "/time/get_current_time", {})
+    assert transport.request("POST", "/time/get_current_time", {}) == {"call": 10}
+    stats = policy.snapshot()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 0
+    transport.close()
+    assert policy._executor._shutdown
+
+
+def test_budget_caps_hedges():
+    """Hedges never exceed the budgeted share of requests"""
+    policy = HedgePolicy(budget=0.1, min_samples=5, min_delay=0.001)
+    transport = StallingTransport(stalls=range(5, 400, 2), stall=0.02, hedge=policy)
+    for _ in range(5):
+        transport.request("POST", "/memory/search_nodes", {"query": "x"})
+    policy.delay_for = lambda endpoint: 0.001
+    for _ in range(30):
+        transport.request("POST", "/memory/search_nodes", {"query": "x"})
+    stats = policy.snapshot()
+    assert 0 < stats["hedges"] <= 0.1 * stats["requests"]
+
+
+def test_mutations_are_never_hedged():
+    """Only endpoints in the hedge set are duplicated"""
+    policy = HedgePolicy()
+    assert not policy.applies_to("/filesystem/write_file")
+    assert policy.applies_to("/filesystem/read_text_file")
+
+
+def main():
+    """Run all tests"""
+    test_no_hedging_until_enough_samples()
+    test_stalled_request_is_hedged()
+    test_failed_primary_is_answered_by_the_hedge()
+    test_primary_that_answers_first_is_not_a_hedge_win()
+    test_budget_caps_hedges()
+    test_mutations_are_never_hedged()
+    print("✅ All hedging tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for mcp-loadgen schedules and runs against the fake proxy
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import io
+import tempfile
+
+import pytest
+from mcp_fake_proxy import FakeProxy
+from mcp_loadgen import DEFAULT_MIX, LoadGenerator, MixEntry, level_at, parse_stages
+from mcp_openapi_client import OpenAPIClient
+
+
+def test_stages_ramp_linearly():
+    """The first stage holds its level; later stages ramp from the previous one"""
+    stages = parse_stages("10s:50,1m:200,500ms:0")
+    assert stages == [(10.0, 50.0), (60.0, 200.0), (0.5, 0.0)]
+    assert level_at(stages, 5) == 50
+    assert level_at(stages, 40) == 125
+    assert level_at(stages, 70.25) == 100
+    assert level_at(stages, 71) is None
+    with pytest.raises(ValueError):
+        parse_stages("10s")
+
+
+def test_closed_loop_reports_every_server():
+    """The default mix reaches all five servers and each gets its own row"""
+    with FakeProxy(token="t") as proxy, tempfile.TemporaryDirectory() as cache:
+        client = OpenAPIClient(proxy.url, token="t", spec_cache=cache)
+        out = io.StringIO()
+        report = LoadGenerator(client, DEFAULT_MIX, parse_stages("1s:4"), mode="closed", seed=3,
+                               interval=0.5, out=out).run()
+        assert set(report["servers"]) == {"fetch", "filesystem", "memory", "openscad", "time"}
+        assert all(s["calls"] > 0 and s["errors"] == 0 for s in report["servers"].values())
+        assert report["timeline"] and "ops/s" in out.getvalue()
+
+
+def test_open_loop_holds_the_arrival_rate_and_finds_the_knee():
+    """Arrivals follow the schedule; a single-slot backend saturates as the rate ramps"""
+    with FakeProxy(server_latency={"openscad": 0.02}, backend_concurrency=1) as proxy, \
+            tempfile.TemporaryDirectory() as cache:
+        client = OpenAPIClient(proxy.url, spec_cache=cache)
+        mix = [MixEntry("openscad_render_openscad", {"code": "sphere({seq});"})]
+        report = LoadGenerator(client, mix, parse_stages("1s:20,1s:100"), mode="open",
+                               interval=0.25, out=None).run()
+        openscad = report["servers"]["openscad"]
+        assert 75 <= openscad["calls"] <= 85  # 20 calls/s for 1s, then a 20 -> 100 ramp
+        assert openscad["knee_level"] is not None and openscad["peak_ops_per_sec"] < 60
+
+
+def main():
+    """Run all tests"""
+    test_stages_ramp_linearly()
+    test_closed_loop_reports_every_server()
+    test_open_loop_holds_the_arrival_rate_and_finds_the_knee()
+    print("✅ All loadgen tests passed")
+
+if __name__ == "__main__":
+    main()
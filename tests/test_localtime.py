@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the offline zoneinfo engine behind the time tools
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import requests
+from mcp_fake_proxy import FakeProxy
+from mcp_localtime import CONVERT_TIME, CURRENT_TIME, LocalTimeEngine, payload_bytes, time_difference
+from mcp_metrics import ClientMetrics
+from mcp_proxy_client import MCPProxyClient
+
+ZONES = ["UTC", "Etc/GMT+5", "Europe/London", "America/New_York", "America/St_Johns",
+         "Asia/Kolkata", "Asia/Kathmandu", "Australia/Lord_Howe", "Pacific/Chatham"]
+
+
+def test_payloads_match_the_server_byte_for_byte():
+    """Local answers encode exactly like the server's, across odd offsets and DST zones"""
+    engine = LocalTimeEngine(verify_rate=0)
+    with FakeProxy() as proxy:
+        for source in ZONES:
+            for target in ZONES:
+                for hhmm in ("00:00", "02:30", "13:45", "23:59"):
+                    data = {"source_timezone": source, "time": hhmm, "target_timezone": target}
+                    remote = requests.post(proxy.url + CONVERT_TIME, json=data).json()
+                    local = engine.answer(CONVERT_TIME, data)
+                    assert engine.verify(CONVERT_TIME, data, local, remote), (local, remote)
+                    assert payload_bytes(local) == payload_bytes(remote)
+        for zone in ZONES:
+            data = {"timezone": zone}
+            remote = requests.post(proxy.url + CURRENT_TIME, json=data).json()
+            assert engine.verify(CURRENT_TIME, data, engine.answer(CURRENT_TIME, data), remote)
+    assert engine.snapshot()["drift"] == 0 and engine.enabled
+
+
+def test_time_difference_format_and_dst():
+    """Half-hour and quarter-hour offsets, and offsets that change across DST"""
+    winter = datetime(2024, 1, 15, 12, 0, tzinfo=ZoneInfo("America/New_York"))
+    summer = datetime(2024, 7, 15, 12, 0, tzinfo=ZoneInfo("America/New_York"))
+    assert time_difference(winter, winter.astimezone(ZoneInfo("Europe/London"))) == "+5.0h"
+    assert time_difference(summer, summer.astimezone(ZoneInfo("Asia/Kathmandu"))) == "+9.75h"
+    assert time_difference(winter, winter.astimezone(ZoneInfo("Asia/Kolkata"))) == "+10.5h"
+    assert time_difference(summer, summer.astimezone(ZoneInfo("America/Los_Angeles"))) == "-3.0h"
+    assert LocalTimeEngine().convert_time("UTC", "25:00", "UTC") is None
+
+
+def test_client_answers_locally_and_falls_back():
+    """No round trips for known zones; unknown zones and bad input reach the server"""
+    metrics = ClientMetrics()
+    engine = LocalTimeEngine(verify_rate=0)
+    with FakeProxy() as proxy:
+        client = MCPProxyClient(proxy.url, metrics=metrics, local_time=engine)
+        result = client.time_convert_time("Europe/London", "09:30", "Asia/Tokyo")
+        assert result["target"]["timezone"] == "Asia/Tokyo"
+        assert client.time_get_current_time("America/New_York")["timezone"] == "America/New_York"
+        assert proxy.stats["requests"] == 0
+        assert "error" in client.time_get_current_time("Mars/Olympus_Mons")
+        assert "error" in client.time_convert_time("UTC", "9h30", "UTC")
+        assert proxy.stats["requests"] == 2
+    assert engine.snapshot()["answered"] == 2 and engine.snapshot()["fallbacks"] == 2
+    assert "mcp_client_local_time_answered_total 2" in metrics.to_prometheus()
+
+
+def test_sampled_verification_detects_drift():
+    """Verified calls return the server's answer; a schema change switches the engine off"""
+    with FakeProxy() as proxy:
+        engine = LocalTimeEngine(verify_rate=1.0)
+        client = MCPProxyClient(proxy.url, local_time=engine)
+        client.time_convert_time("UTC", "12:00", "Asia/Kolkata")
+        client.time_get_current_time("UTC")
+        assert engine.snapshot()["verified"] == 2 and engine.snapshot()["drift"] == 0
+
+        # A server release with day_of_week would differ from this engine's payloads
+        drifting = LocalTimeEngine(verify_rate=1.0, day_of_week=True)
+        client = MCPProxyClient(proxy.url, local_time=drifting)
+        assert "day_of_week" not in client.time_get_current_time("UTC")
+        assert not drifting.enabled and drifting.snapshot()["last_drift"]["endpoint"] == CURRENT_TIME
+        requests_before = proxy.stats["requests"]
+        client.time_get_current_time("UTC")
+        assert proxy.stats["requests"] == requests_before + 1
+
+
+def main():
+    """Run all tests"""
+    test_payloads_match_the_server_byte_for_byte()
+    test_time_difference_format_and_dst()
+    test_client_answers_locally_and_falls_back()
+    test_sampled_verification_detects_drift()
+    print("✅ All local time tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,13 @@ Test script to verify connection to the remote MCP server
 
 import requests
 import json
+import os
 import sys
 
 def test_mcp_server_connection():
-    """Test connection to the MCP server at 192.168.0.7:8000"""
+    """Test connection to the MCP server at $MCP_BASE_URL (default 192.168.0.7:8000)"""
     
-    base_url = "http://192.168.0.7:8000"
+    base_url = os.getenv("MCP_BASE_URL", "http://192.168.0.7:8000")
     
     print(f"Testing connection to MCP server at {base_url}")
     
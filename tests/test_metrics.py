@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for client-side request metrics
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mcp_metrics import ClientMetrics, Histogram
+from mcp_proxy_client import MCPProxyClient
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    """Echo the request body back; /missing answers 404"""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = 404 if self.path.endswith("/missing") else 200
+        payload = json.dumps({"echo": json.loads(body or b"null")}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JSONHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_histogram_quantiles():
+    """Quantiles interpolate within buckets"""
+    hist = Histogram(buckets=(1.0, 2.0, 4.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        hist.observe(value)
+    assert hist.count == 4
+    assert 1.0 <= hist.quantile(0.5) <= 2.0
+    assert hist.summary()["mean"] == 1.625
+
+
+def test_client_records_phases_bytes_and_errors():
+    """Each request records its phases, sizes and outcome"""
+    server, url = _serve()
+    try:
+        metrics = ClientMetrics()
+        client = MCPProxyClient(url, metrics=metrics)
+        client.time_get_current_time("Europe/London")
+        client.time_get_current_time("Asia/Tokyo")
+        client._make_request("POST", "/time/missing", {})
+    finally:
+        server.shutdown()
+
+    snapshot = metrics.snapshot()["endpoints"]
+    time_stats = snapshot["/time/get_current_time"]
+    assert time_stats["requests"] == 2
+    assert time_stats["request_bytes"] == len('{"timezone":"Europe/London"}') + len('{"timezone":"Asia/Tokyo"}')
+    assert time_stats["response_bytes"] > time_stats["request_bytes"]
+    latency = time_stats["latency"]
+    assert latency["connect"]["count"] == 2
+    assert latency["connect"]["sum"] > 0
+    assert latency["decode"]["count"] == 2
+    assert snapshot["/time/missing"]["errors"] == {"http_404": 1}
+    assert snapshot["/time/missing"]["latency"]["decode"]["count"] == 0
+
+
+def test_exports():
+    """Prometheus and JSON exports are written atomically"""
+    metrics = ClientMetrics()
+    metrics.record_request("/memory/read_graph", 200, {"total": 0.02, "ttfb": 0.015}, 2, 500)
+    metrics.record_retry("/memory/read_graph")
+    text = metrics.to_prometheus()
+    assert 'mcp_client_request_duration_seconds_bucket{endpoint="/memory/read_graph",phase="total",le="0.025"} 1' in text
+    assert 'mcp_client_retries_total{endpoint="/memory/read_graph"} 1' in text
+    assert 'mcp_client_response_bytes_total{endpoint="/memory/read_graph"} 500' in text
+
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics.write_textfile(os.path.join(tmp, "mcp.prom"))
+        metrics.write_json(os.path.join(tmp, "mcp.json"))
+        with open(os.path.join(tmp, "mcp.json")) as f:
+            assert json.load(f)["endpoints"]["/memory/read_graph"]["retries"] == 1
+
+
+def main():
+    """Run all tests"""
+    test_histogram_quantiles()
+    test_client_records_phases_bytes_and_errors()
+    test_exports()
+    print("✅ All metrics tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the OpenAPI-driven client against the fake proxy
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import inspect
+import tempfile
+
+import pytest
+from mcp_fake_proxy import FakeProxy
+from mcp_openapi_client import OpenAPIClient
+from mcp_schema import SchemaValidationError
+
+
+def test_discovers_servers_and_builds_typed_stubs():
+    """Tools are found from the specs and named like the hand-written methods"""
+    with FakeProxy() as proxy, tempfile.TemporaryDirectory() as cache:
+        client = OpenAPIClient(proxy.url, spec_cache=cache)
+        assert client.servers() == {"fetch": "/fetch", "filesystem": "/filesystem", "memory": "/memory",
+                                    "openscad": "/openscad", "time": "/time"}
+        assert "fs_write_file" in client.tools()
+
+        signature = inspect.signature(client.fs_read_text_file)
+        assert list(signature.parameters) == ["path", "head", "tail"]
+        assert signature.parameters["head"].default is None
+
+        path = os.path.join(proxy.root, "notes.txt")
+        assert client.fs_write_file(path=path, content="hello").startswith("Successfully wrote")
+        assert client.call("fs_read_text_file", {"path": path}) == "hello"
+        with pytest.raises(AttributeError):
+            client.fs_no_such_tool
+
+
+def test_bad_calls_fail_without_a_round_trip():
+    """Schema violations raise locally and never reach the proxy"""
+    with FakeProxy() as proxy, tempfile.TemporaryDirectory() as cache:
+        client = OpenAPIClient(proxy.url, spec_cache=cache)
+        client.tools()
+        before = proxy.stats["requests"]
+        with pytest.raises(SchemaValidationError, match="missing required property 'path'"):
+            client.fs_read_text_file()
+        with pytest.raises(SchemaValidationError, match="unexpected property 'pth'"):
+            client.fs_read_text_file(pth="/tmp/x")
+        with pytest.raises(SchemaValidationError, match=r"entities\[0\]\.observations\[0\]"):
+            client.memory_create_entities(entities=[{"name": "a", "entityType": "b", "observations": [1]}])
+        assert proxy.stats["requests"] == before
+
+
+def test_only_the_needed_server_spec_is_loaded():
+    """Using one tool fetches the root document and that server's document only"""
+    with FakeProxy() as proxy, tempfile.TemporaryDirectory() as cache:
+        client = OpenAPIClient(proxy.url, spec_cache=cache)
+        client.time_get_current_time(timezone="UTC")
+        assert client.specs.stats["fetched"] == 2
+
+
+def test_spec_cache_revalidation():
+    """Fresh specs cost nothing; stale ones are revalidated by ETag or hash"""
+    with FakeProxy() as proxy, tempfile.TemporaryDirectory() as cache:
+        OpenAPIClient(proxy.url, spec_cache=cache).tools()
+        requests_after_first = proxy.stats["requests"]
+
+        warm = OpenAPIClient(proxy.url, spec_cache=cache)
+        warm.tools()
+        assert warm.specs.stats["fresh"] == 6
+        assert proxy.stats["requests"] == requests_after_first
+
+        stale = OpenAPIClient(proxy.url, spec_cache=cache, max_age=0)
+        stale.tools()
+        assert stale.specs.stats["not_modified"] == 6
+
+        proxy.etags = False
+        stale = OpenAPIClient(proxy.url, spec_cache=cache, max_age=0)
+        stale.tools()
+        assert stale.specs.stats["unchanged"] == 6
+        assert stale.refresh() == []
+
+
+def test_explicit_servers_survive_refresh():
+    """A servers mapping given to the constructor is kept, not re-discovered"""
+    with FakeProxy() as proxy, tempfile.TemporaryDirectory() as cache:
+        client = OpenAPIClient(proxy.url, spec_cache=cache, servers={"time": "/time"})
+        client.time_get_current_time(timezone="UTC")
+        assert client.refresh() == []
+        assert client.servers() == {"time": "/time"}
+        assert client.specs.stats["fetched"] == 1
+
+
+def main():
+    """Run all tests"""
+    test_discovers_servers_and_builds_typed_stubs()
+    test_bad_calls_fail_without_a_round_trip()
+    test_only_the_needed_server_spec_is_loaded()
+    test_spec_cache_revalidation()
+    test_explicit_servers_survive_refresh()
+    print("✅ All OpenAPI client tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for retries and per-server circuit breakers
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import time
+
+import pytest
+import requests
+from mcp_resilience import CircuitBreakers, CircuitOpenError, RetryPolicy
+from mcp_transport import MCPTransport
+from mcp_proxy_client import MCPProxyClient
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+class ScriptedTransport(MCPTransport):
+    """Transport that raises the scripted errors in turn, then succeeds"""
+
+    def __init__(self, errors, **kwargs):
+        super().__init__("http://proxy.test", **kwargs)
+        self.errors = list(errors)
+        self.sent = []
+
+    def _send(self, method, endpoint, data=None):
+        self.sent.append(endpoint)
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"ok": True}
+
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.002)
+
+
+def test_retries_idempotent_calls_on_backend_failure():
+    """Connection errors and 503s are retried up to max_attempts"""
+    transport = ScriptedTransport([requests.ConnectionError("reset"), _http_error(503)], retry=FAST_RETRY)
+    assert transport.request("POST", "/memory/search_nodes", {"query": "x"}) == {"ok": True}
+    assert len(transport.sent) == 3
+
+
+def test_no_retry_for_mutations_or_client_errors():
+    """Mutating calls and 4xx responses are sent once"""
+    transport = ScriptedTransport([requests.ConnectionError("reset")], retry=FAST_RETRY)
+    with pytest.raises(requests.ConnectionError):
+        transport.request("POST", "/filesystem/write_file", {"path": "/a", "content": ""})
+    transport = ScriptedTransport([_http_error(404)], retry=FAST_RETRY)
+    with pytest.raises(requests.HTTPError):
+        transport.request("POST", "/filesystem/read_text_file", {"path": "/missing"})
+    assert len(transport.sent) == 1
+
+
+def test_breaker_opens_fails_fast_and_recovers():
+    """Consecutive failures open the breaker; a half-open probe closes it"""
+    breakers = CircuitBreakers(failure_threshold=2, reset_timeout=0.05)
+    transport = ScriptedTransport([_http_error(502), _http_error(502)], breakers=breakers)
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            transport.request("POST", "/memory/read_graph")
+
+    with pytest.raises(CircuitOpenError):
+        transport.request("POST", "/memory/read_graph")
+    assert len(transport.sent) == 2
+    assert transport.request("POST", "/time/get_current_time", {"timezone": "UTC"}) == {"ok": True}
+
+    state = breakers.snapshot()
+    assert state["/memory"]["state"] == "open"
+    assert state["/memory"]["rejected"] == 1
+    assert state["/time"]["state"] == "closed"
+
+    time.sleep(0.06)
+    assert transport.request("POST", "/memory/read_graph") == {"ok": True}
+    assert breakers.snapshot()["/memory"]["state"] == "closed"
+
+
+def test_failed_probe_reopens():
+    """A failure while half-open re-opens the breaker immediately"""
+    breakers = CircuitBreakers(failure_threshold=1, reset_timeout=0.01)
+    transport = ScriptedTransport([requests.Timeout(), requests.Timeout()], breakers=breakers)
+    with pytest.raises(requests.Timeout):
+        transport.request("POST", "/fetch/fetch", {"url": "https://example.com"})
+    time.sleep(0.02)
+    with pytest.raises(requests.Timeout):
+        transport.request("POST", "/fetch/fetch", {"url": "https://example.com"})
+    assert breakers.snapshot()["/fetch"]["state"] == "open"
+
+
+def test_client_reports_open_circuit_as_error():
+    """Clients turn CircuitOpenError into their usual error dict"""
+    client = MCPProxyClient("http://127.0.0.1:9", breakers=CircuitBreakers(failure_threshold=1))
+    assert "error" in client.memory_read_graph()
+    assert client.memory_read_graph()["error"].startswith("Circuit open")
+    assert client.breaker_state()["/memory"]["state"] == "open"
+
+
+def main():
+    """Run all tests"""
+    test_retries_idempotent_calls_on_backend_failure()
+    test_no_retry_for_mutations_or_client_errors()
+    test_breaker_opens_fails_fast_and_recovers()
+    test_failed_probe_reopens()
+    test_client_reports_open_circuit_as_error()
+    print("✅ All resilience tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the precompiled JSON Schema validators
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from typing import List, Optional
+
+import pytest
+from mcp_schema import SchemaCompiler, SchemaValidationError
+
+DOCUMENT = {"components": {"schemas": {
+    "Node": {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "minLength": 1},
+            "sortBy": {"enum": ["name", "size"]},
+            "depth": {"anyOf": [{"type": "integer", "minimum": 0}, {"type": "null"}]},
+            "children": {"type": "array", "items": {"$ref": "#/components/schemas/Node"}},
+        },
+        "required": ["name"],
+        "additionalProperties": False,
+    },
+}}}
+
+
+def _errors(value) -> str:
+    validate = SchemaCompiler(DOCUMENT).compile({"$ref": "#/components/schemas/Node"})
+    try:
+        validate(value, "$")
+    except SchemaValidationError as e:
+        return str(e)
+    return ""
+
+
+def test_valid_values_pass():
+    """Nested, recursive and optional values that match are accepted"""
+    assert _errors({"name": "root", "depth": None, "children": [{"name": "a", "children": []}]}) == ""
+    assert _errors({"name": "root", "depth": 3, "sortBy": "size"}) == ""
+
+
+def test_errors_name_the_offending_path():
+    """Each kind of mismatch is reported with a path into the value"""
+    assert _errors({}) == "$: missing required property 'name'"
+    assert _errors({"name": ""}) == "$.name: must be at least 1 characters"
+    assert _errors({"name": "a", "sortBy": "date"}) == "$.sortBy: 'date' is not one of ['name', 'size']"
+    assert _errors({"name": "a", "depth": "3"}) == "$.depth: expected integer or null, got string"
+    assert _errors({"name": "a", "depth": True}) == "$.depth: expected integer or null, got boolean"
+    assert _errors({"name": "a", "children": [{"name": 5}]}) == "$.children[0].name: expected string, got integer"
+    assert _errors({"name": "a", "colour": "red"}) == "$: unexpected property 'colour'"
+
+
+def test_annotations():
+    """Schemas map onto Python types for stub signatures"""
+    compiler = SchemaCompiler(DOCUMENT)
+    assert compiler.annotation({"anyOf": [{"type": "integer"}, {"type": "null"}]}) == Optional[int]
+    assert compiler.annotation({"type": "array", "items": {"type": "string"}}) == List[str]
+    with pytest.raises(ValueError):
+        compiler.resolve({"$ref": "#/components/schemas/Missing"})
+
+
+def main():
+    """Run all tests"""
+    test_valid_values_pass()
+    test_errors_name_the_offending_path()
+    test_annotations()
+    print("✅ All schema tests passed")
+
+if __name__ == "__main__":
+    main()
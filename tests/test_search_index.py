@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the BM25 search index over the knowledge graph
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import tempfile
+
+from mcp_fake_proxy import FakeProxy
+from mcp_graph_mirror import GraphMirror
+from mcp_proxy_client import MCPProxyClient
+from mcp_search_index import SearchIndex
+
+ENTITIES = [
+    {"name": "OAuth Gateway", "entityType": "Service", "observations": ["Handles login for the web app"]},
+    {"name": "Billing", "entityType": "Service",
+     "observations": ["Charges cards nightly", "Uses the OAuth gateway for authentication"]},
+    {"name": "Alice", "entityType": "Person", "observations": ["Maintains billing", "Wrote the authentication docs"]},
+    {"name": "Roadmap", "entityType": "Document", "observations": ["Mentions nothing relevant"]},
+]
+
+
+def _mirror(proxy: FakeProxy) -> tuple:
+    client = MCPProxyClient(proxy.url)
+    client.memory_create_entities(ENTITIES)
+    client.memory_create_relations([{"from": "Alice", "to": "Billing", "relationType": "maintains"}])
+    return client, GraphMirror(client, refresh_interval=None)
+
+
+def test_bm25_ranking_multi_term_and_prefixes():
+    """Names outweigh observations, more matching terms rank higher, prefixes expand"""
+    with FakeProxy() as proxy:
+        _, mirror = _mirror(proxy)
+        index = SearchIndex(mirror)
+        assert [name for name, _ in index.search("oauth")][:2] == ["OAuth Gateway", "Billing"]
+        assert index.search("billing authentication")[0][0] in ("Alice", "Billing")
+        assert {name for name, _ in index.search("billing authentication")} == {"Alice", "Billing"}
+        assert {name for name, _ in index.search("auth")} == {"Billing", "Alice"}
+        assert index.search("nothing here")[0][0] == "Roadmap"
+        assert index.search("zzz") == []
+
+        exact = SearchIndex(mirror, prefix=False)
+        assert exact.search("auth") == [] and len(exact.search("auth*")) == 2
+
+
+def test_incremental_updates_and_ranked_search_nodes():
+    """Client writes reach the index through the mirror; results look like memory_search_nodes"""
+    with FakeProxy() as proxy:
+        client, mirror = _mirror(proxy)
+        index = SearchIndex(mirror)
+        assert index.search("kubernetes") == []
+        client.memory_add_observations([{"entityName": "Roadmap", "contents": ["Move to Kubernetes in Q3"]}])
+        assert index.search("kubernetes")[0][0] == "Roadmap"
+        client.memory_delete_entities(["Roadmap"])
+        assert index.search("kubernetes") == [] and index.snapshot()["documents"] == 3
+
+        result = index.search_nodes("billing")
+        assert [e["name"] for e in result["entities"]] == [name for name, _ in index.search("billing")]
+        assert result["relations"] == [{"type": "relation", "from": "Alice", "to": "Billing",
+                                         "relationType": "maintains"}]
+        assert list(result["scores"]) == [e["name"] for e in result["entities"]]
+
+
+def test_other_clients_writes_and_unlimited_search_nodes():
+    """Searches refresh a due mirror; search_nodes returns every match like the server"""
+    with FakeProxy() as proxy:
+        client, _ = _mirror(proxy)
+        index = SearchIndex(GraphMirror(client, refresh_interval=0))
+        other = MCPProxyClient(proxy.url)
+        other.memory_create_entities([{"name": f"Ticket {i}", "entityType": "Ticket",
+                                       "observations": ["Auth outage"]} for i in range(15)])
+        assert len(index.search("outage")) == 10 and len(index.search("outage", limit=None)) == 15
+        result = index.search_nodes("outage")
+        assert len(result["entities"]) == 15 == len(result["scores"])
+
+
+def test_persisted_index_is_reused_at_startup():
+    """A saved index only re-tokenizes entities that changed since"""
+    with FakeProxy() as proxy, tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index", "graph.json.gz")
+        client, mirror = _mirror(proxy)
+        first = SearchIndex(mirror, path=path)
+        first.save()
+
+        client.memory_add_observations([{"entityName": "Alice", "contents": ["Moved to the platform team"]}])
+        second = SearchIndex(GraphMirror(MCPProxyClient(proxy.url), refresh_interval=None), path=path)
+        assert second.snapshot()["indexed"] == 1 and second.snapshot()["unchanged"] == 3
+        assert second.search("platform")[0][0] == "Alice"
+        assert second.search("oauth") == first.search("oauth")
+
+        reweighted = SearchIndex(mirror, path=path, field_weights={"name": 1.0})
+        assert reweighted.snapshot()["indexed"] == 4
+
+
+def main():
+    """Run all tests"""
+    test_bm25_ranking_multi_term_and_prefixes()
+    test_incremental_updates_and_ranked_search_nodes()
+    test_other_clients_writes_and_unlimited_search_nodes()
+    test_persisted_index_is_reused_at_startup()
+    print("✅ All search index tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight request coalescing
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from mcp_singleflight import SingleFlight
+from mcp_transport import MCPTransport
+
+
+class SlowTransport(MCPTransport):
+    """Transport whose round trips take a while and are counted"""
+
+    def __init__(self):
+        super().__init__("http://proxy.test", coalesce=True)
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def _send(self, method, endpoint, data=None):
+        with self.lock:
+            self.sent.append((endpoint, data))
+        time.sleep(0.1)
+        return {"endpoint": endpoint}
+
+
+def test_identical_requests_share_one_call():
+    """30 identical concurrent reads make a single round trip"""
+    transport = SlowTransport()
+    barrier = threading.Barrier(30)
+
+    def read(_):
+        barrier.wait()
+        return transport.request("POST", "/memory/read_graph")
+
+    with ThreadPoolExecutor(max_workers=30) as executor:
+        results = list(executor.map(read, range(30)))
+
+    assert len(transport.sent) == 1
+    assert all(result is results[0] for result in results)
+    assert transport.single_flight.stats() == {"executed": 1, "saved": 29, "in_flight": 0}
+
+
+def test_different_bodies_and_mutations_are_not_coalesced():
+    """Distinct bodies and mutating endpoints each get their own call"""
+    transport = SlowTransport()
+    calls = [("/filesystem/read_text_file", {"path": "/a"}),
+             ("/filesystem/read_text_file", {"path": "/b"}),
+             ("/filesystem/write_file", {"path": "/a", "content": "x"}),
+             ("/filesystem/write_file", {"path": "/a", "content": "x"})]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda c: transport.request("POST", *c), calls))
+    assert len(transport.sent) == 4
+
+
+def test_errors_reach_every_waiter():
+    """Followers see the leader's exception"""
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("backend down")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "k", fail)
+        started.wait()
+        follower = executor.submit(flight.do, "k", fail)
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    assert flight.stats()["saved"] == 1
+
+
+def main():
+    """Run all tests"""
+    test_identical_requests_share_one_call()
+    test_different_bodies_and_mutations_are_not_coalesced()
+    test_errors_reach_every_waiter()
+    print("✅ All single-flight tests passed")
+
+if __name__ == "__main__":
+    main()
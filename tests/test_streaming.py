@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental decoding of large graph and tree responses
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from mcp_streaming import iter_graph, iter_items, iter_tree_nodes, parse_events
+from mcp_proxy_client import MCPProxyClient
+
+GRAPH = {
+    "entities": [
+        {"name": "Python \"3\" é", "entityType": "Language", "observations": ["typed", 1.5e3, True, None]},
+        {"name": "MCP", "entityType": "Protocol", "observations": []},
+    ],
+    "relations": [{"from": "MCP", "to": "Python", "relationType": "implemented_in"}],
+}
+
+TREE = [
+    {"name": "src", "type": "directory", "children": [
+        {"name": "a.py", "type": "file"},
+        {"name": "pkg", "type": "directory", "children": []},
+    ]},
+    {"name": "README.md", "type": "file"},
+]
+
+
+def _chunked(doc, size):
+    data = json.dumps(doc, ensure_ascii=False).encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_graph_items_survive_any_chunking():
+    """Tokens split across chunk boundaries decode correctly"""
+    expected = [("entity", e) for e in GRAPH["entities"]] + [("relation", r) for r in GRAPH["relations"]]
+    for size in (1, 2, 3, 7, 64, 4096):
+        assert list(iter_graph(_chunked(GRAPH, size))) == expected
+    observations = iter_items(parse_events(_chunked(GRAPH, 5)), "entities.item.observations.item")
+    assert list(observations) == ["typed", 1500.0, True, None]
+
+
+def test_tree_nodes_depth_first_with_paths():
+    """Directories are yielded before their contents, children stripped"""
+    for chunks in (_chunked(TREE, 4), [json.dumps(json.dumps(TREE)).encode()]):
+        nodes = list(iter_tree_nodes(chunks))
+        assert [n["path"] for n in nodes] == [["src"], ["src", "a.py"], ["src", "pkg"], ["README.md"]]
+        assert nodes[0] == {"name": "src", "type": "directory", "path": ["src"], "depth": 0}
+        assert all("children" not in n for n in nodes)
+
+
+class SlowGraphHandler(BaseHTTPRequestHandler):
+    """Send the first entity, then hold the rest of the body until released"""
+    release = threading.Event()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b'{"entities": [' + json.dumps(GRAPH["entities"][0]).encode() + b', ')
+        self.wfile.flush()
+        self.release.wait(5)
+        self.wfile.write(json.dumps(GRAPH["entities"][1]).encode() + b'], "relations": []}')
+
+    def log_message(self, *args):
+        pass
+
+
+def test_first_item_arrives_before_body_completes():
+    """The client yields entities while the server is still sending"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowGraphHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = MCPProxyClient(f"http://127.0.0.1:{server.server_address[1]}")
+        items = client.memory_read_graph_stream()
+        assert next(items) == ("entity", GRAPH["entities"][0])
+        SlowGraphHandler.release.set()
+        assert list(items) == [("entity", GRAPH["entities"][1])]
+    finally:
+        SlowGraphHandler.release.set()
+        server.shutdown()
+
+
+def main():
+    """Run all tests"""
+    test_graph_items_survive_any_chunking()
+    test_tree_nodes_depth_first_with_paths()
+    test_first_item_arrives_before_body_completes()
+    print("✅ All streaming tests passed")
+
+if __name__ == "__main__":
+    main()
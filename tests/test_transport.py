@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared MCP transport: pool settings, timeouts and warming
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import socket
+import threading
+import time
+
+import requests
+from mcp_transport import MCPTransport, PoolConfig
+from mcp_proxy_client import MCPProxyClient
+
+
+def _listener():
+    """Accept TCP connections without answering and count them"""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(64)
+    accepted = []
+
+    def accept_loop():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            accepted.append(conn)
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.getsockname()[1]}", accepted
+
+
+def test_pool_config_sizes_adapter():
+    """The session adapter uses the configured pool sizes"""
+    transport = MCPTransport("http://proxy.test", PoolConfig(connections_per_host=32, block=True))
+    adapter = transport.session.get_adapter("http://proxy.test")
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block is True
+    assert transport.session.headers["Connection"] == "keep-alive"
+
+    closing = MCPTransport("http://proxy.test", PoolConfig(keep_alive=False))
+    assert closing.session.headers["Connection"] == "close"
+    assert closing.warm(4) == 0
+
+
+def test_warm_opens_connections_in_parallel():
+    """warm(n) parks n connected sockets in the pool the next request uses"""
+    server, url, accepted = _listener()
+    try:
+        client = MCPProxyClient(url, pool=PoolConfig(connections_per_host=8, read_timeout=0.1))
+        assert client.warm(6) == 6
+        assert client.transport._connection_pool().num_connections == 6
+        for _ in range(50):
+            if len(accepted) == 6:
+                break
+            time.sleep(0.01)
+        assert len(accepted) == 6
+
+        # The listener never answers, so the request times out, on a warmed socket
+        client.time_get_current_time("UTC")
+        time.sleep(0.05)
+        assert len(accepted) == 6
+        assert client.transport._connection_pool().num_connections == 6
+    finally:
+        server.close()
+
+
+def test_read_timeout_applies():
+    """A server that never answers trips the read timeout"""
+    server, url, _ = _listener()
+    try:
+        transport = MCPTransport(url, PoolConfig(read_timeout=0.2))
+        try:
+            transport.request("POST", "/time/get_current_time", {"timezone": "UTC"})
+        except requests.exceptions.ReadTimeout:
+            pass
+        else:
+            raise AssertionError("expected a read timeout")
+    finally:
+        server.close()
+
+
+def main():
+    """Run all tests"""
+    test_pool_config_sizes_adapter()
+    test_warm_opens_connections_in_parallel()
+    test_read_timeout_applies()
+    print("✅ All transport tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for vectorised bulk timezone conversion
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import calendar
+import random
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+np = pytest.importorskip("numpy")
+from mcp_proxy_client import MCPProxyClient
+from mcp_tzbulk import convert_times, transition_table
+
+ZONES = ["UTC", "America/New_York", "Europe/London", "Australia/Lord_Howe", "Pacific/Chatham",
+         "Africa/Casablanca", "Asia/Kathmandu", "America/Sao_Paulo"]
+
+
+def _zoneinfo_convert(seconds: int, source: str, target: str):
+    """What time_convert_time's zoneinfo arithmetic gives for one local time"""
+    moment = (datetime(1970, 1, 1) + timedelta(seconds=seconds)).replace(tzinfo=ZoneInfo(source))
+    moment = moment.astimezone(ZoneInfo(target))
+    return calendar.timegm(moment.timetuple()), bool(moment.dst())
+
+
+def test_matches_zoneinfo_around_every_transition():
+    """Gap, fold and ordinary times agree with zoneinfo for every zone pair"""
+    rng = random.Random(7)
+    for source in ZONES:
+        table = transition_table(source)
+        points = [int(t + offset) + delta
+                  for t, offset in zip(table.transitions, table.offsets[1:])
+                  for delta in range(-7200, 7201, 900)]
+        points += [rng.randrange(0, 4_000_000_000) for _ in range(200)]
+        for target in ZONES:
+            converted, is_dst = convert_times(np.array(points, dtype="datetime64[s]"), source, target,
+                                              return_dst=True)
+            expected = [_zoneinfo_convert(p, source, target) for p in points]
+            assert converted.astype(np.int64).tolist() == [e[0] for e in expected], (source, target)
+            assert is_dst.tolist() == [e[1] for e in expected], (source, target)
+
+
+def test_dst_edges_in_new_york():
+    """Spring-forward gap times move forward; fall-back fold times take the first occurrence"""
+    times = ["2024-03-10T01:59:59", "2024-03-10T02:30:00", "2024-03-10T03:00:00",
+             "2024-11-03T00:59:59", "2024-11-03T01:30:00", "2024-11-03T02:00:00"]
+    converted, is_dst = convert_times(times, "America/New_York", "UTC", return_dst=True)
+    assert converted.astype(str).tolist() == ["2024-03-10T06:59:59", "2024-03-10T07:30:00", "2024-03-10T07:00:00",
+                                              "2024-11-03T04:59:59", "2024-11-03T05:30:00", "2024-11-03T07:00:00"]
+    assert not is_dst.any()
+    back, is_dst = convert_times(converted, "UTC", "America/New_York", return_dst=True)
+    assert back.astype(str).tolist()[4] == "2024-11-03T01:30:00" and is_dst.tolist() == [False, True, True,
+                                                                                          True, True, False]
+
+
+def test_units_shapes_nat_and_out_of_range_years():
+    """Sub-second units and shapes are kept, NaT passes through, other years fall back to zoneinfo"""
+    times = np.array([["2024-07-01T12:00:00.123456789", "NaT"],
+                      ["1900-06-01T12:00:00", "2250-07-01T12:00:00"]], dtype="datetime64[ns]")
+    converted = convert_times(times, "Europe/London", "Asia/Kolkata")
+    assert converted.dtype == np.dtype("datetime64[ns]") and converted.shape == (2, 2)
+    assert str(converted[0, 0]) == "2024-07-01T16:30:00.123456789" and np.isnat(converted[0, 1])
+    for value, result in ((times[1, 0], converted[1, 0]), (times[1, 1], converted[1, 1])):
+        seconds = int(value.astype("datetime64[s]").astype(np.int64))
+        assert int(result.astype("datetime64[s]").astype(np.int64)) == \
+            _zoneinfo_convert(seconds, "Europe/London", "Asia/Kolkata")[0]
+
+
+def test_client_entry_point():
+    """time_convert_times sits next to time_convert_time and needs no proxy"""
+    client = MCPProxyClient("http://127.0.0.1:9")
+    converted = client.time_convert_times(["2024-01-15T09:30", "2024-07-15T09:30"], "Europe/London", "Asia/Tokyo")
+    assert converted.astype(str).tolist() == ["2024-01-15T18:30:00", "2024-07-15T17:30:00"]
+
+
+def main():
+    """Run all tests"""
+    test_matches_zoneinfo_around_every_transition()
+    test_dst_edges_in_new_york()
+    test_units_shapes_nat_and_out_of_range_years()
+    test_client_entry_point()
+    print("✅ All bulk timezone conversion tests passed")
+
+if __name__ == "__main__":
+    main()